@@ -2,20 +2,24 @@
 from typing import Any, Dict, Tuple
 
 from app.extractors.normalizers import ExtractedRunRequest
+from app.registry.descriptor import compile_descriptor
 from app.registry.service import registry_service
 
 
 class BuilderService:
     def build_sql(self, req: ExtractedRunRequest) -> Tuple[str, Dict[str, Any]]:
-        meta = registry_service.get(req.entity) or {}
-        columns = meta.get("columns", [])
-        identifiers = meta.get("identifiers", [])
-        order_wl = registry_service.order_by_whitelist(req.entity)
-        default_date_field = meta.get("default_date_field")
-
-        select_cols = req.select or columns or ["*"]
+        desc = registry_service.descriptor(req.entity) or compile_descriptor(
+            req.entity, {}
+        )
+        columns = desc.columns
+        column_set = desc.column_set
+        identifiers = desc.identifier_set
+        order_wl = desc.order_whitelist_set
+        default_date_field = desc.default_date_field
+
+        select_cols = req.select or list(columns) or ["*"]
         for c in select_cols:
-            if columns and c not in columns:
+            if columns and c not in column_set:
                 raise ValueError(f"coluna '{c}' não permitida para {req.entity}")
 
         where = []
@@ -39,7 +43,7 @@ class BuilderService:
                 continue
 
             # Standard filters: equality or IN
-            if columns and k not in columns and k not in identifiers:
+            if columns and k not in column_set and k not in identifiers:
                 raise ValueError(f"filtro '{k}' não permitido para {req.entity}")
             if isinstance(v, (list, tuple)):
                 if not v:
@@ -54,7 +58,7 @@ class BuilderService:
 
         # Apply explicit ranges *_from/_to
         for base, rt in ranges.items():
-            if columns and base not in columns:
+            if columns and base not in column_set:
                 raise ValueError(
                     f"campo '{base}' não permitido para range em {req.entity}"
                 )
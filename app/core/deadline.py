@@ -0,0 +1,115 @@
+# app/core/deadline.py
+"""
+Prazo (deadline) da requisição, propagado por contextvar.
+
+O middleware (app/gateway/deadline.py) abre um `Deadline` por requisição a
+partir do header `X-Request-Timeout` ou do padrão do endpoint; o contextvar
+acompanha o handler no threadpool. A partir daí:
+
+- `check(stage)` entre etapas do orchestrator levanta DeadlineExceeded se o
+  orçamento acabou (ou o cliente desconectou), antes de gastar mais DB;
+- `budget_ms()` vira `SET LOCAL statement_timeout` em cada query
+  (ExecutorService.run), para o Postgres abortar o plano junto com o request;
+- `cancel()` (desconexão do cliente) cancela as queries em andamento via os
+  callbacks registrados com `on_cancel` (ex.: `conn.cancel`).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+from app.observability.metrics import DEADLINE_EXCEEDED
+
+
+class DeadlineExceeded(Exception):
+    """Orçamento de tempo da requisição esgotado (ou cliente desconectado)."""
+
+    def __init__(self, stage: str, reason: str = "timeout") -> None:
+        super().__init__(f"deadline excedido em {stage} ({reason})")
+        self.stage = stage
+        self.reason = reason
+
+
+class Deadline:
+    def __init__(self, timeout: float, endpoint: str = "-") -> None:
+        self.timeout = timeout
+        self.endpoint = endpoint
+        self.expires_at = time.monotonic() + timeout
+        self.cancelled = False
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.cancelled or self.remaining() <= 0
+
+    def check(self, stage: str) -> None:
+        if self.expired:
+            raise self.exceeded(stage)
+
+    def exceeded(self, stage: str) -> DeadlineExceeded:
+        reason = "disconnect" if self.cancelled else "timeout"
+        DEADLINE_EXCEEDED.labels(endpoint=self.endpoint, stage=stage, reason=reason).inc()
+        return DeadlineExceeded(stage, reason)
+
+    def cancel(self) -> None:
+        """Cliente desconectou: marca e dispara os cancelamentos registrados."""
+        with self._lock:
+            self.cancelled = True
+            callbacks = list(self._callbacks)
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception:
+                pass
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]) -> Iterator[None]:
+        with self._lock:
+            self._callbacks.append(callback)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._callbacks.remove(callback)
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(timeout: float, endpoint: str = "-") -> Iterator[Deadline]:
+    deadline = Deadline(timeout, endpoint)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def check(stage: str) -> None:
+    """Sem prazo ativo (jobs, testes) não faz nada."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def budget_ms() -> Optional[int]:
+    """Milissegundos restantes (mín. 1) ou None sem prazo ativo."""
+    deadline = _current.get()
+    if deadline is None:
+        return None
+    return max(1, int(deadline.remaining() * 1000))
@@ -0,0 +1,62 @@
+# app/core/readiness.py
+"""
+Prontidão da instância (readiness) para o /readyz.
+
+O lifespan aquece os componentes em paralelo (pool de DB, catálogo,
+vocabulário, tickers) e registra o resultado de cada um aqui. A instância
+só fica pronta quando todos os componentes obrigatórios aqueceram; até lá o
+/readyz responde 503 e o balanceador não manda tráfego para ela. Depois do
+boot, o probe de DB (app/observability/health.py) reavalia `db_pool`: DB fora
+ou pool saturado tiram a instância do /readyz até normalizar.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from app.observability.metrics import APP_READY
+
+
+class Readiness:
+    def __init__(self, required: Iterable[str]) -> None:
+        self._required = tuple(required)
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def mark(
+        self,
+        component: str,
+        ok: bool,
+        error: Optional[str] = None,
+        elapsed_ms: Optional[float] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        with self._lock:
+            self._components[component] = {
+                "ok": ok,
+                "error": error,
+                "elapsed_ms": None if elapsed_ms is None else round(elapsed_ms, 1),
+                "at": time.time(),
+                **(details or {}),
+            }
+        APP_READY.set(1.0 if self.ready else 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._components.clear()
+        APP_READY.set(0.0)
+
+    @property
+    def ready(self) -> bool:
+        components = self._components
+        return all(components.get(c, {}).get("ok") for c in self._required)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            components = {k: dict(v) for k, v in self._components.items()}
+        return {"ready": self.ready, "components": components}
+
+
+READINESS = Readiness(required=("db_pool", "catalog", "vocab"))
@@ -5,7 +5,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import yaml
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -24,6 +24,9 @@ class Settings(BaseSettings):
     # Observabilidade
     prometheus_url: str = "http://prometheus:9090"
     grafana_url: str = "http://grafana:3000"
+    # health: probes em background (concorrentes, fora do event loop) a cada intervalo
+    health_probe_interval: float = 30.0
+    health_probe_timeout: float = 2.0
 
     # Logging
     log_format: str = "json"
@@ -34,7 +37,16 @@ class Settings(BaseSettings):
 
     # Cache / limites / métricas
     views_cache_ttl: int = 86400
+    # publica também o blob v1 e as chaves por entidade (só durante rollout com
+    # instâncias antigas: triplica as escritas de cada publicação)
+    views_publish_legacy_keys: bool = False
+    # snapshot pré-compilado (python -m app.registry.snapshot build); "" desliga
+    catalog_snapshot_path: str = "data/catalog.snapshot"
+    # hot reload: polling de mtime em VIEWS_DIR (troca só as entidades alteradas)
+    views_watch: bool = True
+    views_watch_interval: float = 2.0
     tickers_cache_ttl: float = 300.0
+    tickers_local_ttl: float = 30.0  # L1 em processo (refresh-ahead antes de expirar)
     ask_default_limit: int = 100
     ask_max_limit: int = 1000
     api_latency_window: int = 60  # segundos (janela para dashboards)
@@ -42,6 +54,8 @@ class Settings(BaseSettings):
 
     # NLP / orchestrator
     nlp_relative_dates: bool = True
+    tickers_fuzzy: bool = True  # tolera typos de 1 edição (HGLG1 -> HGLG11)
+    tickers_fuzzy_min_confidence: float = 0.7
 
     # Assinatura de YAMLs (endurecimento opcional do pipeline)
     views_signature_mode: str = "none"  # none|sha256|hmac
@@ -49,13 +63,69 @@ class Settings(BaseSettings):
     views_signature_required: bool = False
 
     # Redis
-    cache_backend: str = "local"  # local|redis
+    cache_backend: str = "local"  # local|redis|tiered (L1 local + L2 redis)
     redis_url: str | None = None
     cache_namespace: str = "mosaic"
+    # cache em memória (LRU + TTL): limites e intervalo da varredura de expiração
+    local_cache_max_entries: int = 10000
+    local_cache_max_bytes: int = 64 * 1024 * 1024
+    local_cache_sweep_interval: float = 30.0
+    # Redis: timeouts curtos (caminho de request), pool e circuit breaker
+    redis_socket_timeout: float = 0.25
+    redis_connect_timeout: float = 0.25
+    redis_max_connections: int = 32
+    redis_breaker_failures: int = 5  # falhas consecutivas para abrir o circuito
+    redis_breaker_reset_seconds: float = 10.0  # tempo aberto antes da chamada de prova
+    # codec dos valores (json|msgpack|pickle) + compressão (none|zlib|lz4) acima do limiar
+    # msgpack/lz4 exigem o extra "cache" (pip install .[cache]); todas as instâncias
+    # que compartilham o Redis precisam do mesmo codec (decode rejeita os outros)
+    cache_codec: str = "json"
+    cache_compression: str = "zlib"
+    cache_compress_threshold: int = 1024
+    # tiered: TTL máximo no L1 (limita a janela se uma invalidação pub/sub se perder)
+    cache_l1_ttl: float = 5.0
 
     # Pool de DB
     db_pool_min: int = 1
     db_pool_max: int = 10
+    db_pool_acquire_timeout: float = 5.0  # espera máxima por conexão livre (depois: 503)
+    db_pool_max_waiting: int = 0  # limite da fila por conexões (0 = sem limite)
+    db_probe_timeout: float = 1.0  # liveness (SELECT 1): espera por conexão + statement_timeout
+    # fração do pool em uso (com requests na fila) a partir da qual a instância sai do /readyz
+    db_pool_saturation_threshold: float = 1.0
+
+    # Controle de admissão (/ask, /views/run): concorrência por endpoint + fila limitada;
+    # o limite se adapta (AIMD) à latência média das queries no DB
+    admission_enabled: bool = True
+    admission_limits: Dict[str, int] = {"/ask": 16, "/views/run": 16}  # limite inicial
+    admission_min_limit: int = 2
+    admission_max_limit: int = 64
+    admission_queue_size: int = 32  # fila cheia -> 429
+    admission_queue_timeout: float = 2.0  # espera máxima na fila -> 503
+    admission_latency_target_ms: float = 250.0  # acima disso o limite cai (x decrease)
+    admission_decrease_factor: float = 0.9
+
+    # Rate limiting por cliente (token bucket; Redis quando ativo, senão em memória)
+    # opt-in: sem API key cadastrada a chave é o IP de `scope["client"]`; atrás de
+    # proxy, só ligue com o uvicorn confiando no X-Forwarded-For do proxy
+    # (FORWARDED_ALLOW_IPS), senão todo o tráfego cai num único bucket
+    rate_limit_enabled: bool = False
+    rate_limit_paths: List[str] = ["/ask", "/views/run"]  # path exato
+    rate_limit_api_key_header: str = "X-API-Key"
+    # tier -> rate (tokens/s) e burst (rajada máxima)
+    rate_limit_tiers: Dict[str, Dict[str, float]] = {
+        "default": {"rate": 5.0, "burst": 20.0},
+        "partner": {"rate": 50.0, "burst": 100.0},
+    }
+    # sha256 (hex) da API key -> client_id; só chaves cadastradas identificam o cliente
+    rate_limit_api_keys: Dict[str, str] = {}
+    rate_limit_clients: Dict[str, str] = {}  # client_id -> tier
+
+    # Deadlines: header X-Request-Timeout (segundos) ou padrão por endpoint;
+    # vira statement_timeout das queries e é checado entre etapas do /ask
+    request_timeout_header: str = "X-Request-Timeout"
+    request_timeouts: Dict[str, float] = {"/ask": 15.0, "/views/run": 15.0}
+    request_timeout_max: float = 60.0
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
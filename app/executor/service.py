@@ -1,19 +1,26 @@
 # app/executor/service.py
 import hashlib
 import re
+import threading
 import time
-from typing import Any, Dict, List
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
 
-from psycopg import sql
+from psycopg import OperationalError, sql
+from psycopg.errors import QueryCanceled
 from psycopg.rows import dict_row
 
 try:
-    from psycopg_pool import ConnectionPool
+    from psycopg_pool import ConnectionPool, PoolTimeout, TooManyRequests
 except ModuleNotFoundError:
-    from contextlib import contextmanager
-
     import psycopg
 
+    class PoolTimeout(OperationalError):  # type: ignore[no-redef]
+        pass
+
+    class TooManyRequests(OperationalError):  # type: ignore[no-redef]
+        pass
+
     class ConnectionPool:  # type: ignore[no-redef]
         """Fallback simples quando psycopg_pool não está disponível."""
 
@@ -23,14 +30,22 @@ except ModuleNotFoundError:
             min_size: int = 1,
             max_size: int = 1,
             kwargs: Dict[str, Any] | None = None,
+            timeout: float = 30.0,
+            max_waiting: int = 0,
             open: bool = True,
         ) -> None:
+            # sem pool real: cada uso abre uma conexão (timeout vira connect_timeout)
             self._conninfo = conninfo
             self._kwargs = kwargs or {}
+            self._timeout = timeout
 
         @contextmanager
-        def connection(self):  # type: ignore[override]
-            conn = psycopg.connect(self._conninfo, **self._kwargs)
+        def connection(self, timeout: float | None = None):  # type: ignore[override]
+            kwargs = dict(self._kwargs)
+            timeout = self._timeout if timeout is None else timeout
+            if timeout is not None:
+                kwargs.setdefault("connect_timeout", max(1, int(timeout)))
+            conn = psycopg.connect(self._conninfo, **kwargs)
             try:
                 yield conn
             finally:
@@ -40,7 +55,32 @@ except ModuleNotFoundError:
             """Compatibilidade com API do psycopg_pool.ConnectionPool."""
             return None
 
+from app.core import deadline
 from app.core.settings import settings
+from app.observability.metrics import (
+    DB_POOL_ACQUIRE_MS,
+    DB_POOL_CONNECTIONS,
+    DB_POOL_CONNECTIONS_OPENED,
+    DB_POOL_ERRORS,
+    DB_POOL_RECONNECTIONS,
+    DB_POOL_SIZE,
+    DB_POOL_WAITING,
+)
+
+
+class PoolExhaustedError(RuntimeError):
+    """Nenhuma conexão livre dentro de `db_pool_acquire_timeout` (a API responde 503)."""
+
+
+_EWMA_ALPHA = 0.2
+
+# contadores cumulativos do psycopg_pool -> (métrica, rótulos)
+_POOL_COUNTERS = {
+    "connections_num": (DB_POOL_CONNECTIONS_OPENED, {}),
+    "connections_errors": (DB_POOL_ERRORS, {"type": "connect"}),
+    "connections_lost": (DB_POOL_RECONNECTIONS, {}),
+    "returns_bad": (DB_POOL_RECONNECTIONS, {}),
+}
 
 
 class ExecutorService:
@@ -51,18 +91,155 @@ class ExecutorService:
         self.dsn = settings.database_url
         if not self.dsn:
             raise RuntimeError("DATABASE_URL não configurado")
-        # Pool de conexões da aplicação
-        self.pool = ConnectionPool(
-            conninfo=self.dsn,
-            min_size=settings.db_pool_min,
-            max_size=settings.db_pool_max,
-            kwargs={"autocommit": True},
-            open=True,
-        )
+        # Pool de conexões da aplicação: criado no primeiro uso (import não conecta)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._stats_seen: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        # média móvel (EWMA) da latência das queries: sinal do controle de admissão
+        self.latency_ewma_ms = 0.0
+
+    @property
+    def pool(self) -> ConnectionPool:
+        pool = self._pool
+        if pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        conninfo=self.dsn,
+                        min_size=settings.db_pool_min,
+                        max_size=settings.db_pool_max,
+                        kwargs={"autocommit": True},
+                        timeout=settings.db_pool_acquire_timeout,
+                        max_waiting=settings.db_pool_max_waiting,
+                        open=True,
+                    )
+                    self._stats_seen = {}
+                pool = self._pool
+        return pool
+
+    def warm_up(self, timeout: float = 10.0) -> None:
+        """Abre o pool e aguarda as conexões mínimas (db_pool_min).
+
+        Se falhar, descarta o pool: o psycopg_pool fecha o pool quando `wait`
+        estoura, e a próxima tentativa (ou query) precisa de um pool novo.
+        """
+        pool = self.pool
+        try:
+            wait = getattr(pool, "wait", None)
+            if wait is not None:
+                wait(timeout=timeout)
+                return
+            with pool.connection() as conn:
+                conn.execute("SELECT 1")
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        # o próximo uso recria o pool (lazy), como no primeiro acesso
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+    def ping(self, timeout: float = 1.0) -> Dict[str, Any]:
+        """Liveness do DB: `SELECT 1` numa conexão do pool, com timeout curto.
+
+        Não passa pelo builder/formatter nem conta em DB_QUERIES/DB_ROWS.
+        Retorna a latência e as estatísticas do pool (ver `pool_stats`).
+        """
+        start = time.perf_counter()
+        with self.pool.connection(timeout=timeout) as conn:
+            with conn.transaction():
+                conn.execute(f"SET LOCAL statement_timeout = {max(1, int(timeout * 1000))}")
+                conn.execute("SELECT 1")
+        return {"latency_ms": round((time.perf_counter() - start) * 1000, 1), **self.pool_stats()}
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Tamanho/ocupação do pool e saturação (conexões todas em uso com fila)."""
+        get_stats = getattr(self._pool, "get_stats", None)
+        if get_stats is None:
+            return {}
+        raw = get_stats()
+        self._report_pool(raw)
+        size, idle = raw.get("pool_size", 0), raw.get("pool_available", 0)
+        max_size = raw.get("pool_max", settings.db_pool_max) or 1
+        waiting = raw.get("requests_waiting", 0)
+        in_use = max(0, size - idle)
+        return {
+            "size": size,
+            "max": max_size,
+            "idle": idle,
+            "in_use": in_use,
+            "waiting": waiting,
+            "saturated": waiting > 0
+            and in_use / max_size >= settings.db_pool_saturation_threshold,
+        }
+
+    def _report_pool(self, raw: Dict[str, int]) -> None:
+        size, idle = raw.get("pool_size", 0), raw.get("pool_available", 0)
+        DB_POOL_SIZE.set(size)
+        DB_POOL_CONNECTIONS.labels(state="idle").set(idle)
+        DB_POOL_CONNECTIONS.labels(state="in_use").set(max(0, size - idle))
+        DB_POOL_WAITING.set(raw.get("requests_waiting", 0))
+        with self._stats_lock:
+            for key, (metric, labels) in _POOL_COUNTERS.items():
+                value = raw.get(key, 0)
+                delta = value - self._stats_seen.get(key, 0)
+                if delta > 0:
+                    (metric.labels(**labels) if labels else metric).inc(delta)
+                self._stats_seen[key] = value
+
+    def _refresh_pool_metrics(self) -> None:
+        get_stats = getattr(self._pool, "get_stats", None)
+        if get_stats is not None:
+            self._report_pool(get_stats())
+
+    @contextmanager
+    def _connect(self) -> Iterator[Any]:
+        """Conexão do pool com espera limitada e métricas de aquisição.
 
-    def _connect(self):
-        """Retorna o context manager do pool sem ‘entrar’ aqui."""
-        return self.pool.connection()
+        Sem conexão livre em `db_pool_acquire_timeout` (ou com a fila cheia,
+        `db_pool_max_waiting`) levanta PoolExhaustedError em vez de esperar
+        indefinidamente.
+        """
+        start = time.perf_counter()
+        conn = None
+        try:
+            with self.pool.connection(timeout=settings.db_pool_acquire_timeout) as conn:
+                DB_POOL_ACQUIRE_MS.observe((time.perf_counter() - start) * 1000.0)
+                self._refresh_pool_metrics()
+                yield conn
+        except (PoolTimeout, TooManyRequests) as e:
+            if conn is not None:
+                raise
+            DB_POOL_ACQUIRE_MS.observe((time.perf_counter() - start) * 1000.0)
+            DB_POOL_ERRORS.labels(type="timeout" if isinstance(e, PoolTimeout) else "queue_full").inc()
+            raise PoolExhaustedError(str(e)) from e
+        except OperationalError:
+            # só conta conexão quebrada/recusada (não cancelamentos de query)
+            if conn is None or getattr(conn, "broken", False):
+                DB_POOL_ERRORS.labels(type="connection").inc()
+            raise
+        finally:
+            self._refresh_pool_metrics()
+
+    def _execute(self, conn, sql: str, params: Dict[str, Any] | None) -> List[Dict[str, Any]]:
+        current = deadline.current()
+        if current is None:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(sql, params or {})
+                return cur.fetchall()
+        cancel = getattr(conn, "cancel_safe", None) or conn.cancel
+        try:
+            with current.on_cancel(cancel), conn.transaction():
+                conn.execute(f"SET LOCAL statement_timeout = {deadline.budget_ms()}")
+                with conn.cursor(row_factory=dict_row) as cur:
+                    cur.execute(sql, params or {})
+                    return cur.fetchall()
+        except QueryCanceled as e:
+            raise current.exceeded("db") from e
 
     def _hash_sql(self, sql: str) -> str:
         return hashlib.sha1(sql.encode("utf-8")).hexdigest()[:10]
@@ -70,8 +247,32 @@ class ExecutorService:
     def run(
         self, sql: str, params: Dict[str, Any] | None = None, row_limit: int = 100
     ) -> List[Dict[str, Any]]:
-        """Executa a query no Postgres e retorna as linhas."""
+        """Executa a query no Postgres e retorna as linhas.
+
+        Com prazo de requisição ativo (app/core/deadline.py), a query roda com
+        `SET LOCAL statement_timeout` = orçamento restante e é cancelada se o
+        cliente desconectar; nos dois casos levanta DeadlineExceeded.
+        """
+        deadline.check("db")
         start = time.perf_counter()
+        failure: BaseException | None = None
+        try:
+            rows = self._run(sql, params)
+        except BaseException as e:
+            failure = e
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._observe_latency(elapsed_ms, failure)
+
+        # log local mínimo (pode evoluir para métricas Prometheus)
+        print(
+            f"[Executor] SQL {self._hash_sql(sql)} | linhas={len(rows)} | tempo={elapsed_ms:.1f}ms | modo={self.mode}"
+        )
+
+        return rows
+
+    def _run(self, sql: str, params: Dict[str, Any] | None) -> List[Dict[str, Any]]:
         with self._connect() as conn:
             # aplica read-only na sessão se configurado
             if self.mode == "read-only":
@@ -84,17 +285,21 @@ class ExecutorService:
                     print(
                         f"[Executor] aviso: não foi possível aplicar modo read-only: {e}"
                     )
-            with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute(sql, params or {})
-                rows = cur.fetchall()
-        elapsed_ms = (time.perf_counter() - start) * 1000
+            return self._execute(conn, sql, params)
 
-        # log local mínimo (pode evoluir para métricas Prometheus)
-        print(
-            f"[Executor] SQL {self._hash_sql(sql)} | linhas={len(rows)} | tempo={elapsed_ms:.1f}ms | modo={self.mode}"
-        )
+    def _observe_latency(self, elapsed_ms: float, failure: BaseException | None) -> None:
+        """Atualiza a EWMA de latência, inclusive quando a query falha.
 
-        return rows
+        Falhas entram com o tempo gasto (timeouts de query/prazo já custaram o
+        orçamento inteiro). Pool esgotado e erro de conexão entram com pelo
+        menos `db_pool_acquire_timeout`: uma conexão recusada falha em
+        milissegundos e, senão, puxaria a média para baixo com o DB fora.
+        """
+        if isinstance(failure, PoolExhaustedError) or (
+            isinstance(failure, OperationalError) and not isinstance(failure, QueryCanceled)
+        ):
+            elapsed_ms = max(elapsed_ms, settings.db_pool_acquire_timeout * 1000)
+        self.latency_ewma_ms += _EWMA_ALPHA * (elapsed_ms - self.latency_ewma_ms)
 
     def columns_for(self, entity: str) -> list[str]:
         """Retorna as colunas reais da view no Postgres (seguro contra injection)."""
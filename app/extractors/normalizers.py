@@ -61,7 +61,7 @@ def normalize_request(req: Dict[str, Any]) -> ExtractedRunRequest:
     # Cópia defensiva da requisição para evitar mutação externa
     req_local = dict(req or {})
     entity = req_local.get("entity")
-    if not registry_service.get(entity):
+    if not registry_service.descriptor(entity):
         raise ValueError(f"entity '{entity}' desconhecida")
     # Cópia defensiva dos filtros
     raw_filters = req_local.get("filters") or {}
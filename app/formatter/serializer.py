@@ -2,7 +2,7 @@
 import re
 from datetime import date, datetime
 from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 Number = Union[int, float, Decimal]
 
@@ -112,58 +112,90 @@ def _fmt_int_br(x: Any) -> Optional[str]:
     return _fmt_br(d, 0)
 
 
-def _format_field(key: str, val: Any) -> Any:
+def field_kind(key: str) -> Optional[str]:
+    """Tipo de formatação de uma coluna pelo sufixo (None = sem formatação)."""
     # Datas por sufixo (aceita date/datetime ou string ISO)
     if any(key.endswith(suf) for suf in DATE_SUFFIXES):
-        if isinstance(val, (date, datetime)):
-            return _to_br_from_dateobj(val)
-        if isinstance(val, str):
-            return _iso_to_br_date(val)
-        return val
-
+        return "date"
     # Moeda (novos + legado)
     if any(key.endswith(suf) for suf in MONEY_SUFFIXES + LEGACY_MONEY_SUFFIXES):
-        out = _fmt_money_br(val)
-        return out if out is not None else val
-
+        return "money"
     # Percentual
     if any(key.endswith(suf) for suf in PERCENT_SUFFIXES) or key.endswith("_range"):
-        out = _fmt_percent_br(val)
-        return out if out is not None else val
-
+        return "percent"
     # Área m² (2 casas)
     if any(key.endswith(suf) for suf in AREA_SUFFIXES):
-        num = _fmt_value_br(val, 2)
-        return f"{num} m²" if num is not None else val
-
+        return "area"
     # Valores com 2 casas padrão
     if any(key.endswith(suf) for suf in VALUE_SUFFIXES):
-        out = _fmt_value_br(val, 2)
-        return out if out is not None else val
-
+        return "value"
     # Razões com 4 casas
     if any(key.endswith(suf) for suf in FOUR_DECIMAL_SUFFIXES):
-        out = _fmt_value_br(val, 4)
-        return out if out is not None else val
-
+        return "decimal4"
     # Taxas/índices com 3 casas
     if any(key.endswith(suf) for suf in THREE_DECIMAL_SUFFIXES):
-        out = _fmt_value_br(val, 3)
-        return out if out is not None else val
-
+        return "decimal3"
     # Contadores inteiros
     if any(key.endswith(suf) for suf in INT_SUFFIXES):
-        out = _fmt_int_br(val)
-        return out if out is not None else val
+        return "int"
+    return None
 
+
+def _format_date(val: Any) -> Any:
+    if isinstance(val, (date, datetime)):
+        return _to_br_from_dateobj(val)
+    if isinstance(val, str):
+        return _iso_to_br_date(val)
     return val
 
 
-def to_human(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _or_raw(fn):
+    def _apply(val: Any) -> Any:
+        out = fn(val)
+        return out if out is not None else val
+
+    return _apply
+
+
+def _format_area(val: Any) -> Any:
+    num = _fmt_value_br(val, 2)
+    return f"{num} m²" if num is not None else val
+
+
+_KIND_FORMATTERS = {
+    "date": _format_date,
+    "money": _or_raw(_fmt_money_br),
+    "percent": _or_raw(_fmt_percent_br),
+    "area": _format_area,
+    "value": _or_raw(lambda v: _fmt_value_br(v, 2)),
+    "decimal4": _or_raw(lambda v: _fmt_value_br(v, 4)),
+    "decimal3": _or_raw(lambda v: _fmt_value_br(v, 3)),
+    "int": _or_raw(_fmt_int_br),
+}
+
+
+def _format_field(key: str, val: Any) -> Any:
+    kind = field_kind(key)
+    return _KIND_FORMATTERS[kind](val) if kind else val
+
+
+def to_human(
+    rows: List[Dict[str, Any]], formatters: Optional[Mapping[str, Optional[str]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Formata linhas para exibição (pt-BR).
+    `formatters` (coluna -> tipo, ver `field_kind`) evita reavaliar sufixos por
+    célula; colunas ausentes na tabela são classificadas uma vez por chamada.
+    """
+    kinds: Dict[str, Optional[str]] = dict(formatters or {})
     out: List[Dict[str, Any]] = []
     for r in rows:
         d: Dict[str, Any] = {}
         for k, v in r.items():
-            d[k] = _format_field(k, v)
+            if k in kinds:
+                kind = kinds[k]
+            else:
+                kind = kinds[k] = field_kind(k)
+            d[k] = _KIND_FORMATTERS[kind](v) if kind else v
         out.append(d)
     return out
@@ -0,0 +1,203 @@
+# app/gateway/admission.py
+"""
+Controle de admissão (load shedding) para os endpoints caros (/ask, /views/run).
+
+Cada endpoint tem um limite de requisições concorrentes e uma fila limitada:
+
+- abaixo do limite, a requisição entra direto;
+- no limite, espera na fila (FIFO) até `admission_queue_timeout`; estourou o
+  tempo -> 503 com Retry-After;
+- fila cheia -> 429 com Retry-After, sem esperar.
+
+O limite é adaptativo (AIMD) e segue a latência média das queries no Postgres
+(`executor_service.latency_ewma_ms`): acima de `admission_latency_target_ms`
+cai multiplicativamente (no máximo uma vez por segundo); abaixo, com o
+endpoint saturado, sobe ~1 a cada `limite` requisições concluídas. Assim,
+quando o DB degrada, a instância aceita menos trabalho em vez de empilhar
+requisições no threadpool e no pool de conexões até todas darem timeout.
+
+Middleware ASGI puro: roda no event loop, sem locks (estado só do loop).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.settings import settings
+from app.executor.service import executor_service
+from app.observability.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_LIMIT,
+    ADMISSION_QUEUE_WAIT_MS,
+    ADMISSION_QUEUED,
+    ADMISSION_REJECTED,
+)
+
+_DECREASE_COOLDOWN = 1.0
+
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """Semáforo com fila limitada e limite AIMD (uso exclusivo do event loop)."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        limit: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        queue_size: int = 32,
+        queue_timeout: float = 2.0,
+        latency_target_ms: float = 250.0,
+        decrease_factor: float = 0.9,
+        latency: Callable[[], float] = lambda: executor_service.latency_ewma_ms,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.endpoint = endpoint
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self._limit = float(min(max(limit, self.min_limit), self.max_limit))
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.latency_target_ms = latency_target_ms
+        self.decrease_factor = decrease_factor
+        self._latency = latency
+        self._clock = clock
+        self._last_decrease = -math.inf
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._report()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self._report()
+            return
+        if len(self._waiters) >= self.queue_size:
+            ADMISSION_REJECTED.labels(endpoint=self.endpoint, reason="queue_full").inc()
+            raise Rejected(429, "queue_full", self._retry_after())
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self._report()
+        t0 = time.perf_counter()
+        try:
+            # o slot é transferido por `release` (in_flight já contabilizado)
+            await asyncio.wait_for(asyncio.shield(fut), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                return  # recebeu o slot no limite do timeout
+            fut.cancel()
+            ADMISSION_REJECTED.labels(endpoint=self.endpoint, reason="queue_timeout").inc()
+            raise Rejected(503, "queue_timeout", self._retry_after())
+        except asyncio.CancelledError:
+            # cliente desconectou na fila: devolve o slot se já tinha recebido
+            if fut.done() and not fut.cancelled():
+                self.release()
+            else:
+                fut.cancel()
+            raise
+        finally:
+            if fut in self._waiters:
+                self._waiters.remove(fut)
+            ADMISSION_QUEUE_WAIT_MS.labels(endpoint=self.endpoint).observe(
+                (time.perf_counter() - t0) * 1000.0
+            )
+            self._report()
+
+    def release(self) -> None:
+        saturated = self.in_flight >= self.limit or bool(self._waiters)
+        self.in_flight -= 1
+        self._adjust(saturated)
+        # entrega slots livres aos primeiros da fila (FIFO)
+        while self._waiters and self.in_flight < self.limit:
+            fut = self._waiters.popleft()
+            if fut.done():
+                continue  # desistiu (timeout)
+            self.in_flight += 1
+            fut.set_result(None)
+        self._report()
+
+    def _adjust(self, saturated: bool) -> None:
+        latency = self._latency()
+        if latency > self.latency_target_ms:
+            now = self._clock()
+            if now - self._last_decrease >= _DECREASE_COOLDOWN:
+                self._last_decrease = now
+                self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+        elif saturated:
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_timeout))
+
+    def _report(self) -> None:
+        ADMISSION_LIMIT.labels(endpoint=self.endpoint).set(self.limit)
+        ADMISSION_IN_FLIGHT.labels(endpoint=self.endpoint).set(self.in_flight)
+        ADMISSION_QUEUED.labels(endpoint=self.endpoint).set(len(self._waiters))
+
+
+def limiters_from_settings() -> Dict[str, AdaptiveLimiter]:
+    return {
+        endpoint: AdaptiveLimiter(
+            endpoint,
+            limit,
+            min_limit=settings.admission_min_limit,
+            max_limit=settings.admission_max_limit,
+            queue_size=settings.admission_queue_size,
+            queue_timeout=settings.admission_queue_timeout,
+            latency_target_ms=settings.admission_latency_target_ms,
+            decrease_factor=settings.admission_decrease_factor,
+        )
+        for endpoint, limit in settings.admission_limits.items()
+    }
+
+
+class AdmissionMiddleware:
+    """Aplica o `AdaptiveLimiter` do endpoint (path exato) antes do handler."""
+
+    def __init__(self, app: ASGIApp, limiters: Optional[Dict[str, AdaptiveLimiter]] = None) -> None:
+        self.app = app
+        self.limiters = limiters if limiters is not None else limiters_from_settings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = self.limiters.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await limiter.acquire()
+        except Rejected as r:
+            response = JSONResponse(
+                {"detail": "serviço sobrecarregado, tente novamente", "reason": r.reason},
+                status_code=r.status_code,
+                headers={"Retry-After": str(r.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -0,0 +1,85 @@
+# app/gateway/deadline.py
+"""
+Middleware ASGI de deadline por requisição (ver app/core/deadline.py).
+
+Prazo = header `request_timeout_header` (segundos, limitado a
+`request_timeout_max`) ou o padrão do endpoint em `request_timeouts`; paths
+sem padrão e sem header seguem sem prazo. Depois que o corpo foi lido, o
+middleware escuta `http.disconnect`: se o cliente desistir, o deadline é
+cancelado e as queries em andamento recebem cancelamento no Postgres.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.deadline import deadline_scope
+from app.core.settings import settings
+
+
+def _timeout_for(scope: Scope) -> Optional[float]:
+    header = settings.request_timeout_header.lower().encode("latin-1")
+    for name, value in scope.get("headers") or ():
+        if name == header:
+            try:
+                timeout = float(value.decode("latin-1"))
+            except ValueError:
+                break
+            if timeout > 0:
+                return min(timeout, settings.request_timeout_max)
+            break
+    return settings.request_timeouts.get(scope.get("path", ""))
+
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        timeout = _timeout_for(scope) if scope["type"] == "http" else None
+        if timeout is None:
+            await self.app(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        watcher: Optional[asyncio.Task] = None
+        disconnected: Optional[Message] = None
+        responded = False
+
+        with deadline_scope(timeout, endpoint=scope.get("path", "-")) as deadline:
+
+            async def watch_disconnect() -> None:
+                nonlocal disconnected
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected = message
+                    if responded:
+                        return  # desconexão normal, depois da resposta
+                    # cancelamento no Postgres é bloqueante: fora do event loop
+                    await loop.run_in_executor(None, deadline.cancel)
+
+            async def receive_wrapper() -> Message:
+                nonlocal watcher
+                if watcher is not None:
+                    # o app quer ler depois do corpo: só resta a desconexão
+                    await asyncio.shield(watcher)
+                    return disconnected or {"type": "http.disconnect"}
+                message = await receive()
+                if message["type"] == "http.request" and not message.get("more_body"):
+                    watcher = asyncio.create_task(watch_disconnect())
+                return message
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal responded
+                if message["type"] == "http.response.body" and not message.get("more_body"):
+                    responded = True
+                await send(message)
+
+            try:
+                await self.app(scope, receive_wrapper, send_wrapper)
+            finally:
+                if watcher is not None and not watcher.done():
+                    watcher.cancel()
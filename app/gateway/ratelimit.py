@@ -0,0 +1,228 @@
+# app/gateway/ratelimit.py
+"""
+Rate limiting por cliente (token bucket) para /ask e /views/run.
+
+Middleware ASGI por fora do controle de admissão: um cliente sem cota recebe
+429 antes de ocupar slot ou lugar na fila de admissão. Por isso a chave do
+cliente sai só dos headers e do IP, sem ler o corpo.
+
+Chave do cliente: o client_id da API key (header `rate_limit_api_key_header`)
+quando o sha256 dela está cadastrado em `rate_limit_api_keys`; sem chave, ou
+com chave desconhecida, o IP de origem. Nada vindo do corpo (ex.:
+`client.client_id` do /ask) identifica o cliente: sem verificação, bastaria
+trocar o id a cada request para ganhar um bucket novo ou a cota de outro
+tier. Cada cliente tem um tier (`rate_limit_clients`, padrão "default") com
+cota em `rate_limit_tiers`: `rate` tokens/s e rajada `burst`.
+
+O IP vem de `scope["client"]`. Atrás de proxy reverso esse é o IP do proxy,
+a não ser que o uvicorn aceite o X-Forwarded-For dele (`--proxy-headers` com
+`FORWARDED_ALLOW_IPS` = endereço do proxy); sem isso, todos os clientes sem
+API key dividem um bucket. Por isso o rate limit é opt-in
+(`rate_limit_enabled`).
+
+Os buckets ficam no Redis (script Lua atômico, relógio do próprio Redis;
+vale para todas as instâncias) quando um backend com Redis está ativo, e em
+memória caso contrário. Se o Redis falhar, o circuit breaker desvia para os
+buckets locais (cota por instância) até ele voltar, sem derrubar o request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.settings import settings
+from app.infrastructure.cache import get_redis_backend
+from app.infrastructure.circuit_breaker import CircuitBreaker
+from app.observability.metrics import RATE_LIMITED
+
+logger = logging.getLogger("gateway.ratelimit")
+
+# (permitido, segundos até haver token suficiente)
+Decision = Tuple[bool, float]
+
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(retry)}
+"""
+
+
+class RateLimitedError(Exception):
+    def __init__(self, retry_after: float, tier: str) -> None:
+        super().__init__(f"rate limit excedido (tier {tier})")
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.tier = tier
+
+
+class LocalTokenBuckets:
+    """Buckets em memória (por instância), limitados a `max_keys` (LRU)."""
+
+    blocking = False  # só memória: pode rodar direto no event loop
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Decision:
+        now = self._clock()
+        with self._lock:
+            tokens, ts = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + max(0.0, now - ts) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+class RedisTokenBuckets:
+    """Buckets no Redis via script Lua (leitura + recarga + consumo atômicos)."""
+
+    blocking = True  # redis-py síncrono: fora do event loop
+
+    def __init__(
+        self,
+        client,
+        prefix: str,
+        fallback: LocalTokenBuckets,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+        self.prefix = prefix
+        self.fallback = fallback
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.redis_breaker_failures,
+            reset_seconds=settings.redis_breaker_reset_seconds,
+        )
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Decision:
+        if not self.breaker.allow():
+            return self.fallback.take(key, rate, burst, cost)
+        try:
+            allowed, retry = self._script(keys=[f"{self.prefix}{key}"], args=[rate, burst, cost])
+        except Exception as ex:
+            self.breaker.record_failure()
+            logger.warning("rate limit no Redis falhou, usando buckets locais: %s", ex)
+            return self.fallback.take(key, rate, burst, cost)
+        self.breaker.record_success()
+        return bool(int(allowed)), float(retry)
+
+
+class RateLimiter:
+    def __init__(self, buckets) -> None:
+        self.buckets = buckets
+
+    @staticmethod
+    def client_key(api_key: Optional[str], ip: Optional[str]) -> Tuple[str, str]:
+        """(chave do bucket, client_id usado para o tier; "" sem cliente verificado)."""
+        if api_key:
+            digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+            client_id = settings.rate_limit_api_keys.get(digest)
+            if client_id:
+                return f"client:{client_id}", client_id
+        return f"ip:{ip or 'unknown'}", ""
+
+    def enforce(
+        self,
+        endpoint: str,
+        api_key: Optional[str] = None,
+        ip: Optional[str] = None,
+    ) -> None:
+        """Consome 1 token do cliente; levanta RateLimitedError (-> 429) sem cota."""
+        if not settings.rate_limit_enabled:
+            return
+        key, client_id = self.client_key(api_key, ip)
+        tier = settings.rate_limit_clients.get(client_id, "default")
+        quota = settings.rate_limit_tiers.get(tier) or settings.rate_limit_tiers["default"]
+        rate, burst = float(quota["rate"]), float(quota["burst"])
+        allowed, retry_after = self.buckets.take(key, rate, burst)
+        if not allowed:
+            RATE_LIMITED.labels(endpoint=endpoint, tier=tier).inc()
+            raise RateLimitedError(retry_after, tier)
+
+
+def _create_buckets():
+    local = LocalTokenBuckets()
+    # mesmo pool/timeouts/breaker do cache: Redis lento não segura o /ask
+    backend = get_redis_backend()
+    if backend is None:
+        return local
+    prefix = f"{settings.cache_namespace.rstrip(':')}:ratelimit:"
+    return RedisTokenBuckets(backend.client, prefix, fallback=local, breaker=backend.breaker)
+
+
+RATE_LIMITER = RateLimiter(_create_buckets())
+
+
+def _header(scope: Scope, name: str) -> Optional[str]:
+    wanted = name.lower().encode("latin-1")
+    for key, value in scope.get("headers") or ():
+        if key == wanted:
+            return value.decode("latin-1")
+    return None
+
+
+class RateLimitMiddleware:
+    """Aplica o `RateLimiter` nos paths de `rate_limit_paths` antes da admissão."""
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None) -> None:
+        self.app = app
+        self.limiter = limiter if limiter is not None else RATE_LIMITER
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or not settings.rate_limit_enabled
+            or path not in settings.rate_limit_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+        api_key = _header(scope, settings.rate_limit_api_key_header)
+        client = scope.get("client")
+        ip = client[0] if client else None
+        try:
+            if getattr(self.limiter.buckets, "blocking", True):
+                await asyncio.to_thread(self.limiter.enforce, path, api_key, ip)
+            else:
+                self.limiter.enforce(path, api_key, ip)
+        except RateLimitedError as exc:
+            response = JSONResponse(
+                {"detail": "limite de requisições excedido", "tier": exc.tier},
+                status_code=429,
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
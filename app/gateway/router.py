@@ -4,16 +4,19 @@ import time
 import uuid
 from typing import Any, Dict, List, Optional
 
-import httpx
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from app.builder.service import builder_service
+from app.core.readiness import READINESS
 from app.core.settings import settings
 from app.executor.service import executor_service
 from app.extractors.normalizers import ExtractedRunRequest, normalize_request
 from app.formatter.serializer import to_human
+from app.observability.health import HEALTH
 from app.observability.metrics import (
+    API_ENDPOINTS,
     API_ERRORS,
     API_LATENCY_MS,
     ASK_ERRORS,
@@ -25,11 +28,8 @@ from app.orchestrator.service import route_question
 from app.registry.service import registry_service
 
 # --- pré-registro de séries Prometheus p/ garantir exposição mesmo com zero ---
-# latência também (Gauge aparece só após set) – já vamos setar 0 inicial
-API_LATENCY_MS.labels(endpoint="/ask").set(0.0)
-API_LATENCY_MS.labels(endpoint="/views/run").set(0.0)
-
-for ep in ("/ask", "/views/run"):
+for ep in API_ENDPOINTS:
+    API_LATENCY_MS.labels(endpoint=ep)
     for etype in ("validation", "runtime"):
         API_ERRORS.labels(endpoint=ep, type=etype).inc(0)
 
@@ -47,9 +47,6 @@ if not logger.handlers:
 
 router = APIRouter()
 
-PROM_URL = settings.prometheus_url
-GRAF_URL = settings.grafana_url
-
 
 # ========================= modelos =========================
 
@@ -98,53 +95,19 @@ def healthz():
     return {"status": "ok"}
 
 
-@router.get("/healthz/full")
-def healthz_full():
-    from app.observability.metrics import set_health  # import local p/ evitar ciclos
-
-    status = {
-        "app": "up",
-        "db": {"ok": False, "error": None},
-        "prometheus": {"ok": False, "error": None},
-        "grafana": {"ok": False, "error": None},
-    }
+@router.get("/readyz")
+def readyz():
+    # 200 só depois do warm-up (pool, catálogo, vocabulário); antes disso, 503
+    snapshot = READINESS.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
 
-    # App está de pé
-    set_health("app", True)
 
-    # DB: tentativa leve (limit 1)
-    try:
-        probe = RunViewRequest(entity="view_fiis_info", select=["ticker"], limit=1)
-        _ = _execute_view(probe)  # se falhar, cai no except
-        status["db"]["ok"] = True
-    except Exception as ex:
-        status["db"]["error"] = str(ex)
-    finally:
-        set_health("db", bool(status["db"]["ok"]))
-
-    # Prometheus readiness
-    try:
-        with httpx.Client(timeout=2.0) as c:
-            r = c.get(f"{PROM_URL}/-/ready")
-            ok = (r.status_code == 200) and ("Prometheus" in r.text)
-            status["prometheus"]["ok"] = ok
-    except Exception as ex:
-        status["prometheus"]["error"] = str(ex)
-    finally:
-        set_health("prometheus", bool(status["prometheus"]["ok"]))
-
-    # Grafana health
-    try:
-        with httpx.Client(timeout=2.0) as c:
-            r = c.get(f"{GRAF_URL}/api/health")
-            ok = (r.status_code == 200) and ("database" in r.text)
-            status["grafana"]["ok"] = ok
-    except Exception as ex:
-        status["grafana"]["error"] = str(ex)
-    finally:
-        set_health("grafana", bool(status["grafana"]["ok"]))
-
-    return status
+@router.get("/healthz/full")
+async def healthz_full():
+    # snapshot dos probes em background (lifespan); só proba aqui se ainda não houve
+    snapshot = HEALTH.snapshot() if HEALTH.checked else await HEALTH.probe_all()
+    # estatísticas do pool lidas na hora (sem I/O)
+    return {**snapshot, "pool": executor_service.pool_stats()}
 
 
 @router.get("/views")
@@ -170,7 +133,7 @@ def get_view_columns(entity: str):
 
 @router.post("/admin/views/reload")
 def reload_registry():
-    registry_service.reload()
+    registry_service.reload(from_disk=True)
     return {"status": "ok", "items": registry_service.list_all()}
 
 
@@ -226,11 +189,12 @@ def _execute_view(req: RunViewRequest):
         DB_QUERIES.labels(entity=e).inc()
         DB_ROWS.labels(entity=e).inc(len(rows))
 
+        desc = registry_service.descriptor(entity)
         return {
             "request_id": req_id,
             "entity": entity,
             "rows": len(rows),
-            "data": to_human(rows),
+            "data": to_human(rows, desc.formatters if desc else None),
             "meta": {"elapsed_ms": int((time.time() - t0) * 1000)},
         }
     except ValueError as e:
@@ -248,38 +212,28 @@ def _execute_view(req: RunViewRequest):
         raise
 
 
+# latência de /views/run e /ask: observada uma vez no RequestIdMiddleware
 @router.post("/views/run")
 def run_view(req: RunViewRequest):
-    t0 = time.time()
     try:
-        resp = _execute_view(req)
-        # era: API_LATENCY_MS.labels(endpoint="/views/run").observe(...)
-        API_LATENCY_MS.labels(endpoint="/views/run").set((time.time() - t0) * 1000.0)
-        return resp
+        return _execute_view(req)
     except HTTPException:
         API_ERRORS.labels(endpoint="/views/run", type="validation").inc()
-        API_LATENCY_MS.labels(endpoint="/views/run").set((time.time() - t0) * 1000.0)
         raise
     except Exception:
         API_ERRORS.labels(endpoint="/views/run", type="runtime").inc()
-        API_LATENCY_MS.labels(endpoint="/views/run").set((time.time() - t0) * 1000.0)
         raise
 
 
 # ========================= /ask orientado por COMMENT =========================
 @router.post("/ask")
 def ask(req: AskRequest):
-    t0 = time.time()
     try:
         payload = req.model_dump(exclude_none=True, by_alias=True)
-        result = route_question(payload)
-        API_LATENCY_MS.labels(endpoint="/ask").set((time.time() - t0) * 1000.0)
-        return result
+        return route_question(payload)
     except HTTPException:
         API_ERRORS.labels(endpoint="/ask", type="validation").inc()
-        API_LATENCY_MS.labels(endpoint="/ask").set((time.time() - t0) * 1000.0)
         raise
     except Exception:
         API_ERRORS.labels(endpoint="/ask", type="runtime").inc()
-        API_LATENCY_MS.labels(endpoint="/ask").set((time.time() - t0) * 1000.0)
         raise
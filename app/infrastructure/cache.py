@@ -4,23 +4,53 @@ Infraestrutura de cache unificado do Sirios Mosaic.
 
 Suporta:
   - RedisCacheBackend (via redis-py)
-  - LocalCacheBackend (fallback em memória)
-Ambos seguem a interface CacheBackend (get/set/delete).
+  - LocalCacheBackend (fallback em memória, LRU + TTL, limitado)
+  - TieredCacheBackend (L1 em memória + L2 Redis, coerente via pub/sub)
+Todos seguem a interface CacheBackend (get/set/delete).
 """
 
 from __future__ import annotations
 
+import json
+import logging
+import threading
 import time
+import uuid
+import weakref
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Sequence
 
 from app.core.settings import settings
+from app.infrastructure.circuit_breaker import CLOSED, OPEN, STATE_VALUES, CircuitBreaker
+from app.infrastructure.codecs import ValueCodec, get_codec
+from app.observability.metrics import (
+    CACHE_LATENCY_MS,
+    CACHE_OPERATIONS,
+    CACHE_VALUE_BYTES,
+    LOCAL_CACHE_BYTES,
+    LOCAL_CACHE_ENTRIES,
+    LOCAL_CACHE_EVICTIONS,
+    LOCAL_CACHE_EXPIRATIONS,
+    REDIS_CIRCUIT_OPEN_SECONDS,
+    REDIS_CIRCUIT_STATE,
+    REDIS_ERRORS,
+    REDIS_LATENCY_MS,
+    REDIS_SHORT_CIRCUITS,
+)
+
+logger = logging.getLogger("infrastructure.cache")
+
+# backends que usam Redis (habilitam pub/sub)
+_REDIS_BACKENDS = ("redis", "tiered")
 
 
 # ---------------------------------------------------------------------
 # 🔹 Interfaces base
 # ---------------------------------------------------------------------
 class CacheBackend(ABC):
+    kind = "custom"  # label `backend` das métricas de cache
+
     @abstractmethod
     def get(self, key: str) -> Optional[str]:
         pass
@@ -33,93 +63,810 @@ class CacheBackend(ABC):
     def delete(self, key: str) -> None:
         pass
 
+    # Operações em lote: implementação padrão chave a chave; os backends
+    # sobrescrevem com a forma nativa (MGET/pipeline no Redis, 1 lock no local).
+    def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        """Valores na mesma ordem de `keys` (None para ausentes)."""
+        return [self.get(k) for k in keys]
+
+    def set_many(self, items: Mapping[str, str], ttl_seconds: int | None = None) -> None:
+        for k, v in items.items():
+            self.set(k, v, ttl_seconds)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        for k in keys:
+            self.delete(k)
+
+    def incr(self, key: str) -> int:
+        """Incrementa um contador inteiro (cria com 1); atômico nos backends nativos."""
+        value = int(self.get(key) or 0) + 1
+        self.set(key, str(value))
+        return value
+
+    def add(self, key: str, value: str, ttl_seconds: float) -> bool:
+        """Grava só se a chave não existir (SET NX); True se gravou. Base de locks."""
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, max(1, int(ttl_seconds)))
+        return True
+
+    def delete_if_equals(self, key: str, value: str) -> bool:
+        """Apaga só se o valor atual for `value` (liberação de lock); True se apagou."""
+        if self.get(key) != value:
+            return False
+        self.delete(key)
+        return True
+
+    # Valores binários e objetos via codec (ver app/infrastructure/codecs.py)
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        value = self.get(key)
+        return value.encode("utf-8") if isinstance(value, str) else value
+
+    def set_bytes(self, key: str, data: bytes, ttl_seconds: int | None = None) -> None:
+        self.set(key, data, ttl_seconds)  # type: ignore[arg-type]
+
+    def get_obj(self, key: str, codec: Optional[ValueCodec] = None) -> Any:
+        """Objeto decodificado (None se ausente ou ilegível)."""
+        data = self.get_bytes(key)
+        if data is None:
+            return None
+        try:
+            return (codec or get_codec()).decode(data)
+        except Exception as ex:
+            logger.warning("valor ilegível no cache (%s): %s", key, ex)
+            return None
+
+    def set_obj(
+        self, key: str, obj: Any, ttl_seconds: int | None = None, codec: Optional[ValueCodec] = None
+    ) -> None:
+        self.set_bytes(key, (codec or get_codec()).encode(obj), ttl_seconds)
+
 
 # ---------------------------------------------------------------------
 # 🔹 Implementações
 # ---------------------------------------------------------------------
 class LocalCacheBackend(CacheBackend):
-    """Cache em memória com TTL simples (para fallback)."""
+    """Cache em memória LRU com TTL, limitado por nº de entradas e bytes.
+
+    Thread-safe (handlers síncronos rodam no threadpool). Entradas vencidas
+    saem no `get` e também numa varredura periódica em background; ao passar
+    de `max_entries`/`max_bytes`, as menos usadas recentemente são removidas.
+    O tamanho contabilizado é aproximado: len(chave) + len(valor).
+    """
 
-    def __init__(self):
-        self._store: dict[str, tuple[str, Optional[float]]] = {}
+    kind = "local"
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        name: str = "local",
+    ):
+        self.name = name
+        self.max_entries = max_entries if max_entries is not None else settings.local_cache_max_entries
+        self.max_bytes = max_bytes if max_bytes is not None else settings.local_cache_max_bytes
+        # chave -> (valor, expira_em monotônico | None, tamanho)
+        self._store: OrderedDict[str, tuple[str, Optional[float], int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        _register_for_sweep(self)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
 
     def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._get(key, time.monotonic())
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        with self._lock:
+            now = time.monotonic()
+            return [self._get(k, now) for k in keys]
+
+    def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None:
+        exp = time.monotonic() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._set(key, value, exp)
+            self._evict()
+
+    def set_many(self, items: Mapping[str, str], ttl_seconds: int | None = None) -> None:
+        exp = time.monotonic() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            for k, v in items.items():
+                self._set(k, v, exp)
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+            self._report()
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for k in keys:
+                self._pop(k)
+            self._report()
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            v = self._store.get(key)
+            value = int(v[0]) + 1 if v is not None else 1
+            self._set(key, str(value), v[1] if v is not None else None)
+            self._evict()
+            return value
+
+    def add(self, key: str, value: str, ttl_seconds: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._get(key, now) is not None:
+                return False
+            self._set(key, value, now + ttl_seconds)
+            self._evict()
+            return True
+
+    def delete_if_equals(self, key: str, value: str) -> bool:
+        with self._lock:
+            if self._get(key, time.monotonic()) != value:
+                return False
+            self._pop(key)
+            self._report()
+            return True
+
+    # -- internos (chamados com o lock) --
+    def _get(self, key: str, now: float) -> Optional[str]:
         v = self._store.get(key)
-        if not v:
+        if v is None:
             return None
-        value, exp = v
-        if exp and exp < time.time():
-            self._store.pop(key, None)
+        value, exp, _ = v
+        if exp is not None and exp <= now:
+            self._pop(key)
+            LOCAL_CACHE_EXPIRATIONS.labels(cache=self.name).inc()
+            self._report()
             return None
+        self._store.move_to_end(key)
         return value
 
-    def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None:
-        exp = time.time() + ttl_seconds if ttl_seconds else None
-        self._store[key] = (value, exp)
+    def _set(self, key: str, value: str, exp: Optional[float]) -> None:
+        size = len(key) + len(value)
+        self._pop(key)
+        if size > self.max_bytes:
+            # maior que o cache inteiro: não armazena (evita esvaziar tudo)
+            LOCAL_CACHE_EVICTIONS.labels(cache=self.name).inc()
+            return
+        self._store[key] = (value, exp, size)
+        self._bytes += size
 
-    def delete(self, key: str) -> None:
-        self._store.pop(key, None)
+    def _evict(self) -> None:
+        evicted = 0
+        while len(self._store) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._store))
+            self._pop(oldest)
+            evicted += 1
+        if evicted:
+            LOCAL_CACHE_EVICTIONS.labels(cache=self.name).inc(evicted)
+        self._report()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self._bytes = 0
+            self._report()
+
+    def sweep(self) -> int:
+        """Remove as entradas vencidas; retorna quantas saíram."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (_, exp, _) in self._store.items() if exp is not None and exp <= now]
+            for k in expired:
+                self._pop(k)
+            if expired:
+                LOCAL_CACHE_EXPIRATIONS.labels(cache=self.name).inc(len(expired))
+            self._report()
+        return len(expired)
+
+    def _pop(self, key: str) -> None:
+        v = self._store.pop(key, None)
+        if v is not None:
+            self._bytes -= v[2]
+
+    def _report(self) -> None:
+        LOCAL_CACHE_ENTRIES.labels(cache=self.name).set(len(self._store))
+        LOCAL_CACHE_BYTES.labels(cache=self.name).set(self._bytes)
+
+
+# varredura de expiração compartilhada por todos os LocalCacheBackend vivos
+_SWEEP_TARGETS: "weakref.WeakSet[LocalCacheBackend]" = weakref.WeakSet()
+_SWEEP_LOCK = threading.Lock()
+_SWEEPER: Optional[threading.Thread] = None
+
+
+def _register_for_sweep(backend: LocalCacheBackend) -> None:
+    global _SWEEPER
+    with _SWEEP_LOCK:
+        _SWEEP_TARGETS.add(backend)
+        if _SWEEPER is None or not _SWEEPER.is_alive():
+            _SWEEPER = threading.Thread(target=_sweep_loop, name="cache-sweeper", daemon=True)
+            _SWEEPER.start()
+
+
+def _sweep_loop() -> None:
+    while True:
+        time.sleep(max(1.0, settings.local_cache_sweep_interval))
+        for backend in list(_SWEEP_TARGETS):
+            try:
+                backend.sweep()
+            except Exception:
+                pass
 
 
 class RedisCacheBackend(CacheBackend):
-    """Cache Redis (usa redis-py sync)."""
+    """Cache Redis (usa redis-py sync) com timeouts curtos e circuit breaker.
+
+    Cada chamada tem timeout de socket/conexão e o pool é limitado
+    (`redis_max_connections`, espera no máximo o socket timeout por uma
+    conexão livre). Após `redis_breaker_failures` falhas consecutivas o
+    circuito abre e as chamadas vão direto ao fallback local, sem tocar a
+    rede, até a chamada de prova (após `redis_breaker_reset_seconds`) passar.
+    """
 
-    def __init__(self, url: str):
+    kind = "redis"
+
+    def __init__(
+        self,
+        url: str,
+        fallback: Optional[CacheBackend] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         import redis  # lazy import
 
-        self._r = redis.from_url(url, decode_responses=True)
+        # respostas em bytes: valores binários (codecs) e texto convivem no mesmo Redis
+        pool = redis.BlockingConnectionPool.from_url(
+            url,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_socket_timeout,  # espera por conexão livre no pool
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_connect_timeout,
+            health_check_interval=30,
+        )
+        self._r = redis.Redis(connection_pool=pool)
+        self._delete_if_equals = self._r.register_script(_DELETE_IF_EQUALS_LUA)
+        self.fallback = fallback if fallback is not None else LocalCacheBackend(name="redis-fallback")
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.redis_breaker_failures,
+            reset_seconds=settings.redis_breaker_reset_seconds,
+            on_change=_report_circuit,
+        )
 
-    def get(self, key: str) -> Optional[str]:
+    @property
+    def client(self):
+        """Cliente redis-py do backend (pool limitado, timeouts do caminho de request)."""
+        return self._r
+
+    def _call(self, op: str, fn: Callable[[], Any], fallback: Callable[[], Any]) -> Any:
+        if not self.breaker.allow():
+            REDIS_SHORT_CIRCUITS.labels(op=op).inc()
+            return fallback()
+        t0 = time.perf_counter()
         try:
-            return self._r.get(key)
-        except Exception:
-            return None
+            result = fn()
+        except Exception as ex:
+            REDIS_ERRORS.labels(op=op, type=ex.__class__.__name__.lower()).inc()
+            self.breaker.record_failure()
+            return fallback()
+        REDIS_LATENCY_MS.labels(op=op).observe((time.perf_counter() - t0) * 1000.0)
+        self.breaker.record_success()
+        return result
+
+    def get(self, key: str) -> Optional[str]:
+        return _text(self._call("get", lambda: self._r.get(key), lambda: self.fallback.get(key)))
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        return self._call(
+            "get", lambda: self._r.get(key), lambda: self.fallback.get_bytes(key)
+        )
 
     def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None:
-        try:
+        def _set() -> None:
             if ttl_seconds:
                 self._r.setex(key, ttl_seconds, value)
             else:
                 self._r.set(key, value)
-        except Exception:
-            pass
+
+        self._call("set", _set, lambda: self.fallback.set(key, value, ttl_seconds))
 
     def delete(self, key: str) -> None:
+        self._call("delete", lambda: self._r.delete(key), lambda: self.fallback.delete(key))
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        values = self._call(
+            "get_many", lambda: list(self._r.mget(keys)), lambda: self.fallback.get_many(keys)
+        )
+        return [_text(v) for v in values]
+
+    def set_many(self, items: Mapping[str, str], ttl_seconds: int | None = None) -> None:
+        if not items:
+            return
+
+        def _set_many() -> None:
+            if not ttl_seconds:
+                self._r.mset(dict(items))
+                return
+            # SETEX em pipeline (sem MULTI): 1 round trip para N chaves
+            pipe = self._r.pipeline(transaction=False)
+            for k, v in items.items():
+                pipe.setex(k, ttl_seconds, v)
+            pipe.execute()
+
+        self._call("set_many", _set_many, lambda: self.fallback.set_many(items, ttl_seconds))
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        self._call(
+            "delete_many", lambda: self._r.delete(*keys), lambda: self.fallback.delete_many(keys)
+        )
+
+    def incr(self, key: str) -> int:
+        return self._call("incr", lambda: int(self._r.incr(key)), lambda: self.fallback.incr(key))
+
+    def add(self, key: str, value: str, ttl_seconds: float) -> bool:
+        px = max(1, int(ttl_seconds * 1000))
+        return bool(
+            self._call(
+                "add",
+                lambda: self._r.set(key, value, nx=True, px=px),
+                lambda: self.fallback.add(key, value, ttl_seconds),
+            )
+        )
+
+    def delete_if_equals(self, key: str, value: str) -> bool:
+        return bool(
+            self._call(
+                "delete_if_equals",
+                lambda: self._delete_if_equals(keys=[key], args=[value]),
+                lambda: self.fallback.delete_if_equals(key, value),
+            )
+        )
+
+
+# GET + DEL atômicos: não apaga o lock que, após o TTL, já passou a outro dono
+_DELETE_IF_EQUALS_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, bytes):
         try:
-            self._r.delete(key)
-        except Exception:
-            pass
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return None  # valor binário (codec) lido pela API de texto
+    return value
+
+
+def _report_circuit(previous: str, state: str, elapsed: float) -> None:
+    REDIS_CIRCUIT_STATE.set(STATE_VALUES[state])
+    if previous == OPEN:
+        REDIS_CIRCUIT_OPEN_SECONDS.inc(elapsed)
+    if state == OPEN:
+        logger.warning("circuito do Redis aberto: usando cache local como fallback")
+    elif state == CLOSED:
+        logger.info("circuito do Redis fechado: Redis recuperado")
+
+
+class TieredCacheBackend(CacheBackend):
+    """L1 em memória na frente de um L2 compartilhado (Redis).
+
+    Leituras servem do L1 e, no miss, buscam no L2 e populam o L1 com TTL
+    curto (`cache_l1_ttl`). Escritas e deleções vão ao L2 e são anunciadas
+    no canal `<cache_namespace>:cache:invalidate`; as outras instâncias
+    descartam essas chaves do L1 e relêem do L2 no próximo acesso. Como o
+    pub/sub do Redis não garante entrega, o TTL curto do L1 limita a janela
+    de inconsistência, e o L1 é esvaziado a cada (re)conexão do listener.
+    """
+
+    kind = "tiered"
+
+    def __init__(
+        self,
+        l2: CacheBackend,
+        l1: Optional[LocalCacheBackend] = None,
+        l1_ttl: Optional[float] = None,
+        channel: Optional[str] = None,
+        publisher=None,
+    ):
+        self.l1 = l1 if l1 is not None else LocalCacheBackend(name="l1")
+        self.l2 = l2
+        self.l1_ttl = l1_ttl if l1_ttl is not None else settings.cache_l1_ttl
+        self.channel = channel or f"{settings.cache_namespace}:cache:invalidate"
+        self.origin = uuid.uuid4().hex
+        self._publisher = publisher
+        self._listener = PubSubListener(
+            self.channel, self.handle_message, on_subscribe=self.l1.clear, name="cache-invalidate"
+        )
+
+    def start(self) -> None:
+        if self._publisher is None:
+            self._publisher = get_redis_client()
+        self._listener.start()
+
+    def stop(self) -> None:
+        self._listener.stop()
+
+    def _l1_ttl(self, ttl_seconds: int | None) -> float:
+        return min(ttl_seconds, self.l1_ttl) if ttl_seconds else self.l1_ttl
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+        value = self.l2.get(key)
+        if value is not None:
+            self.l1.set(key, value, self._l1_ttl(None))
+        return value
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        data = self.l1.get_bytes(key)
+        if data is not None:
+            return data
+        data = self.l2.get_bytes(key)
+        if data is not None:
+            self.l1.set(key, data, self._l1_ttl(None))  # type: ignore[arg-type]
+        return data
+
+    def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None:
+        self.l2.set(key, value, ttl_seconds)
+        self.l1.set(key, value, self._l1_ttl(ttl_seconds))
+        self._announce([key])
+
+    def delete(self, key: str) -> None:
+        self.l2.delete(key)
+        self.l1.delete(key)
+        self._announce([key])
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        values = self.l1.get_many(keys)
+        missing = [i for i, v in enumerate(values) if v is None]
+        if missing:
+            fetched = self.l2.get_many([keys[i] for i in missing])
+            fill = {}
+            for i, v in zip(missing, fetched):
+                if v is not None:
+                    values[i] = fill[keys[i]] = v
+            if fill:
+                self.l1.set_many(fill, self._l1_ttl(None))
+        return values
+
+    def set_many(self, items: Mapping[str, str], ttl_seconds: int | None = None) -> None:
+        self.l2.set_many(items, ttl_seconds)
+        self.l1.set_many(items, self._l1_ttl(ttl_seconds))
+        self._announce(items.keys())
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        self.l2.delete_many(keys)
+        self.l1.delete_many(keys)
+        self._announce(keys)
+
+    def incr(self, key: str) -> int:
+        value = self.l2.incr(key)
+        self.l1.delete(key)
+        self._announce([key])
+        return value
+
+    def add(self, key: str, value: str, ttl_seconds: float) -> bool:
+        # sem L1: locks precisam ver sempre o estado compartilhado
+        return self.l2.add(key, value, ttl_seconds)
+
+    def delete_if_equals(self, key: str, value: str) -> bool:
+        # como `add`, só no L2 (chaves de lock nunca entram no L1)
+        return self.l2.delete_if_equals(key, value)
+
+    def _announce(self, keys: Iterable[str]) -> None:
+        if self._publisher is None:
+            return
+        try:
+            self._publisher.publish(
+                self.channel, json.dumps({"origin": self.origin, "keys": list(keys)})
+            )
+        except Exception as ex:
+            logger.warning("falha ao anunciar invalidação de cache: %s", ex)
+
+    def handle_message(self, data: Optional[str]) -> None:
+        try:
+            message = json.loads(data or "")
+        except ValueError:
+            return
+        if not isinstance(message, dict) or message.get("origin") == self.origin:
+            return
+        for key in message.get("keys") or []:
+            self.l1.delete(key)
+
+
+# ---------------------------------------------------------------------
+# 🔹 Pub/Sub (Redis)
+# ---------------------------------------------------------------------
+class PubSubListener:
+    """Thread daemon que assina um canal Redis e repassa cada mensagem ao handler.
+
+    Reconecta sozinha após falhas; `on_subscribe` roda a cada (re)assinatura
+    (mensagens perdidas enquanto desconectado não são reentregues).
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        handler: Callable[[Optional[str]], object],
+        on_subscribe: Optional[Callable[[], object]] = None,
+        name: str = "pubsub",
+    ):
+        self.channel = channel
+        self._handler = handler
+        self._on_subscribe = on_subscribe
+        self._name = name
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        if get_redis_client() is None:
+            return False
+        if self._thread and self._thread.is_alive():
+            return True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            client = get_redis_client()
+            if client is None:
+                return
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                if self._on_subscribe:
+                    self._on_subscribe()
+                while not self._stop.is_set():
+                    msg = pubsub.get_message(timeout=1.0)
+                    if msg and msg.get("type") == "message":
+                        self._handler(msg.get("data"))
+                pubsub.close()
+            except Exception as ex:
+                logger.warning("listener pub/sub %s caiu: %s", self.channel, ex)
+                self._stop.wait(5.0)
 
 
 # ---------------------------------------------------------------------
 # 🔹 Wrapper de namespace
 # ---------------------------------------------------------------------
 class NamespacedCache(CacheBackend):
-    def __init__(self, inner: CacheBackend, prefix: str):
+    """Prefixa as chaves com o namespace (ex.: `mosaic:`) e instrumenta as operações.
+
+    Com `versioned=True` o prefixo inclui uma versão (`mosaic:v3:`) guardada no
+    próprio backend; `invalidate_all()` incrementa a versão e todas as chaves
+    antigas deixam de ser vistas de uma vez (expiram pelo TTL), sem SCAN/DEL.
+    A versão é relida a cada `version_ttl` segundos (janela para as demais
+    instâncias enxergarem a invalidação).
+
+    Cada operação alimenta as métricas `mosaic_cache_*` com o nome lógico do
+    cache (`name`: tickers, views, results...), o backend e o resultado
+    (hit/miss nas leituras), para calibrar TTLs a partir de dados.
+    """
+
+    def __init__(
+        self,
+        inner: CacheBackend,
+        prefix: str,
+        versioned: bool = False,
+        version_ttl: float = 1.0,
+        name: str = "default",
+    ):
         self.inner = inner
         self.prefix = prefix.rstrip(":") + ":"
+        self.versioned = versioned
+        self.version_ttl = version_ttl
+        self.name = name
+        self.kind = inner.kind
+        self._version_key = f"{self.prefix}__version__"
+        self._version: Optional[int] = None
+        self._version_expires_at = 0.0
+
+    def _current_prefix(self) -> str:
+        if not self.versioned:
+            return self.prefix
+        now = time.monotonic()
+        if self._version is None or now >= self._version_expires_at:
+            self._version = int(self.inner.get(self._version_key) or 0)
+            self._version_expires_at = now + self.version_ttl
+        return f"{self.prefix}v{self._version}:"
 
     def _k(self, k: str) -> str:
-        return f"{self.prefix}{k}"
+        return f"{self._current_prefix()}{k}"
+
+    def _observe(self, op: str, fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        try:
+            result = fn()
+        except Exception:
+            CACHE_OPERATIONS.labels(self.name, self.kind, op, "error").inc()
+            raise
+        finally:
+            CACHE_LATENCY_MS.labels(self.name, self.kind, op).observe(
+                (time.perf_counter() - t0) * 1000.0
+            )
+        return result
+
+    def _record(self, op: str, outcome: str, count: int = 1) -> None:
+        if count:
+            CACHE_OPERATIONS.labels(self.name, self.kind, op, outcome).inc(count)
+
+    def _record_read(self, op: str, values: Sequence[Any]) -> None:
+        hits = 0
+        for value in values:
+            if value is not None:
+                hits += 1
+                CACHE_VALUE_BYTES.labels(self.name, self.kind, op).observe(len(value))
+        self._record(op, "hit", hits)
+        self._record(op, "miss", len(values) - hits)
+
+    def _record_write(self, op: str, values: Iterable[Any]) -> None:
+        n = 0
+        for value in values:
+            n += 1
+            CACHE_VALUE_BYTES.labels(self.name, self.kind, op).observe(len(value))
+        self._record(op, "ok", n)
 
     def get(self, key: str) -> Optional[str]:
-        return self.inner.get(self._k(key))
+        value = self._observe("get", lambda: self.inner.get(self._k(key)))
+        self._record_read("get", (value,))
+        return value
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        value = self._observe("get", lambda: self.inner.get_bytes(self._k(key)))
+        self._record_read("get", (value,))
+        return value
 
     def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None:
-        self.inner.set(self._k(key), value, ttl_seconds)
+        self._observe("set", lambda: self.inner.set(self._k(key), value, ttl_seconds))
+        self._record_write("set", (value,))
+
+    def set_bytes(self, key: str, data: bytes, ttl_seconds: int | None = None) -> None:
+        self._observe("set", lambda: self.inner.set_bytes(self._k(key), data, ttl_seconds))
+        self._record_write("set", (data,))
 
     def delete(self, key: str) -> None:
-        self.inner.delete(self._k(key))
+        self._observe("delete", lambda: self.inner.delete(self._k(key)))
+        self._record("delete", "ok")
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        prefix = self._current_prefix()
+        values = self._observe(
+            "get_many", lambda: self.inner.get_many([f"{prefix}{k}" for k in keys])
+        )
+        self._record_read("get_many", values)
+        return values
+
+    def set_many(self, items: Mapping[str, str], ttl_seconds: int | None = None) -> None:
+        prefix = self._current_prefix()
+        self._observe(
+            "set_many",
+            lambda: self.inner.set_many({f"{prefix}{k}": v for k, v in items.items()}, ttl_seconds),
+        )
+        self._record_write("set_many", items.values())
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        prefix = self._current_prefix()
+        keys = [f"{prefix}{k}" for k in keys]
+        self._observe("delete_many", lambda: self.inner.delete_many(keys))
+        self._record("delete_many", "ok", len(keys))
+
+    def incr(self, key: str) -> int:
+        value = self._observe("incr", lambda: self.inner.incr(self._k(key)))
+        self._record("incr", "ok")
+        return value
+
+    def add(self, key: str, value: str, ttl_seconds: float) -> bool:
+        added = self._observe("add", lambda: self.inner.add(self._k(key), value, ttl_seconds))
+        self._record("add", "ok" if added else "exists")
+        return added
+
+    def delete_if_equals(self, key: str, value: str) -> bool:
+        deleted = self._observe(
+            "delete_if_equals", lambda: self.inner.delete_if_equals(self._k(key), value)
+        )
+        self._record("delete_if_equals", "ok" if deleted else "mismatch")
+        return deleted
+
+    def invalidate_all(self) -> int:
+        """Invalida o namespace inteiro (só com versioned=True); retorna a nova versão."""
+        if not self.versioned:
+            raise RuntimeError("invalidate_all requer NamespacedCache(versioned=True)")
+        self._version = self._observe("invalidate", lambda: self.inner.incr(self._version_key))
+        self._record("invalidate", "ok")
+        self._version_expires_at = time.monotonic() + self.version_ttl
+        return self._version
 
 
 # ---------------------------------------------------------------------
 # 🔹 Factory global
 # ---------------------------------------------------------------------
-def get_cache_backend() -> CacheBackend:
-    """Seleciona backend com base nas settings (redis|local)."""
-    if settings.cache_backend == "redis" and settings.redis_url:
+def get_redis_client():
+    """Cliente redis-py (ex.: pub/sub) quando um backend com Redis está ativo; senão None."""
+    if settings.cache_backend not in _REDIS_BACKENDS or not settings.redis_url:
+        return None
+    try:
+        import redis  # lazy import
+
+        return redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_connect_timeout=settings.redis_connect_timeout,
+            socket_timeout=max(1.0, settings.redis_socket_timeout),
+        )
+    except Exception:
+        return None
+
+
+_BACKEND: Optional[CacheBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_redis_backend() -> Optional[RedisCacheBackend]:
+    """Backend Redis compartilhado (o L2, no tiered) ou None sem Redis ativo.
+
+    Para Redis no caminho de request (ex.: rate limit): reaproveita o pool
+    limitado, os timeouts curtos e o circuit breaker do cache, ao contrário
+    de `get_redis_client` (conexões de pub/sub).
+    """
+    backend = get_cache_backend().inner
+    if isinstance(backend, TieredCacheBackend):
+        backend = backend.l2
+    return backend if isinstance(backend, RedisCacheBackend) else None
+
+
+def get_cache_backend(
+    namespace: Optional[str] = None, versioned: bool = False, name: Optional[str] = None
+) -> NamespacedCache:
+    """Backend compartilhado do processo (local|redis|tiered), com o namespace das settings.
+
+    `namespace` acrescenta um sub-namespace (ex.: "results" -> `mosaic:results:`);
+    `versioned=True` habilita `invalidate_all()` nele. `name` é o nome lógico
+    do cache nas métricas (padrão: o namespace, ou "default").
+    """
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = _create_backend()
+        backend = _BACKEND
+    prefix = settings.cache_namespace
+    if namespace:
+        prefix = f"{prefix.rstrip(':')}:{namespace}"
+    return NamespacedCache(
+        backend, prefix=prefix, versioned=versioned, name=name or namespace or "default"
+    )
+
+
+def _create_backend() -> CacheBackend:
+    if settings.cache_backend in _REDIS_BACKENDS and settings.redis_url:
         try:
             backend = RedisCacheBackend(settings.redis_url)
+            if settings.cache_backend == "tiered":
+                backend = TieredCacheBackend(backend)
+                backend.start()
         except ModuleNotFoundError:
             # Redis client não instalado → fallback automático para cache local.
             backend = LocalCacheBackend()
@@ -128,4 +875,4 @@ def get_cache_backend() -> CacheBackend:
             backend = LocalCacheBackend()
     else:
         backend = LocalCacheBackend()
-    return NamespacedCache(backend, prefix=settings.cache_namespace)
+    return backend
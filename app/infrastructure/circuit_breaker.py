@@ -0,0 +1,80 @@
+# app/infrastructure/circuit_breaker.py
+"""
+Circuit breaker simples (closed -> open -> half-open) para dependências remotas.
+
+- closed: chamadas passam; `failure_threshold` falhas consecutivas abrem o circuito;
+- open: chamadas são recusadas (o chamador usa o fallback) por `reset_seconds`;
+- half-open: passa uma única chamada de prova; sucesso fecha, falha reabre.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+STATE_VALUES = {CLOSED: 0.0, OPEN: 1.0, HALF_OPEN: 2.0}
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_seconds: float = 10.0,
+        on_change: Optional[Callable[[str, str, float], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._on_change = on_change  # (estado_anterior, novo_estado, segundos no anterior)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._changed_at = clock()
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """True se a chamada pode ir à dependência (no half-open, só a de prova)."""
+        if self._state == CLOSED:
+            return True
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._changed_at >= self.reset_seconds:
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return self._state == CLOSED
+
+    def record_success(self) -> None:
+        if self._state == CLOSED and not self._failures:
+            return
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._probing = False
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            self._failures += 1
+            if self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        now = self._clock()
+        previous, elapsed = self._state, now - self._changed_at
+        self._state, self._changed_at = state, now
+        if state == OPEN:
+            self._failures = 0
+        if self._on_change:
+            self._on_change(previous, state, elapsed)
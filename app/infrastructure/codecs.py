@@ -0,0 +1,137 @@
+# app/infrastructure/codecs.py
+"""
+Codecs de valores do cache (serialização + compressão opcional).
+
+Formato gravado (`ValueCodec.encode`):
+
+    b"\\x93M" | versão (1 byte) | serializador (1 byte) | compressão (1 byte) | payload
+
+- serializadores: json (`j`), msgpack (`m`, opcional) e pickle protocolo 5
+  (`p`; só para dados do próprio Mosaic — nunca para caches compartilhados
+  com terceiros, pois desserializar pickle executa código);
+- compressão: zlib (`z`) ou lz4 (`4`, opcional), aplicada só acima de
+  `cache_compress_threshold` bytes; `-` = sem compressão.
+
+O decode só aceita o serializador e a compressão configurados na instância
+(ou sem compressão): um valor com outro id no cabeçalho levanta ValueError,
+então pickle nunca é desserializado a não ser que o próprio codec seja
+pickle. Valores sem cabeçalho (texto JSON gravado antes desta camada) são
+lidos como JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import pickle
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+from app.core.settings import settings
+
+logger = logging.getLogger("infrastructure.codecs")
+
+MAGIC = b"\x93M"
+FORMAT_VERSION = 1
+_HEADER_LEN = len(MAGIC) + 3
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _msgpack() -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    import msgpack  # dependência opcional (extra "cache")
+
+    return (
+        lambda obj: msgpack.packb(obj, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+    )
+
+
+def _lz4() -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    import lz4.frame  # dependência opcional (extra "cache")
+
+    return lz4.frame.compress, lz4.frame.decompress
+
+
+# id (1 byte) -> fábrica de (dumps, loads)
+_SERIALIZERS: Dict[str, Tuple[bytes, Callable[[], Tuple[Callable, Callable]]]] = {
+    "json": (b"j", lambda: (_json_dumps, json.loads)),
+    "msgpack": (b"m", _msgpack),
+    "pickle": (b"p", lambda: (lambda obj: pickle.dumps(obj, protocol=5), pickle.loads)),
+}
+_COMPRESSORS: Dict[str, Tuple[bytes, Callable[[], Tuple[Callable, Callable]]]] = {
+    "none": (b"-", lambda: (bytes, bytes)),
+    "zlib": (b"z", lambda: (lambda data: zlib.compress(data, 1), zlib.decompress)),
+    "lz4": (b"4", _lz4),
+}
+_BY_ID = {
+    **{ident: (name, factory) for name, (ident, factory) in _SERIALIZERS.items()},
+    **{ident: (name, factory) for name, (ident, factory) in _COMPRESSORS.items()},
+}
+
+
+@lru_cache(maxsize=None)
+def _resolve(ident: bytes) -> Tuple[Callable, Callable]:
+    _, factory = _BY_ID[ident]
+    return factory()
+
+
+class ValueCodec:
+    def __init__(self, serializer: str = "json", compression: str = "zlib", threshold: int = 1024):
+        serializer = _available(serializer, _SERIALIZERS, "json")
+        compression = _available(compression, _COMPRESSORS, "zlib")
+        self.serializer, self.compression, self.threshold = serializer, compression, threshold
+        self._ser_id = _SERIALIZERS[serializer][0]
+        self._comp_id = _COMPRESSORS[compression][0]
+        self._dumps, self._loads = _resolve(self._ser_id)
+        self._compress, self._decompress = _resolve(self._comp_id)
+
+    def encode(self, obj: Any) -> bytes:
+        payload = self._dumps(obj)
+        comp_id = b"-"
+        if self._comp_id != b"-" and len(payload) >= self.threshold:
+            payload, comp_id = self._compress(payload), self._comp_id
+        return MAGIC + bytes([FORMAT_VERSION]) + self._ser_id + comp_id + payload
+
+    def decode(self, data: bytes | str) -> Any:
+        if isinstance(data, str):
+            return json.loads(data)
+        if not data.startswith(MAGIC):
+            return json.loads(data)  # valor legado (texto JSON)
+        if data[len(MAGIC)] != FORMAT_VERSION:
+            raise ValueError(f"versão de codec desconhecida: {data[len(MAGIC)]}")
+        ser_id = data[len(MAGIC) + 1 : len(MAGIC) + 2]
+        comp_id = data[len(MAGIC) + 2 : _HEADER_LEN]
+        if ser_id != self._ser_id or comp_id not in (b"-", self._comp_id):
+            raise ValueError(
+                f"codec do valor ({ser_id!r}/{comp_id!r}) difere do configurado "
+                f"({self.serializer}/{self.compression})"
+            )
+        payload = data[_HEADER_LEN:]
+        if comp_id != b"-":
+            payload = self._decompress(payload)
+        return self._loads(payload)
+
+
+def _available(name: str, table: Dict[str, Tuple[bytes, Callable]], default: str) -> str:
+    name = (name or default).lower()
+    if name not in table:
+        logger.warning("codec de cache desconhecido: %s (usando %s)", name, default)
+        return default
+    try:
+        _resolve(table[name][0])
+    except ModuleNotFoundError:
+        logger.warning("codec de cache %s indisponível (pacote ausente); usando %s", name, default)
+        return default
+    return name
+
+
+@lru_cache(maxsize=1)
+def get_codec() -> ValueCodec:
+    """Codec padrão das settings (cache_codec, cache_compression, cache_compress_threshold)."""
+    return ValueCodec(
+        settings.cache_codec, settings.cache_compression, settings.cache_compress_threshold
+    )
@@ -0,0 +1,168 @@
+# app/infrastructure/stampede.py
+"""
+Proteção contra stampede de cache: get-or-compute com lock por chave.
+
+`get_or_compute` grava o valor num envelope com a expiração lógica e o custo
+da última recomputação, e mantém o valor fisicamente por `ttl + stale_ttl`:
+
+- fresco: devolve direto; perto de expirar, com probabilidade crescente
+  (XFetch: `agora - delta * beta * ln(rand) >= exp`), um único chamador
+  agenda a recomputação em background e devolve o valor atual;
+- vencido mas dentro de `stale_ttl` (stale-while-revalidate): devolve o valor
+  antigo e agenda a recomputação em background;
+- ausente: só quem pega o lock da chave recomputa; os demais esperam o lock
+  (até `lock_timeout`) e leem o valor gravado.
+
+O lock por chave é local (threads do processo, em faixas) + distribuído
+(`CacheBackend.add`, SET NX no Redis, com TTL), então uma expiração causa
+uma recomputação por cluster, não uma por request.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from typing import Any, Callable, Optional, Tuple
+
+from app.infrastructure.cache import CacheBackend
+from app.observability.metrics import CACHE_RECOMPUTES
+
+logger = logging.getLogger("infrastructure.stampede")
+
+_ENVELOPE = "__swr__"
+_LOCK_SUFFIX = ":lock"
+_POLL_SECONDS = 0.05
+# locks locais em faixas: custo fixo, sem dicionário de locks crescendo por chave
+_STRIPES = tuple(threading.Lock() for _ in range(64))
+
+
+class KeyLock:
+    """Lock por chave: faixa local (threads) + SET NX no backend (instâncias)."""
+
+    def __init__(self, cache: CacheBackend, key: str, ttl_seconds: float = 30.0) -> None:
+        self._cache = cache
+        self._key = key + _LOCK_SUFFIX
+        self._ttl = ttl_seconds
+        self._token = uuid.uuid4().hex
+        self._local = _STRIPES[hash(key) % len(_STRIPES)]
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        deadline = time.monotonic() + max(0.0, timeout)
+        got = self._local.acquire(timeout=timeout) if timeout > 0 else self._local.acquire(False)
+        if not got:
+            return False
+        while True:
+            if self._cache.add(self._key, self._token, self._ttl):
+                return True
+            if time.monotonic() >= deadline:
+                self._local.release()
+                return False
+            time.sleep(_POLL_SECONDS)
+
+    def release(self) -> None:
+        try:
+            # só apaga se ainda for o dono (o TTL pode ter passado para outro)
+            self._cache.delete_if_equals(self._key, self._token)
+        finally:
+            self._local.release()
+
+
+def _unwrap(entry: Any) -> Tuple[Any, Optional[float], float]:
+    """(valor, expiração lógica, custo da recomputação); sem envelope = valor legado."""
+    if isinstance(entry, dict) and entry.get(_ENVELOPE) == 1:
+        return entry.get("value"), entry.get("exp"), float(entry.get("delta") or 0.0)
+    return entry, None, 0.0
+
+
+def _compute_and_store(
+    cache: CacheBackend,
+    key: str,
+    compute: Callable[[], Any],
+    ttl: float,
+    stale_ttl: float,
+    name: str,
+    reason: str,
+) -> Any:
+    t0 = time.perf_counter()
+    value = compute()
+    delta = time.perf_counter() - t0
+    CACHE_RECOMPUTES.labels(cache=name, reason=reason).inc()
+    envelope = {_ENVELOPE: 1, "value": value, "exp": time.time() + ttl, "delta": delta}
+    cache.set_obj(key, envelope, ttl_seconds=max(1, int(math.ceil(ttl + stale_ttl))))
+    return value
+
+
+def _refresh_in_background(
+    cache: CacheBackend,
+    key: str,
+    compute: Callable[[], Any],
+    ttl: float,
+    stale_ttl: float,
+    name: str,
+    reason: str,
+) -> None:
+    lock = KeyLock(cache, key)
+    if not lock.acquire(0.0):
+        return  # outro chamador (ou instância) já está recomputando
+
+    def _run() -> None:
+        try:
+            _compute_and_store(cache, key, compute, ttl, stale_ttl, name, reason)
+        except Exception as ex:
+            logger.warning("recomputação em background falhou (%s): %s", key, ex)
+        finally:
+            lock.release()
+
+    threading.Thread(target=_run, name=f"swr-{name}", daemon=True).start()
+
+
+def get_or_compute(
+    cache: CacheBackend,
+    key: str,
+    compute: Callable[[], Any],
+    ttl: float,
+    stale_ttl: Optional[float] = None,
+    beta: float = 1.0,
+    lock_timeout: float = 5.0,
+    name: str = "default",
+    force: bool = False,
+) -> Any:
+    """Valor da chave, recomputando no máximo uma vez por expiração (ver módulo).
+
+    `force=True` recomputa já (com lock) e grava, mesmo com valor fresco.
+    """
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+    if not force:
+        entry = cache.get_obj(key)
+        if entry is not None:
+            value, exp, delta = _unwrap(entry)
+            if exp is None:
+                return value  # formato legado: vale o TTL físico
+            now = time.time()
+            if now >= exp:
+                reason = "stale"
+            elif delta and now - delta * beta * math.log(random.random() or 1e-12) >= exp:
+                reason = "early"
+            else:
+                return value
+            _refresh_in_background(cache, key, compute, ttl, stale_ttl, name, reason)
+            return value
+
+    lock = KeyLock(cache, key)
+    acquired = lock.acquire(lock_timeout)
+    try:
+        if not force:
+            # quem esperou o lock encontra o valor gravado por quem recomputou
+            entry = cache.get_obj(key)
+            if entry is not None:
+                return _unwrap(entry)[0]
+        return _compute_and_store(
+            cache, key, compute, ttl, stale_ttl, name, "forced" if force else "miss"
+        )
+    finally:
+        if acquired:
+            lock.release()
@@ -1,21 +1,30 @@
 import asyncio
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from prometheus_client import make_asgi_app
 
+from app.core.deadline import DeadlineExceeded
+from app.core.readiness import READINESS
 from app.core.settings import settings
-from app.executor.service import executor_service
-from app.gateway.router import healthz_full
+from app.executor.service import PoolExhaustedError, executor_service
+from app.gateway.admission import AdmissionMiddleware
+from app.gateway.deadline import DeadlineMiddleware
+from app.gateway.ratelimit import RateLimitMiddleware
 from app.gateway.router import router as gateway_router
+from app.observability.health import HEALTH
 from app.observability.logging import (
     RequestIdMiddleware,
     get_logger,
     setup_json_logging,
 )
-from app.observability.metrics import APP_UP, prime_api_series
-from app.orchestrator.service import warm_up_ticker_cache
-from app.registry.preloader import preload_views
+from app.observability.metrics import APP_UP, WARMUP_MS, prime_api_series
+from app.orchestrator.service import refresh_ticker_cache_ahead, warm_up_ticker_cache
+from app.orchestrator.vocab import ASK_VOCAB
+from app.registry.service import registry_service
+from app.registry.watcher import VIEWS_WATCHER
 
 # inicializa logging antes de criar app
 setup_json_logging(
@@ -26,39 +35,103 @@ setup_json_logging(
 logger = get_logger("mosaic")
 
 
+# componentes aquecidos em paralelo no boot (fora do event loop)
+WARM_UP_STEPS = {
+    "db_pool": executor_service.warm_up,
+    "catalog": registry_service.ensure_loaded,
+    "vocab": ASK_VOCAB.warm_up,
+    "tickers": warm_up_ticker_cache,
+}
+_WARM_UP_RETRY_SECONDS = 5.0
+
+
+async def _warm_up_step(name: str, fn) -> bool:
+    t0 = time.perf_counter()
+    try:
+        await asyncio.to_thread(fn)
+    except Exception as e:
+        READINESS.mark(name, False, error=str(e))
+        logger.warning("warm-up %s falhou: %s", name, e)
+        return False
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    WARMUP_MS.labels(component=name).set(elapsed_ms)
+    READINESS.mark(name, True, elapsed_ms=elapsed_ms)
+    return True
+
+
+async def warm_up() -> None:
+    """Aquece tudo em paralelo; re-tenta o que falhou até a instância ficar pronta."""
+    pending = dict(WARM_UP_STEPS)
+    while pending:
+        results = await asyncio.gather(
+            *(_warm_up_step(name, fn) for name, fn in pending.items())
+        )
+        pending = {n: fn for (n, fn), ok in zip(pending.items(), results) if not ok}
+        if pending:
+            await asyncio.sleep(_WARM_UP_RETRY_SECONDS)
+    logger.info("warm-up concluído: %s", READINESS.snapshot()["components"])
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Prime series para que apareçam no /metrics antes da primeira requisição
     prime_api_series()
-    preload_views()  # 🚀 carrega catálogo no boot (Redis/local)
-    # primeira checagem de saúde imediata
-    try:
-        APP_UP.set(1)
-        _ = healthz_full()
-        try:
-            warm_up_ticker_cache()  # aquece cache de tickers
-        except Exception as e:
-            logger.warning("warm-up tickers falhou: %s", e)
-    except Exception:
-        pass
+    APP_UP.set(1)
+    # 🚀 warm-up em background: o servidor sobe já, /readyz vira 200 ao concluir
+    READINESS.reset()
+    warm_task = asyncio.create_task(warm_up())
 
     async def _worker():
+        # probes concorrentes e assíncronos; /healthz/full serve o snapshot
         while True:
             try:
                 APP_UP.set(1)
-                _ = healthz_full()  # atualiza subsistemas e readiness
-            except Exception:
-                pass
-            await asyncio.sleep(30)
+                await HEALTH.probe_all()
+            except Exception as e:
+                logger.warning("probes de saúde falharam: %s", e)
+            await asyncio.sleep(max(1.0, settings.health_probe_interval))
+
+    async def _tickers_worker():
+        # refresh-ahead do L1 de tickers: revalida antes do TTL local expirar,
+        # fora do event loop, para que /ask nunca espere Redis/Postgres
+        interval = max(1.0, settings.tickers_local_ttl * 0.8)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(refresh_ticker_cache_ahead)
+            except Exception as e:
+                logger.warning("refresh-ahead tickers falhou: %s", e)
+
+    async def _views_worker():
+        # hot reload: polling de mtime em VIEWS_DIR (re-parse só do que mudou)
+        while True:
+            await asyncio.sleep(max(0.5, settings.views_watch_interval))
+            try:
+                await asyncio.to_thread(VIEWS_WATCHER.poll)
+            except Exception as e:
+                logger.warning("hot reload de views falhou: %s", e)
+
+    async def _start_views_watch():
+        await warm_task  # a base do watcher é o catálogo já carregado
+        await asyncio.to_thread(VIEWS_WATCHER.prime)
+        VIEWS_WATCHER.start_listener()
+        await _views_worker()
 
     task = asyncio.create_task(_worker())
+    tickers_task = asyncio.create_task(_tickers_worker())
+    tasks = [warm_task, task, tickers_task]
+    if settings.views_watch:
+        tasks.append(asyncio.create_task(_start_views_watch()))
     try:
         yield
     finally:
         APP_UP.set(0)
-        task.cancel()
+        READINESS.reset()
+        VIEWS_WATCHER.stop_listener()
+        for t in tasks:
+            t.cancel()
         try:
-            executor_service.pool.close()
+            executor_service.close()
         except Exception:
             pass
 
@@ -66,12 +139,39 @@ async def lifespan(app: FastAPI):
 def create_app() -> FastAPI:
     app = FastAPI(title="Sirios Mosaic", lifespan=lifespan)
 
+    # Controle de admissão (concorrência + fila por endpoint); fica por dentro do
+    # request_id para que as respostas 429/503 também levem X-Request-ID
+    if settings.admission_enabled:
+        app.add_middleware(AdmissionMiddleware)
+    # Rate limit por cliente por fora da admissão: sem cota, 429 sem ocupar slot/fila
+    app.add_middleware(RateLimitMiddleware)
+    # Deadline por requisição (envolve a fila de admissão: a espera conta no prazo)
+    app.add_middleware(DeadlineMiddleware)
+
     # Middleware para request_id e tempo de requisição
     app.add_middleware(RequestIdMiddleware)
 
     # Rotas da aplicação
     app.include_router(gateway_router)
 
+    # Pool de DB esgotado (db_pool_acquire_timeout): falha rápida com 503
+    @app.exception_handler(PoolExhaustedError)
+    async def _pool_exhausted(request: Request, exc: PoolExhaustedError):
+        logger.warning("pool de DB esgotado: %s", exc)
+        return JSONResponse(
+            {"detail": "banco de dados ocupado, tente novamente"},
+            status_code=503,
+            headers={"Retry-After": str(max(1, round(settings.db_pool_acquire_timeout)))},
+        )
+
+    # Prazo da requisição esgotado (X-Request-Timeout / padrão do endpoint)
+    @app.exception_handler(DeadlineExceeded)
+    async def _deadline_exceeded(request: Request, exc: DeadlineExceeded):
+        return JSONResponse(
+            {"detail": "prazo da requisição excedido", "stage": exc.stage, "reason": exc.reason},
+            status_code=504,
+        )
+
     # Expor /metrics (Prometheus)
     metrics_app = make_asgi_app()
     app.mount("/metrics", metrics_app)
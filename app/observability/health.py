@@ -0,0 +1,137 @@
+# app/observability/health.py
+"""
+Saúde dos subsistemas (DB, Prometheus, Grafana) para o /healthz/full.
+
+Os probes rodam em background no lifespan, a cada `health_probe_interval`,
+todos em paralelo e sem bloquear o event loop (HTTP via httpx assíncrono,
+DB numa thread), cada um limitado a `health_probe_timeout`. O resultado fica
+num snapshot com timestamp por componente, que o /healthz/full devolve na
+hora, sem re-probar a cada chamada.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+import httpx
+
+from app.core.readiness import READINESS
+from app.core.settings import settings
+from app.executor.service import executor_service
+from app.observability.metrics import HEALTH_CHECKED_AT, HEALTH_PROBE_MS, set_health
+
+# probe: corrotina que levanta exceção (ou retorna False) quando o componente falha;
+# pode retornar um dict com "ok" e detalhes (ex.: estatísticas do pool)
+Probe = Callable[[], Awaitable[Union[bool, Dict[str, Any]]]]
+
+
+def _db_check() -> Dict[str, Any]:
+    # liveness leve no pool (SELECT 1); saturação do pool tira a instância do /readyz.
+    # As estatísticas são lidas antes do ping: com o pool saturado o próprio ping
+    # espera por conexão e dá timeout, e a saturação precisa aparecer mesmo assim.
+    before = executor_service.pool_stats()
+    try:
+        stats = executor_service.ping(timeout=settings.db_probe_timeout)
+    except Exception as ex:
+        if not before.get("saturated"):
+            READINESS.mark("db_pool", False, error=str(ex))
+            raise
+        READINESS.mark("db_pool", False, error="pool saturado", details=before)
+        return {"ok": False, "error": f"pool saturado: {ex}", **before}
+    saturated = bool(before.get("saturated") or stats.get("saturated"))
+    stats["saturated"] = saturated
+    READINESS.mark(
+        "db_pool",
+        not saturated,
+        error="pool saturado" if saturated else None,
+        elapsed_ms=stats.get("latency_ms"),
+        details=stats,
+    )
+    return {"ok": True, **stats}
+
+
+async def probe_db() -> Dict[str, Any]:
+    return await asyncio.to_thread(_db_check)
+
+
+async def probe_prometheus() -> bool:
+    async with httpx.AsyncClient(timeout=settings.health_probe_timeout) as c:
+        r = await c.get(f"{settings.prometheus_url}/-/ready")
+        return r.status_code == 200 and "Prometheus" in r.text
+
+
+async def probe_grafana() -> bool:
+    async with httpx.AsyncClient(timeout=settings.health_probe_timeout) as c:
+        r = await c.get(f"{settings.grafana_url}/api/health")
+        return r.status_code == 200 and "database" in r.text
+
+
+class HealthMonitor:
+    def __init__(self, probes: Dict[str, Probe], timeout: float = 2.0) -> None:
+        self.probes = dict(probes)
+        self.timeout = timeout
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def checked(self) -> bool:
+        return self._checked_at is not None
+
+    async def _run(self, name: str, probe: Probe) -> None:
+        ok, error, details = False, None, {}
+        t0 = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(probe(), timeout=self.timeout)
+            if isinstance(result, dict):
+                details = {k: v for k, v in result.items() if k != "ok"}
+                result = result.get("ok", True)
+            ok = bool(result)
+        except asyncio.TimeoutError:
+            error = f"timeout ({self.timeout:g}s)"
+        except Exception as ex:
+            error = str(ex)
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        now = time.time()
+        HEALTH_PROBE_MS.labels(component=name).observe(elapsed_ms)
+        HEALTH_CHECKED_AT.labels(component=name).set(now)
+        set_health(name, ok)
+        with self._lock:
+            self._components[name] = {
+                "ok": ok,
+                "error": error,
+                "elapsed_ms": round(elapsed_ms, 1),
+                "checked_at": now,
+                **details,
+            }
+
+    async def probe_all(self) -> Dict[str, Any]:
+        """Roda todos os probes em paralelo e atualiza o snapshot."""
+        set_health("app", True)
+        await asyncio.gather(*(self._run(n, p) for n, p in self.probes.items()))
+        self._checked_at = time.time()
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            components = {k: dict(v) for k, v in self._components.items()}
+        for name in self.probes:
+            components.setdefault(
+                name, {"ok": False, "error": "not checked yet", "elapsed_ms": None, "checked_at": None}
+            )
+        checked_at = self._checked_at
+        return {
+            "app": "up",
+            "checked_at": checked_at,
+            "age_seconds": None if checked_at is None else round(time.time() - checked_at, 1),
+            **components,
+        }
+
+
+HEALTH = HealthMonitor(
+    {"db": probe_db, "prometheus": probe_prometheus, "grafana": probe_grafana},
+    timeout=settings.health_probe_timeout,
+)
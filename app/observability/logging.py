@@ -2,14 +2,16 @@
 import contextvars
 import logging
 import os
+import time
 import uuid
 from logging.handlers import RotatingFileHandler
 from typing import Optional
 
 from pythonjsonlogger import jsonlogger
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.observability.metrics import API_ENDPOINTS, API_LATENCY_MS, HTTP_REQUEST_MS
 
 # ────────────────────────────────────────────────────────────────────────────────
 # API pública estável:
@@ -35,19 +37,61 @@ class RequestIdFilter(logging.Filter):
         return True
 
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    """Gera/propaga X-Request-ID, injeta no contexto e no response."""
+def _route_label(scope: Scope) -> str:
+    # template da rota (ex.: /views/{entity}), não o path cru: cardinalidade fixa
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
 
-    async def dispatch(self, request: Request, call_next):
-        rid = request.headers.get("x-request-id") or str(uuid.uuid4())
+class RequestIdMiddleware:
+    """Gera/propaga X-Request-ID, injeta no contexto e no response.
+
+    Middleware ASGI puro (sem as tasks/streams do BaseHTTPMiddleware): mede
+    também a latência total da requisição em `mosaic_http_request_ms` e, nos
+    endpoints da API, em `mosaic_api_latency_ms` (com exemplar do request_id).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = None
+        for name, value in scope.get("headers") or ():
+            if name == b"x-request-id":
+                rid = value.decode("latin-1")
+                break
+        rid = rid or str(uuid.uuid4())
+        # também deixa disponível em request.state
+        scope.setdefault("state", {})["request_id"] = rid
         token = _request_id_ctx.set(rid)
+        status = 500
+        t0 = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = rid
+            await send(message)
+
         try:
-            # também deixa disponível em request.state
-            request.state.request_id = rid
-            response: Response = await call_next(request)
-            response.headers["X-Request-ID"] = rid
-            return response
+            await self.app(scope, receive, send_wrapper)
         finally:
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+            route = _route_label(scope)
+            HTTP_REQUEST_MS.labels(
+                method=scope["method"], route=route, status=str(status)
+            ).observe(elapsed_ms)
+            if route in API_ENDPOINTS:
+                # único ponto de observação da latência da API; o exemplar liga
+                # o bucket ao request_id nos logs (limite de 128 chars do OpenMetrics)
+                API_LATENCY_MS.labels(endpoint=route).observe(
+                    elapsed_ms, exemplar={"request_id": rid[:64]}
+                )
             _request_id_ctx.reset(token)
 
 
@@ -8,6 +8,14 @@ GIT_SHA = os.environ.get("GIT_SHA", "local")
 APP_INFO = Gauge("mosaic_app_info", "Build/Version info", ["version", "git_sha"])
 APP_INFO.labels(version=APP_VERSION, git_sha=GIT_SHA).set(1)
 
+# ── HTTP: latência total por requisição (RequestIdMiddleware)
+HTTP_REQUEST_MS = Histogram(
+    "mosaic_http_request_ms",
+    "Latência total das requisições HTTP (ms)",
+    ["method", "route", "status"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+
 # ── /ask específicas (com label 'entity')
 ASK_LATENCY_MS = Histogram(
     "mosaic_ask_latency_ms",
@@ -48,13 +56,211 @@ DB_ROWS = Counter(
     ["entity"],
 )
 
+# ── Pool de conexões do DB (psycopg_pool)
+DB_POOL_SIZE = Gauge(
+    "mosaic_db_pool_size",
+    "Conexões abertas no pool (entre db_pool_min e db_pool_max)",
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "mosaic_db_pool_connections",
+    "Conexões do pool por estado",
+    ["state"],  # idle, in_use
+)
+
+DB_POOL_WAITING = Gauge(
+    "mosaic_db_pool_waiting",
+    "Requisições aguardando uma conexão livre do pool",
+)
+
+DB_POOL_ACQUIRE_MS = Histogram(
+    "mosaic_db_pool_acquire_ms",
+    "Espera para obter uma conexão do pool (ms)",
+    buckets=(0.1, 0.5, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+
+DB_POOL_ERRORS = Counter(
+    "mosaic_db_pool_errors_total",
+    "Falhas do pool de conexões",
+    ["type"],  # timeout, queue_full, connect, connection
+)
+
+DB_POOL_CONNECTIONS_OPENED = Counter(
+    "mosaic_db_pool_connections_opened_total",
+    "Conexões abertas pelo pool (inclui as que substituem conexões perdidas)",
+)
+
+DB_POOL_RECONNECTIONS = Counter(
+    "mosaic_db_pool_reconnections_total",
+    "Conexões perdidas/devolvidas quebradas e substituídas pelo pool",
+)
+
+# ── Controle de admissão (gateway): concorrência, fila e rejeições por endpoint
+ADMISSION_LIMIT = Gauge(
+    "mosaic_admission_limit",
+    "Limite de concorrência atual (adaptativo, AIMD) por endpoint",
+    ["endpoint"],
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "mosaic_admission_in_flight",
+    "Requisições em execução por endpoint",
+    ["endpoint"],
+)
+
+ADMISSION_QUEUED = Gauge(
+    "mosaic_admission_queued",
+    "Requisições aguardando na fila de admissão por endpoint",
+    ["endpoint"],
+)
+
+ADMISSION_QUEUE_WAIT_MS = Histogram(
+    "mosaic_admission_queue_wait_ms",
+    "Espera na fila de admissão (ms)",
+    ["endpoint"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2000, 5000),
+)
+
+ADMISSION_REJECTED = Counter(
+    "mosaic_admission_rejected_total",
+    "Requisições recusadas pelo controle de admissão",
+    ["endpoint", "reason"],  # queue_full (429), queue_timeout (503)
+)
+
+# ── Rate limiting por cliente
+RATE_LIMITED = Counter(
+    "mosaic_rate_limited_total",
+    "Requisições recusadas (429) por rate limit de cliente",
+    ["endpoint", "tier"],
+)
+
+# ── Deadlines de requisição (X-Request-Timeout / padrão por endpoint)
+DEADLINE_EXCEEDED = Counter(
+    "mosaic_deadline_exceeded_total",
+    "Requisições interrompidas por prazo esgotado ou desconexão do cliente",
+    ["endpoint", "stage", "reason"],  # reason: timeout|disconnect
+)
+
+# ── Orchestrator: etapas da construção de contexto (sub-ms)
+CONTEXT_STAGE_MS = Histogram(
+    "mosaic_context_stage_ms",
+    "Latência por etapa da construção de contexto do /ask (ms)",
+    ["stage"],  # normalize, tokenize, tickers, intent, anchor, phrases
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+# ── Cache local (LocalCacheBackend): ocupação e remoções
+LOCAL_CACHE_ENTRIES = Gauge(
+    "mosaic_cache_local_entries",
+    "Entradas no cache em memória",
+    ["cache"],
+)
+
+LOCAL_CACHE_BYTES = Gauge(
+    "mosaic_cache_local_bytes",
+    "Bytes (aprox.) ocupados no cache em memória",
+    ["cache"],
+)
+
+LOCAL_CACHE_EVICTIONS = Counter(
+    "mosaic_cache_local_evictions_total",
+    "Entradas removidas por limite de entradas/bytes (LRU)",
+    ["cache"],
+)
+
+LOCAL_CACHE_EXPIRATIONS = Counter(
+    "mosaic_cache_local_expirations_total",
+    "Entradas removidas por TTL vencido",
+    ["cache"],
+)
+
+# ── Cache por nome lógico (tickers, views, results...), via NamespacedCache
+CACHE_OPERATIONS = Counter(
+    "mosaic_cache_operations_total",
+    "Operações de cache por cache lógico, backend e resultado",
+    ["cache", "backend", "op", "outcome"],  # outcome: hit|miss (leituras), ok, error
+)
+
+CACHE_LATENCY_MS = Histogram(
+    "mosaic_cache_latency_ms",
+    "Latência das operações de cache por cache lógico (ms)",
+    ["cache", "backend", "op"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 100),
+)
+
+CACHE_VALUE_BYTES = Histogram(
+    "mosaic_cache_value_bytes",
+    "Tamanho dos valores lidos (hits) e gravados no cache (bytes)",
+    ["cache", "backend", "op"],
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+CACHE_RECOMPUTES = Counter(
+    "mosaic_cache_recomputes_total",
+    "Recomputações de valores de cache (miss, early, stale, forced)",
+    ["cache", "reason"],
+)
+
+# ── Redis: latência, erros e circuit breaker
+REDIS_LATENCY_MS = Histogram(
+    "mosaic_redis_latency_ms",
+    "Latência das chamadas ao Redis (ms)",
+    ["op"],
+    buckets=(0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250),
+)
+
+REDIS_ERRORS = Counter(
+    "mosaic_redis_errors_total",
+    "Falhas em chamadas ao Redis (timeouts, conexão, etc.)",
+    ["op", "type"],
+)
+
+REDIS_CIRCUIT_STATE = Gauge(
+    "mosaic_redis_circuit_state",
+    "Estado do circuit breaker do Redis (0=closed, 1=open, 2=half_open)",
+)
+
+REDIS_CIRCUIT_OPEN_SECONDS = Counter(
+    "mosaic_redis_circuit_open_seconds_total",
+    "Tempo acumulado com o circuito do Redis aberto (servindo do fallback local)",
+)
+
+REDIS_SHORT_CIRCUITS = Counter(
+    "mosaic_redis_short_circuits_total",
+    "Chamadas ao Redis desviadas para o fallback local com o circuito aberto",
+    ["op"],
+)
+
+# ── Registry: hot reload do catálogo de views
+VIEWS_RELOADS = Counter(
+    "mosaic_views_reloads_total",
+    "Recargas incrementais de YAMLs do catálogo",
+    ["source", "outcome"],  # source: watcher|pubsub; outcome: applied|invalid|error
+)
+
+CATALOG_GENERATION = Gauge(
+    "mosaic_catalog_generation",
+    "Geração do catálogo de views ativo (muda a cada troca)",
+)
+
 # ── Saúde e visão geral
 APP_UP = Gauge("mosaic_app_up", "Flag de app up (1=up)")
+APP_READY = Gauge("mosaic_app_ready", "Instância pronta para tráfego (1=warm-up concluído)")
+
+WARMUP_MS = Gauge(
+    "mosaic_warmup_ms",
+    "Duração do warm-up por componente no boot (ms)",
+    ["component"],  # db_pool, catalog, vocab, tickers
+)
 
-API_LATENCY_MS = Gauge(
+# endpoints da API com latência própria (observada uma vez, no RequestIdMiddleware)
+API_ENDPOINTS = ("/ask", "/views/run")
+
+API_LATENCY_MS = Histogram(
     "mosaic_api_latency_ms",
-    "Latência do endpoint em milissegundos (última medição)",
+    "Latência do endpoint em milissegundos (exemplar: request_id)",
     ["endpoint"],
+    buckets=(10, 25, 50, 100, 250, 500, 1000, 2000, 5000, 10000, 30000),
 )
 
 API_ERRORS = Counter(
@@ -71,6 +277,20 @@ HEALTH_OK = Gauge(
 )
 
 
+HEALTH_PROBE_MS = Histogram(
+    "mosaic_health_probe_ms",
+    "Duração dos probes de saúde por componente (ms)",
+    ["component"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2000, 5000),
+)
+
+HEALTH_CHECKED_AT = Gauge(
+    "mosaic_health_checked_at_seconds",
+    "Timestamp (epoch) do último probe de saúde por componente",
+    ["component"],
+)
+
+
 def set_health(component: str, ok: bool):
     HEALTH_OK.labels(component=component).set(1.0 if ok else 0.0)
 
@@ -86,8 +306,8 @@ def prime_api_series():
     Útil para testes e para dashboards que esperam as séries desde o boot.
     """
     # Endpoints principais
-    for ep in ("/ask", "/views/run"):
-        API_LATENCY_MS.labels(endpoint=ep).set(0.0)
+    for ep in API_ENDPOINTS:
+        API_LATENCY_MS.labels(endpoint=ep)  # histograma: cria as séries zeradas
         for etype in ("validation", "runtime"):
             API_ERRORS.labels(endpoint=ep, type=etype).inc(0)
 
@@ -1,75 +1,145 @@
-
 from __future__ import annotations
-import json, logging, re
-from typing import List, Set
+import logging, threading, time
+from typing import FrozenSet, List, Optional
 
 from app.executor.service import executor_service
 from app.infrastructure.cache import get_cache_backend
+from app.infrastructure.stampede import get_or_compute
 from app.core.settings import settings
 
+from .tickers import TickerExtractor, TickerMatch
+
 logger = logging.getLogger("orchestrator")
 
-_CACHE = get_cache_backend()
-_TICKERS_KEY = "tickers:list:v1"
+_CACHE = get_cache_backend(name="tickers")
+_TICKERS_KEY = "tickers:list:v2"
 
 class TickerCache:
-    def __init__(self, backend, cache_key: str, ttl_seconds: int) -> None:
+    """Store de tickers em dois níveis.
+
+    L1: frozenset imutável em processo (TTL curto + geração).
+    L2: backend compartilhado (Redis/local), com fallback final no Postgres.
+    O hot path (`snapshot`/`extract`) nunca bloqueia quando já existe L1:
+    se expirado, devolve o valor atual e agenda refresh em background.
+    """
+
+    def __init__(
+        self,
+        backend,
+        cache_key: str,
+        ttl_seconds: int,
+        local_ttl_seconds: float = 30.0,
+        fuzzy_min_confidence: Optional[float] = None,
+    ) -> None:
         self._backend = backend
         self._cache_key = cache_key
         self._ttl_seconds = int(ttl_seconds)
+        self._local_ttl_seconds = float(local_ttl_seconds)
+        self._local: FrozenSet[str] = frozenset()
+        self._local_expires_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._extractor: Optional[TickerExtractor] = None
+        # None desliga a tolerância a typos (HGLG1/HGL11 -> HGLG11)
+        self._fuzzy_min_confidence = fuzzy_min_confidence
+
+    @property
+    def generation(self) -> int:
+        """Incrementa sempre que o conjunto L1 muda de conteúdo."""
+        return self._generation
 
-    def load(self, force: bool = False) -> Set[str]:
-        if not force:
-            try:
-                raw = self._backend.get(self._cache_key)
-                if raw:
-                    return set(json.loads(raw))
-            except Exception:
-                pass
+    def _local_fresh(self) -> bool:
+        return bool(self._local) and time.monotonic() < self._local_expires_at
+
+    def _publish_local(self, tickers: FrozenSet[str]) -> FrozenSet[str]:
+        with self._lock:
+            if tickers != self._local:
+                self._local = tickers
+                self._generation += 1
+            self._local_expires_at = time.monotonic() + self._local_ttl_seconds
+            return self._local
+
+    def snapshot(self) -> FrozenSet[str]:
+        if self._local_fresh():
+            return self._local
+        if self._local:
+            # L1 expirado: serve o valor atual e revalida fora do hot path
+            self._schedule_refresh()
+            return self._local
+        return self.load()
+
+    def load(self, force: bool = False) -> FrozenSet[str]:
+        if not force and self._local_fresh():
+            return self._local
         try:
-            return self._refresh()
+            # L2 com lock por chave: uma expiração = uma consulta ao DB no cluster
+            tickers = get_or_compute(
+                self._backend,
+                self._cache_key,
+                self._fetch,
+                self._ttl_seconds,
+                name="tickers",
+                force=force,
+            )
         except Exception as ex:
             logger.warning("falha ao atualizar cache de tickers: %s", ex)
-            return set()
+            return self._local
+        if not tickers:
+            return self._local
+        return self._publish_local(frozenset(tickers))
 
-    def _refresh(self) -> Set[str]:
+    def refresh_ahead(self) -> FrozenSet[str]:
+        """Revalida L1 a partir do L2 (ou do DB) antes de expirar."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return self._local
+        try:
+            with self._lock:
+                self._local_expires_at = 0.0
+            return self.load()
+        finally:
+            self._refresh_lock.release()
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_lock.locked():
+            return
+        threading.Thread(target=self.refresh_ahead, name="tickers-refresh", daemon=True).start()
+
+    def _fetch(self) -> List[str]:
         rows = executor_service.run("SELECT ticker FROM view_fiis_info ORDER BY ticker;", {})
         tickers = [str(r.get("ticker", "")).upper() for r in rows if r.get("ticker")]
-        payload = json.dumps(tickers)
-        try:
-            self._backend.set(self._cache_key, payload, ttl_seconds=self._ttl_seconds)
-        except Exception as ex:
-            logger.warning("falha ao gravar tickers no cache: %s", ex)
         logger.info("cache de tickers atualizado: %s registros", len(tickers))
-        return set(tickers)
+        return tickers
+
+    def extractor(self) -> TickerExtractor:
+        """Extrator compilado da geração atual (reconstruído só quando L1 muda)."""
+        self.snapshot()
+        with self._lock:
+            valid, generation = self._local, self._generation
+        current = self._extractor
+        if current is None or current.generation != generation:
+            current = TickerExtractor(valid, generation=generation)
+            self._extractor = current
+        return current
+
+    def extract_matches(self, text: str) -> List[TickerMatch]:
+        return self.extractor().matches(text, fuzzy=self._fuzzy_min_confidence is not None)
 
     def extract(self, text: str) -> List[str]:
-        valid = self.load()
-        tokens = re.findall(r"[A-Za-z0-9]{2,}", (text or ""))
-        found: List[str] = []
-        seen: Set[str] = set()
-        has_valid = bool(valid)
-        pattern = re.compile(r"^[A-Za-z]{4}\d{2}$")
-
-        for token in tokens:
-            candidate = token.upper()
-            if has_valid:
-                if candidate in valid and candidate not in seen:
-                    found.append(candidate); seen.add(candidate)
-            elif pattern.fullmatch(candidate) and candidate not in seen:
-                found.append(candidate); seen.add(candidate)
-
-        for token in tokens:
-            if len(token) == 4 and token.isalpha():
-                candidate = token.upper() + "11"
-                if has_valid:
-                    if candidate in valid and candidate not in seen:
-                        found.append(candidate); seen.add(candidate)
-                elif candidate not in seen:
-                    found.append(candidate); seen.add(candidate)
-        return found
-
-TICKER_CACHE = TickerCache(_CACHE, _TICKERS_KEY, settings.tickers_cache_ttl)
+        return self.extractor().extract(text, min_fuzzy_confidence=self._fuzzy_min_confidence)
+
+TICKER_CACHE = TickerCache(
+    _CACHE,
+    _TICKERS_KEY,
+    settings.tickers_cache_ttl,
+    settings.tickers_local_ttl,
+    fuzzy_min_confidence=(
+        settings.tickers_fuzzy_min_confidence if settings.tickers_fuzzy else None
+    ),
+)
 
 def warm_up_ticker_cache() -> None:
     TICKER_CACHE.load(force=True)
+
+def refresh_ticker_cache_ahead() -> None:
+    TICKER_CACHE.refresh_ahead()
@@ -1,6 +1,9 @@
 from __future__ import annotations
+import time
 from typing import List
 
+from app.observability.metrics import CONTEXT_STAGE_MS
+
 from .models import QuestionContext
 from .cache import TICKER_CACHE
 from .utils import unaccent_lower, tokenize
@@ -8,29 +11,44 @@ from .scoring import guess_intent
 from .vocab import ASK_VOCAB
 
 
+_STAGES = ("normalize", "tokenize", "tickers", "intent", "anchor", "phrases")
+# filhos resolvidos uma vez: evita labels() (lock + lookup) no hot path
+_STAGE_MS = {stage: CONTEXT_STAGE_MS.labels(stage=stage) for stage in _STAGES}
+
+
 def has_domain_anchor(tokens: List[str]) -> bool:
     if not tokens:
         return False
-    domain = set()
-    for words in ASK_VOCAB.global_intent_tokens().values():
-        domain.update(words)
-    tset = set(tokens)
-    return bool(tset & domain)
+    domain = ASK_VOCAB.domain_tokens()
+    return any(t in domain for t in tokens)
 
 
 def build_context(question: str) -> QuestionContext:
     question = question or ""
+    t0 = time.perf_counter()
+    normalized = unaccent_lower(question)
+    t1 = time.perf_counter()
     tokens = tokenize(question)
+    t2 = time.perf_counter()
     tickers = TICKER_CACHE.extract(question)
+    t3 = time.perf_counter()
     guessed = guess_intent(tokens)
+    t4 = time.perf_counter()
     anchor = bool(tickers) or has_domain_anchor(tokens)
+    t5 = time.perf_counter()
+    hits = ASK_VOCAB.match_phrases(normalized)
+    t6 = time.perf_counter()
+    for stage, start, end in zip(_STAGES, (t0, t1, t2, t3, t4, t5), (t1, t2, t3, t4, t5, t6)):
+        _STAGE_MS[stage].observe((end - start) * 1000.0)
     return QuestionContext(
         original=question,
-        normalized=unaccent_lower(question),
+        normalized=normalized,
         tokens=tokens,
         tickers=tickers,
         guessed_intent=guessed,
         has_domain_anchor=anchor,
+        phrase_hits=hits,
+        phrases=frozenset(h.phrase for h in hits),
     )
 
 
@@ -8,6 +8,24 @@ class SynonymSource:
     intent: str
     tokens: FrozenSet[str]
     weight: float
+    # frases originais normalizadas (preserva "mes a mes", "linha do tempo")
+    phrases: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class PhraseTag:
+    kind: str  # keyword | synonym | latest | timeword | intent_token
+    entity: Optional[str] = None  # None = global (ontologia)
+    intent: Optional[str] = None
+    weight: float = 0.0
+
+
+@dataclass(frozen=True)
+class PhraseHit:
+    phrase: str
+    start: int
+    end: int
+    tags: Tuple[PhraseTag, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -15,6 +33,8 @@ class EntityAskMeta:
     intents: Tuple[str, ...] = ()
     keywords_normalized: Tuple[str, ...] = ()
     latest_words_normalized: Tuple[str, ...] = ()
+    keyword_phrases: Tuple[str, ...] = ()
+    timewords_normalized: Tuple[str, ...] = ()
     weights: Dict[str, float] = field(
         default_factory=lambda: {"keywords": 1.0, "synonyms": 2.0}
     )
@@ -30,6 +50,8 @@ class QuestionContext:
     tickers: List[str]
     guessed_intent: Optional[str]
     has_domain_anchor: bool
+    phrase_hits: Tuple[PhraseHit, ...] = ()
+    phrases: FrozenSet[str] = frozenset()
 
 
 @dataclass
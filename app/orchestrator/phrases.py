@@ -0,0 +1,98 @@
+from __future__ import annotations
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from .models import PhraseHit, PhraseTag
+
+
+class PhraseMatcher:
+    """Autômato Aho-Corasick sobre frases já normalizadas (lower+unaccent).
+
+    Compilado uma vez por geração do vocabulário; `scan` faz uma única
+    passada linear no texto e só reporta ocorrências em fronteira de palavra
+    ("atual" não casa dentro de "atualizado"). Espaços consecutivos no texto
+    contam como um só, então "mes  a mes" casa com a frase "mes a mes".
+    """
+
+    def __init__(self, phrases: Mapping[str, Iterable[PhraseTag]]) -> None:
+        self._phrases: List[str] = []
+        self._tags: List[Tuple[PhraseTag, ...]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for phrase, tags in phrases.items():
+            phrase = " ".join((phrase or "").split())
+            if not phrase:
+                continue
+            self._add(phrase, tuple(dict.fromkeys(tags)))
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def _add(self, phrase: str, tags: Tuple[PhraseTag, ...]) -> None:
+        node = 0
+        for ch in phrase:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        if self._out[node] and self._phrases[self._out[node][0]] == phrase:
+            idx = self._out[node][0]
+            self._tags[idx] = tuple(dict.fromkeys(self._tags[idx] + tags))
+            return
+        self._phrases.append(phrase)
+        self._tags.append(tags)
+        self._out[node] = (len(self._phrases) - 1,) + self._out[node]
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # saídas herdadas pelo link de falha: sufixos que também são frases
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def scan(self, text: str) -> Tuple[PhraseHit, ...]:
+        if not text or not self._phrases:
+            return ()
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: List[PhraseHit] = []
+        node = 0
+        prev_space = True
+        # `collapsed` guarda a posição real de cada caractere consumido
+        collapsed: List[int] = []
+        n = len(text)
+        for i, ch in enumerate(text):
+            if ch.isspace():
+                if prev_space:
+                    continue
+                ch, prev_space = " ", True
+            else:
+                prev_space = False
+            collapsed.append(i)
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            if i + 1 < n and text[i + 1].isalnum():
+                continue
+            for idx in out[node]:
+                phrase = self._phrases[idx]
+                start = collapsed[len(collapsed) - len(phrase)]
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                hits.append(PhraseHit(phrase, start, i + 1, self._tags[idx]))
+        return tuple(hits)
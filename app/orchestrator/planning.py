@@ -1,7 +1,7 @@
 from __future__ import annotations
 import re
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, FrozenSet, Optional, TYPE_CHECKING
 
 from dateutil.relativedelta import relativedelta
 
@@ -16,28 +16,15 @@ if TYPE_CHECKING:
     from .models import QuestionContext
 
 
-def _meta(entity: str) -> Dict[str, Any]:
-    return registry_service.get(entity) or {}
-
-
-def _cols(entity: str) -> List[str]:
-    return registry_service.get_columns(entity) or []
+def _column_set(entity: str) -> FrozenSet[str]:
+    desc = registry_service.descriptor(entity)
+    return desc.column_set if desc else frozenset()
 
 
 def default_date_field(entity: str) -> Optional[str]:
-    meta = _meta(entity)
-    candidate = meta.get("default_date_field")
-    if candidate and candidate in _cols(entity):
-        return candidate
-    cols = _cols(entity)
-    for suffix in ("_date", "_until"):
-        for col in cols:
-            if col.endswith(suffix):
-                return col
-    for col in cols:
-        if col.endswith("_at"):
-            return col
-    return None
+    # resolvido uma vez na compilação do descritor (default_date_field ou sufixos)
+    desc = registry_service.descriptor(entity)
+    return desc.date_field if desc else None
 
 
 def _parse_date_value(value: Optional[str]) -> Optional[str]:
@@ -53,28 +40,44 @@ def _parse_date_value(value: Optional[str]) -> Optional[str]:
     return None
 
 
+# Uma única regex compilada para as expressões relativas; a prioridade segue
+# a ordem das alternativas (N meses > N meses antes > mês anterior > ano atual).
+_RELATIVE_RE = re.compile(
+    r"(?P<last_months>ultim[oa]s?\s+(?P<last_n>\d+)\s+mes)"
+    r"|(?P<months_before>(?P<before_n>\d+)\s+mes(?:es)?\s+antes)"
+    r"|(?P<prev_month>mes anterior)"
+    r"|(?P<this_year>ano atual)"
+)
+_RELATIVE_PRIORITY = ("last_months", "months_before", "prev_month", "this_year")
+_BETWEEN_RE = re.compile(
+    r"entre\s+(\d{2}/\d{2}/\d{4})\s+e\s+(\d{2}/\d{2}/\d{4})", re.IGNORECASE
+)
+
+
 def _relative_date_range(text_norm: str) -> Dict[str, str]:
-    today = date.today()
+    best: Optional[re.Match] = None
+    best_rank = len(_RELATIVE_PRIORITY)
+    for m in _RELATIVE_RE.finditer(text_norm):
+        rank = _RELATIVE_PRIORITY.index(m.lastgroup or "")
+        if rank < best_rank:
+            best, best_rank = m, rank
+            if rank == 0:
+                break
+    if best is None:
+        return {}
 
-    m = re.search(r"ultim[oa]s?\s+(\d+)\s+mes", text_norm)
-    if m:
-        months = int(m.group(1))
-        start = today - relativedelta(months=months)
-        return {
-            "date_from": start.strftime("%Y-%m-%d"),
-            "date_to": today.strftime("%Y-%m-%d"),
-        }
+    today = date.today()
+    kind = best.lastgroup
 
-    m = re.search(r"(\d+)\s+mes(?:es)?\s+antes", text_norm)
-    if m:
-        months = int(m.group(1))
+    if kind in ("last_months", "months_before"):
+        months = int(best.group("last_n") or best.group("before_n"))
         start = today - relativedelta(months=months)
         return {
             "date_from": start.strftime("%Y-%m-%d"),
             "date_to": today.strftime("%Y-%m-%d"),
         }
 
-    if "mes anterior" in text_norm:
+    if kind == "prev_month":
         first_this_month = today.replace(day=1)
         last_prev_month = first_this_month - timedelta(days=1)
         first_prev_month = last_prev_month.replace(day=1)
@@ -83,23 +86,18 @@ def _relative_date_range(text_norm: str) -> Dict[str, str]:
             "date_to": last_prev_month.strftime("%Y-%m-%d"),
         }
 
-    if "ano atual" in text_norm:
-        start = date(today.year, 1, 1)
-        end = date(today.year, 12, 31)
-        return {
-            "date_from": start.strftime("%Y-%m-%d"),
-            "date_to": end.strftime("%Y-%m-%d"),
-        }
-
-    return {}
+    start = date(today.year, 1, 1)
+    end = date(today.year, 12, 31)
+    return {
+        "date_from": start.strftime("%Y-%m-%d"),
+        "date_to": end.strftime("%Y-%m-%d"),
+    }
 
 
 def _extract_dates_range(text: str) -> Dict[str, str]:
     if not text:
         return {}
-    between = re.search(
-        r"entre\s+(\d{2}/\d{2}/\d{4})\s+e\s+(\d{2}/\d{2}/\d{4})", text, re.IGNORECASE
-    )
+    between = _BETWEEN_RE.search(text)
     if between:
         date_from = _parse_date_value(between.group(1))
         date_to = _parse_date_value(between.group(2))
@@ -144,7 +142,7 @@ def plan_question(
 
     if tickers:
         planner_filters["tickers"] = tickers
-        if "ticker" in _cols(entity):
+        if "ticker" in _column_set(entity):
             filters["ticker"] = tickers if len(tickers) > 1 else tickers[0]
 
     resolved_range = resolve_date_range(ctx.original, payload.get("date_range"))
@@ -161,14 +159,15 @@ def plan_question(
     qnorm = ctx.normalized
     ask_meta = ASK_VOCAB.entity_meta(entity)
 
-    # 'último/recente' prioriza view; se não houver, cai para a ontologia global
-    latest_words_norm = list(ask_meta.latest_words_normalized) or list(
-        ASK_VOCAB.latest_words_defaults()
+    # 'último/recente' prioriza view; se não houver, cai para a ontologia global.
+    # As frases já vêm casadas (Aho-Corasick, fronteira de palavra) no contexto.
+    latest_words_norm = (
+        ask_meta.latest_words_normalized or ASK_VOCAB.latest_words_defaults()
     )
 
     order_by = None
     limit = settings.ask_default_limit
-    if latest_words_norm and any(word in qnorm for word in latest_words_norm):
+    if any(word in ctx.phrases for word in latest_words_norm):
         if date_field:
             order_by = {"field": date_field, "dir": "DESC"}
             limit = 1
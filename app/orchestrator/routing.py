@@ -4,11 +4,13 @@ import time
 import uuid
 from typing import Any, Dict, List, Optional, Tuple
 
+from app.core import deadline
 from app.core.settings import settings
 from app.builder.service import builder_service
 from app.executor.service import executor_service
 from app.formatter.serializer import to_human
-from app.observability.metrics import API_LATENCY_MS, ASK_LATENCY_MS, ASK_ROWS, DB_LATENCY_MS, DB_QUERIES, DB_ROWS
+from app.registry.service import registry_service
+from app.observability.metrics import ASK_LATENCY_MS, ASK_ROWS, DB_LATENCY_MS, DB_QUERIES, DB_ROWS
 
 from .models import EntityScore, QuestionContext
 from .planning import plan_question
@@ -68,6 +70,7 @@ def route_question(payload: Dict[str, Any]) -> Dict[str, Any]:
     req_id = str(uuid.uuid4())
 
     ctx = QuestionContext.build(question)  # filled by facade
+    deadline.check("context")
     if not ctx.has_domain_anchor:
         elapsed_ms = int((time.time() - t0) * 1000)
         response = {
@@ -80,12 +83,12 @@ def route_question(payload: Dict[str, Any]) -> Dict[str, Any]:
             "meta": {"elapsed_ms": elapsed_ms, "rows_total": 0, "rows_by_intent": {}, "limits": {"top_k": payload.get("top_k") or 0}},
             "usage": {"tokens_prompt": 0,"tokens_completion": 0,"cost_estimated": 0.0},
         }
-        API_LATENCY_MS.labels(endpoint="/ask").set((time.time() - t0) * 1000.0)
         ASK_LATENCY_MS.labels(entity="__all__").observe((time.time() - t0) * 1000.0)
         ASK_ROWS.labels(entity="__all__").inc(0)
         return response
 
     selected = choose_entities_by_ask(ctx, settings.ask_min_score, settings.ask_top_k)
+    deadline.check("ranking")
     if not selected:
         elapsed_ms = int((time.time() - t0) * 1000)
         response = {
@@ -98,7 +101,6 @@ def route_question(payload: Dict[str, Any]) -> Dict[str, Any]:
             "meta": {"elapsed_ms": elapsed_ms, "rows_total": 0, "rows_by_intent": {}, "limits": {"top_k": payload.get("top_k") or 0}},
             "usage": {"tokens_prompt": 0,"tokens_completion": 0,"cost_estimated": 0.0},
         }
-        API_LATENCY_MS.labels(endpoint="/ask").set((time.time() - t0) * 1000.0)
         ASK_LATENCY_MS.labels(entity="__all__").observe((time.time() - t0) * 1000.0)
         ASK_ROWS.labels(entity="__all__").inc(0)
         return response
@@ -111,6 +113,7 @@ def route_question(payload: Dict[str, Any]) -> Dict[str, Any]:
     total_rows_run = 0
 
     for entity, intent, score in selected:
+        deadline.check("plan")
         plan = plan_question(ctx, entity, intent, payload)
         run_request = plan["run_request"]
         from app.extractors.normalizers import normalize_request
@@ -126,7 +129,8 @@ def route_question(payload: Dict[str, Any]) -> Dict[str, Any]:
         DB_QUERIES.labels(entity=entity_label).inc()
         DB_ROWS.labels(entity=entity_label).inc(len(rows))
 
-        data = to_human(rows)
+        desc = registry_service.descriptor(entity_label)
+        data = to_human(rows, desc.formatters if desc else None)
         key = intent or entity_label
         if primary_key is None:
             primary_key = key
@@ -150,5 +154,4 @@ def route_question(payload: Dict[str, Any]) -> Dict[str, Any]:
     ASK_ROWS.labels(entity=entity_label).inc(total_rows_run)
     ASK_LATENCY_MS.labels(entity="__all__").observe(elapsed_total)
     ASK_ROWS.labels(entity="__all__").inc(total_rows_run)
-    API_LATENCY_MS.labels(endpoint="/ask").set(elapsed_total)
     return response
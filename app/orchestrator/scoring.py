@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from app.registry.service import registry_service
 from .models import EntityScore, QuestionContext
@@ -7,12 +8,14 @@ from .utils import tokenize, entity_family
 from .vocab import ASK_VOCAB
 
 
-def _meta(entity: str) -> Dict[str, Any]:
-    return registry_service.get(entity) or {}
+@lru_cache(maxsize=256)
+def _description_tokens(description: str) -> FrozenSet[str]:
+    return frozenset(tokenize(description))
 
 
-def _cols(entity: str) -> List[str]:
-    return registry_service.get_columns(entity) or []
+def _entity_description(entity: str) -> str:
+    desc = registry_service.descriptor(entity)
+    return desc.description if desc else ""
 
 
 def _intent_matches(entity_intents: List[str], target: Optional[str]) -> bool:
@@ -23,11 +26,10 @@ def guess_intent(tokens: List[str]) -> Optional[str]:
     if not tokens:
         return None
     counts: Dict[str, int] = {}
-    tset = set(tokens)
-    for intent, words in ASK_VOCAB.global_intent_tokens().items():
-        hits = len(tset & set(words))
-        if hits:
-            counts[intent] = hits
+    index = ASK_VOCAB.token_intents()
+    for token in set(tokens):
+        for intent in index.get(token, ()):
+            counts[intent] = counts.get(intent, 0) + 1
     if not counts:
         return None
     best = max(counts.values())
@@ -52,13 +54,26 @@ def score_entity(ctx: QuestionContext, entity: str) -> Tuple[float, Optional[str
         token_set = source.tokens
         if not intent or not token_set:
             continue
-        hits = len(tset & set(token_set))
+        hits = len(tset & token_set)
         if not hits:
             continue
         weight_syn = float(source.weight or weights.get("synonyms", 2.0))
         score = hits * weight_syn
         intent_scores[intent] = intent_scores.get(intent, 0.0) + score
 
+    # frases multi-palavra casadas inteiras ("mes a mes", "linha do tempo")
+    # reforçam o intent além dos tokens soltos, que perdem a semântica da frase
+    if ctx.phrases:
+        for source in ask_meta.synonym_sources:
+            if not source.intent:
+                continue
+            for phrase in source.phrases:
+                if " " in phrase and phrase in ctx.phrases:
+                    weight_syn = float(source.weight or weights.get("synonyms", 2.0))
+                    intent_scores[source.intent] = (
+                        intent_scores.get(source.intent, 0.0) + weight_syn
+                    )
+
     best_intent = None
     best_intent_score = 0.0
     for intent, score in intent_scores.items():
@@ -66,7 +81,7 @@ def score_entity(ctx: QuestionContext, entity: str) -> Tuple[float, Optional[str
             best_intent_score = score
             best_intent = intent
 
-    desc_tokens = set(tokenize((_meta(entity).get("description") or "")))
+    desc_tokens = _description_tokens(_entity_description(entity))
     score_desc = sum(1 for t in tokens if t in desc_tokens) * 0.5
 
     bonus = 0.0
@@ -87,9 +102,8 @@ def score_entity(ctx: QuestionContext, entity: str) -> Tuple[float, Optional[str
         words = global_tokens.get(intent)
         if not words:
             continue
-        word_set = set(words)
-        seq_hits = sum(1 for t in tokens if t in word_set)
-        uniq_hits = len(tset & word_set)
+        seq_hits = sum(1 for t in tokens if t in words)
+        uniq_hits = len(tset & words)
         if seq_hits:
             total += seq_hits * 1.5
         if uniq_hits:
@@ -97,14 +111,14 @@ def score_entity(ctx: QuestionContext, entity: str) -> Tuple[float, Optional[str
         if guessed and intent == guessed:
             total += 2.0
 
-    dividends_hits = tset & set(global_tokens.get("dividends", ()))
+    dividends_hits = tset & global_tokens.get("dividends", frozenset())
     if dividends_hits:
         if fam == "dividends":
             total += len(dividends_hits) * 2.5
         elif fam == "precos":
             total -= len(dividends_hits) * 1.5
 
-    indicator_hits = tset & set(global_tokens.get("indicadores", ()))
+    indicator_hits = tset & global_tokens.get("indicadores", frozenset())
     if indicator_hits:
         if fam == "indicadores" or {"indicadores", "mercado", "taxas"} & set(
             ask_meta.intents
@@ -113,14 +127,14 @@ def score_entity(ctx: QuestionContext, entity: str) -> Tuple[float, Optional[str
         else:
             total -= len(indicator_hits) * 1.2
 
-    judicial_hits = tset & set(global_tokens.get("judicial", ()))
+    judicial_hits = tset & global_tokens.get("judicial", frozenset())
     if judicial_hits:
         if fam == "judicial" or "judicial" in ask_meta.intents:
             total += len(judicial_hits) * 2.0
         else:
             total -= len(judicial_hits) * 1.0
 
-    imoveis_hits = tset & set(global_tokens.get("imoveis", ()))
+    imoveis_hits = tset & global_tokens.get("imoveis", frozenset())
     if fam == "imoveis":
         if imoveis_hits:
             total += len(imoveis_hits) * 1.5
@@ -185,12 +199,11 @@ def score_entity(ctx: QuestionContext, entity: str) -> Tuple[float, Optional[str
 
 
 def rank_entities(ctx: QuestionContext) -> List[EntityScore]:
-    items = registry_service.list_all()
-    if not items:
+    entities = registry_service.entities()
+    if not entities:
         raise ValueError("Catálogo vazio.")
     results: List[EntityScore] = []
-    for it in items:
-        entity = it["entity"]
+    for entity in entities:
         score, intent = score_entity(ctx, entity)
         if score > 0:
             results.append(EntityScore(entity=entity, intent=intent, score=score))
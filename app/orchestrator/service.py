@@ -3,7 +3,7 @@ from typing import Any, Dict, Optional
 
 from app.core.settings import settings
 
-from .cache import warm_up_ticker_cache
+from .cache import refresh_ticker_cache_ahead, warm_up_ticker_cache
 from .models import QuestionContext
 from .routing import route_question as _route_question
 from .planning import plan_question, default_date_field
@@ -32,6 +32,7 @@ def route_question(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 __all__ = [
     "warm_up_ticker_cache",
+    "refresh_ticker_cache_ahead",
     "default_date_field",
     "build_run_request",
     "route_question",
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]{2,}")
+_TICKER_SHAPE_RE = re.compile(r"[A-Z]{4}\d{2}")
+# candidatos a typo: letras seguidas de dígitos (HGLG1, HGL11, HGLGG11)
+_FUZZY_SHAPE_RE = re.compile(r"[A-Z]{3,5}\d{1,3}")
+
+_DEFAULT_SUFFIX = "11"
+_CONFIDENCE = {"exact": 1.0, "root": 0.9, "fuzzy": 0.75, "pattern": 0.6, "guess": 0.3}
+
+
+@dataclass(frozen=True)
+class TickerMatch:
+    ticker: str
+    token: str
+    confidence: float
+    kind: str  # exact | root | fuzzy | pattern | guess
+
+
+def _deletes(value: str) -> Iterable[str]:
+    for i in range(len(value)):
+        yield value[:i] + value[i + 1 :]
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Levenshtein <= 1 (mais transposição adjacente), sem matriz completa."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        return (
+            len(diff) == 2
+            and diff[1] == diff[0] + 1
+            and a[diff[0]] == b[diff[1]]
+            and a[diff[1]] == b[diff[0]]
+        )
+    short, long_ = (a, b) if la < lb else (b, a)
+    for i in range(len(short)):
+        if short[i] != long_[i]:
+            return short[i:] == long_[i + 1 :]
+    return True
+
+
+class TickerExtractor:
+    """Extrator de tickers compilado uma vez por geração do conjunto válido.
+
+    Índices:
+      - conjunto exato de tickers válidos;
+      - raiz de 4 letras -> ticker com sufixo 11 (HGLG -> HGLG11);
+      - vizinhança por deleção (estilo SymSpell) para typos a 1 edição.
+    """
+
+    def __init__(self, tickers: Iterable[str], generation: int = 0) -> None:
+        valid = frozenset(t.upper() for t in tickers if t)
+        self.generation = generation
+        self.tickers: FrozenSet[str] = valid
+        self._roots: Dict[str, str] = {}
+        deletes: Dict[str, Set[str]] = {}
+        for ticker in valid:
+            if len(ticker) == 6 and ticker.endswith(_DEFAULT_SUFFIX) and ticker[:4].isalpha():
+                self._roots[ticker[:4]] = ticker
+            for variant in _deletes(ticker):
+                deletes.setdefault(variant, set()).add(ticker)
+        self._deletes: Dict[str, Tuple[str, ...]] = {
+            k: tuple(sorted(v)) for k, v in deletes.items()
+        }
+
+    def _fuzzy_candidates(self, candidate: str) -> List[str]:
+        found: Set[str] = set(self._deletes.get(candidate, ()))
+        for variant in _deletes(candidate):
+            if variant in self.tickers:
+                found.add(variant)
+            found.update(self._deletes.get(variant, ()))
+        return sorted(t for t in found if _within_one_edit(candidate, t))
+
+    def _scan(
+        self, text: str, fuzzy: bool
+    ) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]], List[Tuple[str, List[str]]]]:
+        """Varre os tokens uma única vez -> (exatos, raízes, typos)."""
+        exact: List[Tuple[str, str]] = []
+        roots: List[Tuple[str, str]] = []
+        typos: List[Tuple[str, List[str]]] = []
+        valid = self.tickers
+        # upper() uma vez no texto todo: tokens já saem no formato dos tickers
+        tokens = _TOKEN_RE.findall((text or "").upper())
+        if not valid:
+            for token in tokens:
+                if _TICKER_SHAPE_RE.fullmatch(token):
+                    exact.append((token, token))
+                elif len(token) == 4 and token.isalpha():
+                    roots.append((token + _DEFAULT_SUFFIX, token))
+            return exact, roots, typos
+
+        index = self._roots
+        for token in tokens:
+            if token in valid:
+                exact.append((token, token))
+            elif len(token) == 4:
+                ticker = index.get(token)
+                if ticker:
+                    roots.append((ticker, token))
+            elif fuzzy and 4 < len(token) < 9 and _FUZZY_SHAPE_RE.fullmatch(token):
+                typos.append((token, self._fuzzy_candidates(token)))
+        return exact, roots, typos
+
+    def matches(self, text: str, fuzzy: bool = True) -> List[TickerMatch]:
+        """Matches com confiança; ordem: exatos, raízes e typos."""
+        exact, roots, typos = self._scan(text, fuzzy)
+        has_valid = bool(self.tickers)
+        exact_kind, root_kind = ("exact", "root") if has_valid else ("pattern", "guess")
+        out: List[TickerMatch] = []
+        seen: Set[str] = set()
+        for items, kind in ((exact, exact_kind), (roots, root_kind)):
+            for ticker, token in items:
+                if ticker not in seen:
+                    out.append(TickerMatch(ticker, token, _CONFIDENCE[kind], kind)); seen.add(ticker)
+        for token, candidates in typos:
+            if not candidates:
+                continue
+            # ambiguidade dilui a confiança entre os candidatos
+            confidence = _CONFIDENCE["fuzzy"] / len(candidates)
+            for ticker in candidates:
+                if ticker not in seen:
+                    out.append(TickerMatch(ticker, token, confidence, "fuzzy")); seen.add(ticker)
+        return out
+
+    def extract(self, text: str, min_fuzzy_confidence: Optional[float] = None) -> List[str]:
+        """Tickers da pergunta; typos entram só acima do limiar de confiança."""
+        fuzzy = min_fuzzy_confidence is not None
+        exact, roots, typos = self._scan(text, fuzzy)
+        found = [t for t, _ in exact]
+        found.extend(t for t, _ in roots)
+        for _, candidates in typos:
+            if candidates and _CONFIDENCE["fuzzy"] / len(candidates) >= (min_fuzzy_confidence or 0.0):
+                found.extend(candidates)
+        return list(dict.fromkeys(found))
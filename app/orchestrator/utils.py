@@ -1,26 +1,81 @@
 from __future__ import annotations
 import re, unicodedata
-from typing import Any, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+# bloco "Combining Diacritical Marks" (todo Mn): remoção em C após o NFD
+_COMBINING_RE = re.compile("[\u0300-\u036f]+")
+# até este tamanho a tabela de tradução é mais rápida; acima, NFD + regex
+_SHORT_TEXT = 32
 
-def unaccent_lower(value: str) -> str:
-    if not isinstance(value, str):
-        return ""
+
+def _strip_marks(value: str) -> str:
     return "".join(
         c
         for c in unicodedata.normalize("NFD", value)
         if unicodedata.category(c) != "Mn"
-    ).lower()
+    )
+
+
+def _build_unaccent_table() -> Dict[int, str]:
+    # Latin-1 + Latin Extended-A/B: cobre todos os diacríticos do português
+    table: Dict[int, str] = {}
+    for cp in range(0x00C0, 0x0250):
+        ch = chr(cp)
+        stripped = _strip_marks(ch)
+        if stripped != ch and stripped.isascii():
+            table[cp] = stripped
+    return table
+
+
+_UNACCENT_TABLE = _build_unaccent_table()
+
+
+def unaccent_lower(value: str) -> str:
+    if not isinstance(value, str):
+        return ""
+    # fast path: ASCII puro (maioria das perguntas e termos) dispensa NFD
+    if value.isascii():
+        return value.lower()
+    if len(value) <= _SHORT_TEXT:
+        out = value.translate(_UNACCENT_TABLE)
+    else:
+        out = _COMBINING_RE.sub("", unicodedata.normalize("NFD", value))
+    if out.isascii():
+        return out.lower()
+    # restou algo fora da tabela (º, marcas combinantes soltas...): caminho NFD
+    return _strip_marks(out).lower()
+
+
+@lru_cache(maxsize=8192)
+def _normalize_term_cached(value: str) -> str:
+    return unaccent_lower(value)
+
+
+def normalize_term(value: Any) -> str:
+    """`unaccent_lower` memoizado para termos de vocabulário (conjunto finito).
+
+    Perguntas de usuários não devem passar por aqui para não poluir o cache.
+    """
+    if not isinstance(value, str):
+        return ""
+    return _normalize_term_cached(value)
 
 
 def tokenize(text: str) -> List[str]:
-    return re.findall(r"[a-z0-9]{2,}", unaccent_lower(text or ""))
+    return _TOKEN_RE.findall(unaccent_lower(text or ""))
+
+
+@lru_cache(maxsize=8192)
+def _tokenize_term(value: str) -> Tuple[str, ...]:
+    return tuple(_TOKEN_RE.findall(normalize_term(value)))
 
 
 def tokenize_list(values: List[str]) -> List[str]:
     out: List[str] = []
     for v in values or []:
-        out.extend(tokenize(v))
+        out.extend(_tokenize_term(v) if isinstance(v, str) else tokenize(v))
     return out
 
 
@@ -1,73 +1,186 @@
 from __future__ import annotations
+import hashlib
 import time
 import yaml
 from pathlib import Path
 from collections import defaultdict
-from typing import Any, Dict, List, Set, FrozenSet, Tuple
+from typing import Any, Dict, Iterable, List, Set, FrozenSet, Tuple
 
 from app.registry.service import registry_service
-from .models import EntityAskMeta, SynonymSource
-from .utils import ensure_list, tokenize_list, unaccent_lower, parse_weight
+from .models import EntityAskMeta, PhraseHit, PhraseTag, SynonymSource
+from .phrases import PhraseMatcher
+from .utils import ensure_list, normalize_term, tokenize_list, parse_weight
+
+
+ONTOLOGY_PATH = Path("data/ask/ontology.yaml")
+_STATE_FIELDS = (
+    "global_tokens",
+    "token_intents",
+    "domain_tokens",
+    "entity_meta",
+    "latest_words_defaults",
+    "timewords_defaults",
+    "phrase_matcher",
+)
 
 
 def _load_ontology() -> dict:
     # ajuste o caminho conforme o seu projeto
-    path = Path("data/ask/ontology.yaml")
+    path = ONTOLOGY_PATH
     if path.exists():
         with path.open("r", encoding="utf-8") as f:
             return yaml.safe_load(f) or {}
     return {}
 
 
+def ontology_hash() -> str:
+    """sha256 do ontology.yaml (chave do vocabulário no snapshot de catálogo)."""
+    try:
+        return hashlib.sha256(ONTOLOGY_PATH.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
 class AskVocabulary:
     def __init__(self, ttl_seconds: int = 60):
         self._ttl_seconds = ttl_seconds
         self._expires_at = 0.0
         self._global_tokens: Dict[str, Set[str]] = {}
+        # índices derivados (por geração): âncora de domínio e token -> intents
+        self._domain_tokens: FrozenSet[str] = frozenset()
+        self._token_intents: Dict[str, Tuple[str, ...]] = {}
         self._entity_meta: Dict[str, EntityAskMeta] = {}
         # Defaults vindos da ontologia global (fallback quando a view não define)
         self._latest_words_defaults: Tuple[str, ...] = ()
         self._timewords_defaults: Tuple[str, ...] = ()
+        self._phrase_matcher = PhraseMatcher({})
+        self._generation = 0
+        self._catalog_generation = -1
 
     def invalidate(self) -> None:
         self._expires_at = 0.0
 
+    def warm_up(self) -> None:
+        """Compila o vocabulário agora (usado no warm-up do lifespan)."""
+        self._ensure()
+
     def _ensure(self) -> None:
-        if time.time() >= self._expires_at:
+        # recompila ao expirar o TTL ou quando o catálogo troca (hot reload)
+        if (
+            time.time() >= self._expires_at
+            or self._catalog_generation != registry_service.generation
+        ):
             self._reload()
 
     def _reload(self) -> None:
-        ontology = _load_ontology()
+        # snapshot pré-compilado, se casar com o catálogo atual e a ontologia
+        from app.registry.snapshot import vocab_state_for
+
+        catalog_generation = registry_service.generation
+        state = vocab_state_for(registry_service.catalog_hash, ontology_hash())
+        if state is None:
+            state = self.build_state(_load_ontology(), registry_service.iter_documents())
+        self._apply_state(state)
+        self._catalog_generation = catalog_generation
+
+    def _apply_state(self, state: Dict[str, Any]) -> None:
+        for name in _STATE_FIELDS:
+            setattr(self, f"_{name}", state[name])
+        self._generation += 1
+        self._expires_at = time.time() + self._ttl_seconds
+
+    def build_state(
+        self, ontology: Dict[str, Any], documents: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Compila o vocabulário (ontologia + views); serializável no snapshot."""
         global_tokens: Dict[str, Set[str]] = defaultdict(set)
 
         # 1) sementes globais (ontologia)
         ont_intent_tokens = ontology.get("intent_tokens", {}) or {}
         for intent, words in ont_intent_tokens.items():
             for w in ensure_list(words):
-                global_tokens[intent].add(unaccent_lower(w))
+                global_tokens[intent].add(normalize_term(w))
 
         # 2) views do registry
         entity_meta: Dict[str, EntityAskMeta] = {}
-        for entity, doc in registry_service.iter_documents():
+        for entity, doc in documents:
             meta = self._build_entity_meta(doc or {})
             entity_meta[entity] = meta
             for intent, tokens in meta.intent_tokens.items():
                 if tokens:
                     global_tokens[intent].update(tokens)
 
-        # salvar defaults globais para fallback no planner
-        self._latest_words_defaults = tuple(
-            unaccent_lower(w)
-            for w in ensure_list(ontology.get("latest_words_defaults", []))
+        # defaults globais para fallback no planner
+        latest_defaults = self._normalize_phrases(
+            ensure_list(ontology.get("latest_words_defaults", []))
         )
-        self._timewords_defaults = tuple(
-            unaccent_lower(w)
-            for w in ensure_list(ontology.get("timewords_defaults", []))
+        timewords_defaults = self._normalize_phrases(
+            ensure_list(ontology.get("timewords_defaults", []))
         )
 
-        self._global_tokens = {k: frozenset(v) for k, v in global_tokens.items()}
-        self._entity_meta = entity_meta
-        self._expires_at = time.time() + self._ttl_seconds
+        frozen_tokens = {k: frozenset(v) for k, v in global_tokens.items()}
+        token_intents: Dict[str, List[str]] = defaultdict(list)
+        for intent, words in frozen_tokens.items():
+            for w in words:
+                token_intents[w].append(intent)
+        return {
+            "global_tokens": frozen_tokens,
+            "token_intents": {k: tuple(v) for k, v in token_intents.items()},
+            "domain_tokens": frozenset(token_intents),
+            "entity_meta": entity_meta,
+            "latest_words_defaults": latest_defaults,
+            "timewords_defaults": timewords_defaults,
+            "phrase_matcher": PhraseMatcher(
+                self._collect_phrases(
+                    ont_intent_tokens, entity_meta, latest_defaults, timewords_defaults
+                )
+            ),
+        }
+
+    def _collect_phrases(
+        self,
+        ont_intent_tokens: Dict[str, Any],
+        entity_meta: Dict[str, EntityAskMeta],
+        latest_defaults: Tuple[str, ...],
+        timewords_defaults: Tuple[str, ...],
+    ) -> Dict[str, List[PhraseTag]]:
+        phrases: Dict[str, List[PhraseTag]] = defaultdict(list)
+        for intent, words in ont_intent_tokens.items():
+            for p in self._normalize_phrases(ensure_list(words)):
+                phrases[p].append(PhraseTag("intent_token", intent=intent))
+        for p in latest_defaults:
+            phrases[p].append(PhraseTag("latest"))
+        for p in timewords_defaults:
+            phrases[p].append(PhraseTag("timeword"))
+        for entity, meta in entity_meta.items():
+            for p in meta.keyword_phrases:
+                phrases[p].append(PhraseTag("keyword", entity=entity))
+            for p in meta.latest_words_normalized:
+                phrases[p].append(PhraseTag("latest", entity=entity))
+            for p in meta.timewords_normalized:
+                phrases[p].append(PhraseTag("timeword", entity=entity))
+            for source in meta.synonym_sources:
+                for p in source.phrases:
+                    phrases[p].append(
+                        PhraseTag(
+                            "synonym",
+                            entity=entity,
+                            intent=source.intent,
+                            weight=source.weight,
+                        )
+                    )
+        return phrases
+
+    @property
+    def generation(self) -> int:
+        """Geração do vocabulário; muda a cada reload (chave p/ estruturas compiladas)."""
+        self._ensure()
+        return self._generation
+
+    def match_phrases(self, text_norm: str) -> Tuple[PhraseHit, ...]:
+        """Varredura única (Aho-Corasick) de todas as frases do vocabulário."""
+        self._ensure()
+        return self._phrase_matcher.scan(text_norm)
 
     def latest_words_defaults(self) -> Tuple[str, ...]:
         """Lista normalizada (lower+unaccent) de 'último/recente' globais da ontologia."""
@@ -84,12 +197,8 @@ class AskVocabulary:
         intents = self._unique(ensure_list(ask_block.get("intents")))
         keywords = ensure_list(ask_block.get("keywords"))
         keywords_norm = list(dict.fromkeys(tokenize_list(keywords)))
-        latest_words = ensure_list(ask_block.get("latest_words"))
-        latest_norm = [
-            unaccent_lower(w)
-            for w in latest_words
-            if isinstance(w, str) and unaccent_lower(w)
-        ]
+        latest_norm = self._normalize_phrases(ensure_list(ask_block.get("latest_words")))
+        timewords_norm = self._normalize_phrases(ensure_list(ask_block.get("timewords")))
         weights = self._extract_weights(ask_block, {})
         synonyms_map = self._extract_synonyms(ask_block)
         synonym_sources: List[SynonymSource] = []
@@ -99,7 +208,10 @@ class AskVocabulary:
             if tokens:
                 synonym_sources.append(
                     SynonymSource(
-                        intent=intent, tokens=frozenset(tokens), weight=base_syn_weight
+                        intent=intent,
+                        tokens=frozenset(tokens),
+                        weight=base_syn_weight,
+                        phrases=self._normalize_phrases(words),
                     )
                 )
 
@@ -119,7 +231,10 @@ class AskVocabulary:
                 if tokens:
                     synonym_sources.append(
                         SynonymSource(
-                            intent=intent, tokens=frozenset(tokens), weight=syn_weight
+                            intent=intent,
+                            tokens=frozenset(tokens),
+                            weight=syn_weight,
+                            phrases=self._normalize_phrases(words),
                         )
                     )
 
@@ -128,7 +243,9 @@ class AskVocabulary:
         return EntityAskMeta(
             intents=tuple(intents),
             keywords_normalized=tuple(keywords_norm),
-            latest_words_normalized=tuple(latest_norm),
+            latest_words_normalized=latest_norm,
+            keyword_phrases=self._normalize_phrases(keywords),
+            timewords_normalized=timewords_norm,
             weights=dict(weights),
             synonym_sources=tuple(synonym_sources),
             intent_tokens=intent_tokens,
@@ -142,6 +259,16 @@ class AskVocabulary:
         self._ensure()
         return self._global_tokens
 
+    def domain_tokens(self) -> FrozenSet[str]:
+        """União de todos os tokens de intent (âncora de domínio)."""
+        self._ensure()
+        return self._domain_tokens
+
+    def token_intents(self) -> Dict[str, Tuple[str, ...]]:
+        """Índice invertido token -> intents que o contêm."""
+        self._ensure()
+        return self._token_intents
+
     @staticmethod
     def _unique(values: List[str]) -> List[str]:
         seen: Set[str] = set()
@@ -152,6 +279,12 @@ class AskVocabulary:
                 out.append(v)
         return out
 
+    @staticmethod
+    def _normalize_phrases(values: List[str]) -> Tuple[str, ...]:
+        """lower+unaccent com espaços colapsados, sem vazios/duplicados."""
+        out = (" ".join(normalize_term(v).split()) for v in values if isinstance(v, str))
+        return tuple(dict.fromkeys(p for p in out if p))
+
     @staticmethod
     def _normalize_columns(columns: Any) -> List[Dict[str, Any]]:
         items: List[Dict[str, Any]] = []
@@ -196,11 +329,9 @@ class AskVocabulary:
 
     @staticmethod
     def _normalize_tokens(values: List[str]) -> Set[str]:
-        from .utils import tokenize_list, unaccent_lower
-
         tokens = set(tokenize_list(values))
         if not tokens:
-            tokens = {unaccent_lower(v) for v in values if isinstance(v, str)}
+            tokens = {normalize_term(v) for v in values if isinstance(v, str)}
         return {t for t in tokens if t}
 
     @staticmethod
@@ -212,9 +343,9 @@ class AskVocabulary:
             for key, value in raw.items():
                 values = ensure_list(value)
                 normalized = {
-                    unaccent_lower(v)
+                    normalize_term(v)
                     for v in values
-                    if isinstance(v, str) and unaccent_lower(v)
+                    if isinstance(v, str) and normalize_term(v)
                 }
                 if normalized:
                     result[key] = frozenset(normalized)
@@ -0,0 +1,83 @@
+# app/registry/descriptor.py
+"""
+Descritores compilados de entidades do catálogo.
+
+Cada YAML é compilado uma única vez (no reload) em um EntityDescriptor
+imutável, com as estruturas que o caminho de request consulta: colunas
+(tupla + frozenset), identificadores, whitelist de ordenação, campo de data
+e tabela de formatação. O acesso via `RegistryService.descriptor` não copia.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from app.formatter.serializer import field_kind
+
+
+@dataclass(frozen=True, slots=True)
+class EntityDescriptor:
+    entity: str
+    columns: Tuple[str, ...]
+    column_set: FrozenSet[str]
+    identifiers: Tuple[str, ...]
+    identifier_set: FrozenSet[str]
+    order_whitelist: Tuple[str, ...]
+    order_whitelist_set: FrozenSet[str]
+    # valor cru do YAML (usado pelo builder) e o resolvido por heurística (planner)
+    default_date_field: Optional[str]
+    date_field: Optional[str]
+    description: str
+    formatters: Mapping[str, Optional[str]]
+    # visão somente-leitura (rasa) do documento original
+    document: Mapping[str, Any]
+
+
+def _names(items: Any) -> List[str]:
+    out: List[str] = []
+    for c in items or []:
+        if isinstance(c, str):
+            out.append(c)
+        elif isinstance(c, dict):
+            name = c.get("name")  # <- nome real no DB
+            if name:
+                out.append(name)
+    return out
+
+
+def _resolve_date_field(candidate: Optional[str], cols: Tuple[str, ...]) -> Optional[str]:
+    if candidate and candidate in cols:
+        return candidate
+    for suffix in ("_date", "_until"):
+        for col in cols:
+            if col.endswith(suffix):
+                return col
+    for col in cols:
+        if col.endswith("_at"):
+            return col
+    return None
+
+
+def compile_descriptor(entity: str, meta: Dict[str, Any]) -> EntityDescriptor:
+    meta = meta or {}
+    columns = tuple(_names(meta.get("columns")))
+    identifiers = tuple(meta.get("identifiers") or [])
+    wl = meta.get("order_by_whitelist") or []
+    order_wl = tuple(_names(wl)) if wl else columns
+    default_date_field = meta.get("default_date_field")
+    return EntityDescriptor(
+        entity=entity,
+        columns=columns,
+        column_set=frozenset(columns),
+        identifiers=identifiers,
+        identifier_set=frozenset(identifiers),
+        order_whitelist=order_wl,
+        order_whitelist_set=frozenset(order_wl),
+        default_date_field=default_date_field,
+        date_field=_resolve_date_field(default_date_field, columns),
+        description=str(meta.get("description") or ""),
+        formatters=MappingProxyType({c: field_kind(c) for c in columns}),
+        document=MappingProxyType(meta),
+    )
@@ -1,7 +1,9 @@
 # app/registry/loader.py
+import hashlib
+import json
 import logging
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 import yaml
 
@@ -10,6 +12,48 @@ from app.registry.validator import validate_yaml_structure, verify_signature
 
 logger = logging.getLogger("registry.loader")
 
+# parser em C (libyaml) quando disponível: mesmo resultado do safe_load, ~10x mais rápido
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def default_views_dir() -> str:
+    return os.environ.get("VIEWS_DIR", os.path.abspath("data/views"))
+
+
+def hash_catalog(catalog: Dict[str, Dict[str, Any]]) -> str:
+    """Hash do conteúdo do catálogo (independe do caminho em `__file__`)."""
+    payload = {
+        e: {k: v for k, v in meta.items() if k != "__file__"}
+        for e, meta in catalog.items()
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def load_view_file(path: str) -> Tuple[str, Dict[str, Any]]:
+    """Parse + validação de um único YAML -> (entity, documento)."""
+    name = os.path.basename(path)
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read()
+    data = yaml.load(raw, Loader=_Loader) or {}
+    entity = data.get("entity") or os.path.splitext(name)[0]
+    data["__file__"] = path
+    # valida estrutura mínima
+    errs = validate_yaml_structure(data)
+    if errs:
+        data["__validation_errors__"] = errs
+        logger.warning(f"YAML inválido: {name} -> {errs}")
+    # verificação opcional de assinatura (não bloqueia por padrão)
+    sig_err = verify_signature(raw, data)
+    if sig_err:
+        data["__signature_ok__"] = False
+        logger.warning(f"YAML assinatura inválida ({name}): {sig_err}")
+        if settings.views_signature_required:
+            data.setdefault("__validation_errors__", []).append(f"signature: {sig_err}")
+    else:
+        data["__signature_ok__"] = True
+    return entity, data
+
 
 def load_views(views_dir: str) -> Dict[str, Dict[str, Any]]:
     result: Dict[str, Dict[str, Any]] = {}
@@ -18,28 +62,7 @@ def load_views(views_dir: str) -> Dict[str, Dict[str, Any]]:
     for name in os.listdir(views_dir):
         if not name.endswith(".yaml"):
             continue
-        path = os.path.join(views_dir, name)
-        with open(path, "r", encoding="utf-8") as f:
-            raw = f.read()
-            data = yaml.safe_load(raw) or {}
-            entity = data.get("entity") or os.path.splitext(name)[0]
-            result[entity] = data
-            result[entity]["__file__"] = path
-            # valida estrutura mínima
-            errs = validate_yaml_structure(data)
-            if errs:
-                result[entity]["__validation_errors__"] = errs
-                logger.warning(f"YAML inválido: {name} -> {errs}")
-            # verificação opcional de assinatura (não bloqueia por padrão)
-            sig_err = verify_signature(raw, data)
-            if sig_err:
-                result[entity]["__signature_ok__"] = False
-                logger.warning(f"YAML assinatura inválida ({name}): {sig_err}")
-                if settings.views_signature_required:
-                    result[entity].setdefault("__validation_errors__", []).append(
-                        f"signature: {sig_err}"
-                    )
-            else:
-                result[entity]["__signature_ok__"] = True
+        entity, data = load_view_file(os.path.join(views_dir, name))
+        result[entity] = data
 
     return result
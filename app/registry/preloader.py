@@ -5,18 +5,46 @@ Preloader de catálogo de views (YAMLs) com cache Redis/local.
 Objetivos:
 - Reutilizar catálogo entre instâncias do Mosaic.
 - Evitar re-leitura de YAMLs a cada boot.
+
+Formato no cache:
+- `views:catalog:<hash>`: blob único gravado pelo codec do cache (binário,
+  comprimido; ver app/infrastructure/codecs.py) com a versão do formato, o
+  hash do catálogo e todas as entidades;
+- `views:hash`: ponteiro para o blob atual. A publicação grava o blob antes
+  de mover o ponteiro, então quem lê nunca vê um catálogo pela metade;
+  carregamento em 2 round trips (ponteiro + blob), qualquer que seja o
+  número de entidades. Blobs antigos expiram pelo TTL.
+- `views:catalog:v1`: blob em texto (JSON + zlib + base64), lido como
+  fallback e publicado junto com as chaves legadas.
+- Chaves legadas por entidade (`views:list`, `views:<entity>`, `views:loaded`):
+  lidas como fallback (instâncias antigas) e publicadas enquanto
+  `views_publish_legacy_keys` estiver ligado.
 """
 
 from __future__ import annotations
 
+import base64
 import hashlib
 import json
-import os
-from typing import Any, Dict
+import logging
+import zlib
+from typing import Any, Dict, Optional
 
 from app.core.settings import settings
-from app.infrastructure.cache import get_cache_backend
-from app.registry.loader import load_views  # já existe
+from app.infrastructure.cache import CacheBackend, get_cache_backend
+from app.infrastructure.stampede import KeyLock
+from app.registry.loader import default_views_dir
+from app.registry.snapshot import load_catalog
+
+logger = logging.getLogger("registry.preloader")
+
+HASH_KEY = "views:hash"
+CATALOG_KEY_PREFIX = "views:catalog:"
+CATALOG_KEY_V1 = "views:catalog:v1"
+_BLOB_VERSION = 1
+_OBJ_VERSION = 2
+_BLOB_PREFIX = "z1:"
+_PUBLISH_LOCK_TIMEOUT = 10.0
 
 
 def _hash_views(payload: Dict[str, Dict[str, Any]]) -> str:
@@ -24,38 +52,114 @@ def _hash_views(payload: Dict[str, Dict[str, Any]]) -> str:
     return hashlib.sha256(blob.encode("utf-8")).hexdigest()
 
 
-def preload_views() -> Dict[str, Dict[str, Any]]:
+def encode_catalog(catalog: Dict[str, Dict[str, Any]], digest: str) -> str:
+    raw = json.dumps(
+        {"v": _BLOB_VERSION, "hash": digest, "catalog": catalog},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return _BLOB_PREFIX + base64.b64encode(zlib.compress(raw, 6)).decode("ascii")
+
+
+def decode_catalog(blob: Optional[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Retorna o catálogo do blob, ou None se ausente/corrompido/de outra versão."""
+    if not blob or not blob.startswith(_BLOB_PREFIX):
+        return None
+    try:
+        data = json.loads(zlib.decompress(base64.b64decode(blob[len(_BLOB_PREFIX) :])))
+    except Exception as ex:
+        logger.warning("blob de catálogo inválido no cache: %s", ex)
+        return None
+    if not isinstance(data, dict) or data.get("v") != _BLOB_VERSION:
+        return None
+    catalog = data.get("catalog")
+    return catalog if isinstance(catalog, dict) and catalog else None
+
+
+def read_catalog(
+    cache: CacheBackend, digest: Optional[str] = None
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Catálogo publicado no cache (blob apontado por `views:hash`, senão v1), ou None.
+
+    Com `digest`, lê direto o blob desse hash (imutável: uma cópia antiga no L1
+    do tiered não existe) em vez de seguir o ponteiro.
+    """
+    if not digest:
+        digest = cache.get(HASH_KEY)
+    if digest:
+        data = cache.get_obj(CATALOG_KEY_PREFIX + digest)
+        if isinstance(data, dict) and data.get("v") == _OBJ_VERSION and data.get("hash") == digest:
+            catalog = data.get("catalog")
+            if isinstance(catalog, dict) and catalog:
+                return catalog
+    return decode_catalog(cache.get(CATALOG_KEY_V1))
+
+
+def _load_legacy_keys(cache: CacheBackend) -> Dict[str, Dict[str, Any]]:
+    # formato antigo (loaded, list, uma chave por entidade): 2 round trips via MGET
+    loaded, raw_list = cache.get_many(["views:loaded", "views:list"])
+    if loaded != "1" or not raw_list:
+        return {}
+    entities = json.loads(raw_list)
+    cat: Dict[str, Dict[str, Any]] = {}
+    for e, raw in zip(entities, cache.get_many([f"views:{e}" for e in entities])):
+        if raw:
+            cat[e] = json.loads(raw)
+    return cat
+
+
+def publish_catalog(cache: CacheBackend, catalog: Dict[str, Dict[str, Any]]) -> str:
+    """Publica o catálogo no cache e retorna o hash publicado."""
+    ttl = int(settings.views_cache_ttl)
+    digest = _hash_views(catalog)
+    # blob primeiro, ponteiro depois: o ponteiro só aponta para blob completo
+    cache.set_obj(
+        CATALOG_KEY_PREFIX + digest, {"v": _OBJ_VERSION, "hash": digest, "catalog": catalog}, ttl
+    )
+    items = {HASH_KEY: digest}
+    if settings.views_publish_legacy_keys:
+        items[CATALOG_KEY_V1] = encode_catalog(catalog, digest)
+        entities = list(catalog.keys())
+        items["views:list"] = json.dumps(entities, ensure_ascii=False)
+        for e, meta in catalog.items():
+            items[f"views:{e}"] = json.dumps(meta, ensure_ascii=False)
+        items["views:loaded"] = "1"
+    # pipeline: as demais chaves em 1 round trip
+    cache.set_many(items, ttl)
+    return digest
+
+
+def preload_views(from_disk: bool = False) -> Dict[str, Dict[str, Any]]:
     """
     Carrega o catálogo de views (preferindo cache, senão disco).
-    Publica no cache se for carregado do disco.
+    Publica no cache se for carregado do disco. `from_disk=True` ignora o cache.
     """
-    cache = get_cache_backend()
-    key_loaded = "views:loaded"
-    ttl = int(settings.views_cache_ttl)
+    cache = get_cache_backend(name="views")
+
+    # 1️⃣ Tenta do cache: blob único (1 round trip) e, se ausente, chaves legadas
+    if not from_disk:
+        cat = read_catalog(cache)
+        if cat:
+            return cat
+        cat = _load_legacy_keys(cache)
+        if cat:
+            return cat
 
-    # 1️⃣ Tenta do cache
-    if cache.get(key_loaded) == "1":
-        raw_list = cache.get("views:list")
-        if raw_list:
-            entities = json.loads(raw_list)
-            cat: Dict[str, Dict[str, Any]] = {}
-            for e in entities:
-                raw = cache.get(f"views:{e}")
-                if raw:
-                    cat[e] = json.loads(raw)
+    # 2️⃣ Se falhou, carrega do disco (snapshot pré-compilado ou YAMLs) — com
+    #    lock por chave, só uma instância carrega e publica; as demais leem o blob
+    lock = KeyLock(cache, "views:catalog")
+    acquired = lock.acquire(_PUBLISH_LOCK_TIMEOUT)
+    try:
+        if not from_disk and acquired:
+            cat = read_catalog(cache)
             if cat:
                 return cat
+        catalog = load_catalog(default_views_dir())
 
-    # 2️⃣ Se falhou, carrega do disco
-    views_dir = os.environ.get("VIEWS_DIR", os.path.abspath("data/views"))
-    catalog = load_views(views_dir)
-
-    # 3️⃣ Publica no cache
-    entities = list(catalog.keys())
-    cache.set("views:list", json.dumps(entities, ensure_ascii=False), ttl)
-    for e, meta in catalog.items():
-        cache.set(f"views:{e}", json.dumps(meta, ensure_ascii=False), ttl)
-    cache.set("views:hash", _hash_views(catalog), ttl)
-    cache.set(key_loaded, "1", ttl)
+        # 3️⃣ Publica no cache
+        publish_catalog(cache, catalog)
+    finally:
+        if acquired:
+            lock.release()
 
     return catalog
@@ -1,36 +1,114 @@
 # app/registry/service.py
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import copy
+import threading
 
+from app.registry.descriptor import EntityDescriptor, compile_descriptor
+from app.observability.metrics import CATALOG_GENERATION
+from app.registry.loader import hash_catalog
 from app.registry.preloader import preload_views
 
 
 class RegistryService:
     def __init__(self):
         self._cache: Dict[str, Dict[str, Any]] = {}
-        self.reload()
-
-    def reload(self):
-        # cache-first; se não houver no cache, o preloader carrega do disco e publica
-        self._cache = preload_views()
+        self._descriptors: Dict[str, EntityDescriptor] = {}
+        self._entities: Tuple[str, ...] = ()
+        # hash do conteúdo ativo (chave do vocabulário pré-compilado no snapshot)
+        self._catalog_hash: Optional[str] = None
+        # geração do catálogo: muda a cada troca (vocabulário/caches derivados usam como chave)
+        self._generation = 0
+        self._swap_lock = threading.Lock()
+        # carregado no primeiro acesso (ou no warm-up do lifespan), não no import
+        self._loaded = False
+
+    def ensure_loaded(self) -> None:
+        if not self._loaded:
+            with self._swap_lock:
+                if self._loaded:
+                    return
+                catalog = preload_views()
+                self._swap(catalog, {e: compile_descriptor(e, m) for e, m in catalog.items()})
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def generation(self) -> int:
+        self.ensure_loaded()
+        return self._generation
+
+    @property
+    def catalog_hash(self) -> Optional[str]:
+        self.ensure_loaded()
+        return self._catalog_hash
+
+    def reload(self, from_disk: bool = False):
+        # cache-first; se não houver no cache (ou from_disk), o preloader lê o disco e publica
+        catalog = preload_views(from_disk=from_disk)
+        descriptors = {e: compile_descriptor(e, m) for e, m in catalog.items()}
+        with self._swap_lock:
+            self._swap(catalog, descriptors)
+
+    def apply_changes(
+        self, updated: Dict[str, Dict[str, Any]], removed: Iterable[str] = ()
+    ) -> bool:
+        """Troca só as entidades alteradas (hot reload); retorna False se nada mudou."""
+        removed = [e for e in removed if e not in updated]
+        self.ensure_loaded()
+        with self._swap_lock:
+            changed = {e: m for e, m in updated.items() if self._cache.get(e) != m}
+            gone = [e for e in removed if e in self._cache]
+            if not changed and not gone:
+                return False
+            catalog, descriptors = dict(self._cache), dict(self._descriptors)
+            for e in gone:
+                catalog.pop(e, None)
+                descriptors.pop(e, None)
+            for e, m in changed.items():
+                catalog[e] = m
+                descriptors[e] = compile_descriptor(e, m)
+            self._swap(catalog, descriptors)
+        return True
+
+    def _swap(
+        self, catalog: Dict[str, Dict[str, Any]], descriptors: Dict[str, EntityDescriptor]
+    ) -> None:
+        # troca atômica (referências) para leitores concorrentes
+        self._cache, self._descriptors = catalog, descriptors
+        self._entities = tuple(sorted(catalog.keys()))
+        self._catalog_hash = hash_catalog(catalog)
+        self._generation += 1
+        self._loaded = True
+        CATALOG_GENERATION.set(self._generation)
+
+    def catalog(self) -> Dict[str, Dict[str, Any]]:
+        """Catálogo ativo (referência somente-leitura; não mutar)."""
+        self.ensure_loaded()
+        return self._cache
+
+    def descriptor(self, entity: str) -> Optional[EntityDescriptor]:
+        """Descritor compilado e imutável (sem cópia) — use no caminho de request."""
+        if not self._loaded:
+            self.ensure_loaded()
+        return self._descriptors.get(entity)
+
+    def entities(self) -> Tuple[str, ...]:
+        if not self._loaded:
+            self.ensure_loaded()
+        return self._entities
 
     def _colnames(self, entity: str) -> List[str]:
-        meta = self._cache.get(entity) or {}
-        cols = meta.get("columns") or []
-        out: List[str] = []
-        for c in cols:
-            if isinstance(c, str):
-                out.append(c)
-            elif isinstance(c, dict):
-                name = c.get("name")  # <- nome real no DB
-                if name:
-                    out.append(name)
-        return out
+        self.ensure_loaded()
+        d = self._descriptors.get(entity)
+        return list(d.columns) if d else []
 
     def list_all(self) -> List[Dict[str, Any]]:
+        self.ensure_loaded()
         items: List[Dict[str, Any]] = []
-        for k in sorted(self._cache.keys()):
+        for k in self._entities:
             items.append(
                 {
                     "entity": k,
@@ -41,6 +119,7 @@ class RegistryService:
         return items
 
     def get(self, entity: str) -> Optional[Dict[str, Any]]:
+        self.ensure_loaded()
         m = self._cache.get(entity)
         if not m:
             return None
@@ -52,38 +131,32 @@ class RegistryService:
         return self._colnames(entity)
 
     def get_ask_block(self, entity: str) -> Dict[str, Any]:
+        self.ensure_loaded()
         meta = self._cache.get(entity) or {}
         ask = meta.get("ask") or {}
         return dict(ask)
 
     def get_identifiers(self, entity: str) -> List[str]:
+        self.ensure_loaded()
         meta = self._cache.get(entity) or {}
         return meta.get("identifiers", [])
 
     def get_document(self, entity: str) -> Optional[Dict[str, Any]]:
+        self.ensure_loaded()
         meta = self._cache.get(entity)
         if not meta:
             return None
         return copy.deepcopy(meta)
 
     def iter_documents(self):
-        for name in sorted(self._cache.keys()):
+        self.ensure_loaded()
+        for name in self._entities:
             yield name, copy.deepcopy(self._cache[name])
 
     def order_by_whitelist(self, entity: str) -> List[str]:
-        meta = self.get(entity) or {}
-        wl = meta.get("order_by_whitelist") or []
-        if not wl:
-            return self._colnames(entity)
-        out: List[str] = []
-        for c in wl:
-            if isinstance(c, str):
-                out.append(c)
-            elif isinstance(c, dict):
-                name = c.get("name")  # <- idem
-                if name:
-                    out.append(name)
-        return out
+        self.ensure_loaded()
+        d = self._descriptors.get(entity)
+        return list(d.order_whitelist) if d else []
 
 
 registry_service = RegistryService()
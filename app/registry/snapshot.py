@@ -0,0 +1,173 @@
+# app/registry/snapshot.py
+"""
+Snapshot pré-compilado do catálogo para cold start rápido.
+
+O passo de build (`python -m app.registry.snapshot build`, rodado no
+Dockerfile/CI) lê os YAMLs de data/views uma única vez — parse, validação de
+estrutura e assinatura — e compila também o vocabulário do /ask
+(AskVocabulary). Tudo é gravado em um arquivo binário versionado:
+
+    MOSAICSNAP | versão (1 byte) | pickle (protocolo 5) do payload
+
+No boot, `load_catalog` só usa o snapshot se o hash das fontes (bytes dos
+YAMLs + configuração de assinatura) bater com o gravado; caso contrário cai
+no caminho normal (`load_views`). O vocabulário pré-compilado é usado quando
+o hash do catálogo ativo e o da ontologia batem (`vocab_state_for`).
+
+O arquivo é um artefato de build da própria imagem (pickle): não carregue
+snapshots de origem não confiável.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.settings import settings
+from app.registry.loader import default_views_dir, hash_catalog, load_views
+
+logger = logging.getLogger("registry.snapshot")
+
+SNAPSHOT_VERSION = 1
+_MAGIC = b"MOSAICSNAP"
+
+_lock = threading.Lock()
+_cached: Tuple[Optional[Tuple[str, int, int]], Optional[Dict[str, Any]]] = (None, None)
+
+
+def snapshot_path() -> Optional[str]:
+    return settings.catalog_snapshot_path or None
+
+
+def source_hash(views_dir: str) -> str:
+    """Hash das fontes do catálogo: nomes + bytes dos YAMLs e config de assinatura."""
+    h = hashlib.sha256()
+    h.update(f"v{SNAPSHOT_VERSION}".encode())
+    key = settings.views_signature_key or ""
+    h.update(
+        "|".join(
+            (
+                settings.views_signature_mode,
+                str(settings.views_signature_required),
+                hashlib.sha256(key.encode("utf-8")).hexdigest(),
+            )
+        ).encode()
+    )
+    if os.path.isdir(views_dir):
+        for name in sorted(os.listdir(views_dir)):
+            if not name.endswith(".yaml"):
+                continue
+            with open(os.path.join(views_dir, name), "rb") as f:
+                data = f.read()
+            h.update(name.encode("utf-8") + b"\0")
+            h.update(hashlib.sha256(data).digest())
+    return h.hexdigest()
+
+
+def build_snapshot(views_dir: str, out_path: str) -> Dict[str, Any]:
+    """Compila catálogo + vocabulário e grava o snapshot (escrita atômica)."""
+    # import tardio: vocab depende do registry_service (que usa este módulo)
+    from app.orchestrator.vocab import AskVocabulary, _load_ontology, ontology_hash
+
+    catalog = load_views(views_dir)
+    documents = ((e, copy.deepcopy(catalog[e])) for e in sorted(catalog))
+    payload = {
+        "source_hash": source_hash(views_dir),
+        "catalog_hash": hash_catalog(catalog),
+        "ontology_hash": ontology_hash(),
+        "built_at": time.time(),
+        "catalog": catalog,
+        "vocab": AskVocabulary().build_state(_load_ontology(), documents),
+    }
+    blob = _MAGIC + bytes([SNAPSHOT_VERSION]) + pickle.dumps(payload, protocol=5)
+    tmp = f"{out_path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, out_path)
+    return payload
+
+
+def read_snapshot(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Payload do snapshot (memoizado por mtime/tamanho) ou None se ausente/inválido."""
+    global _cached
+    path = path or snapshot_path()
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (path, st.st_mtime_ns, st.st_size)
+    with _lock:
+        if _cached[0] == stamp:
+            return _cached[1]
+        payload: Optional[Dict[str, Any]] = None
+        try:
+            with open(path, "rb") as f:
+                head = f.read(len(_MAGIC) + 1)
+                if head[: len(_MAGIC)] != _MAGIC or head[-1:] != bytes([SNAPSHOT_VERSION]):
+                    logger.warning("snapshot de catálogo com formato/versão diferente: %s", path)
+                else:
+                    payload = pickle.loads(f.read())
+        except Exception as ex:
+            logger.warning("snapshot de catálogo ilegível (%s): %s", path, ex)
+            payload = None
+        _cached = (stamp, payload)
+        return payload
+
+
+def load_catalog(views_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Catálogo do snapshot quando as fontes batem; senão, parse dos YAMLs."""
+    snap = read_snapshot()
+    if snap and snap.get("source_hash") == source_hash(views_dir):
+        catalog: Dict[str, Dict[str, Any]] = {}
+        for entity, meta in snap["catalog"].items():
+            doc = dict(meta)
+            # caminho real em runtime (o build pode ter rodado em outro diretório)
+            doc["__file__"] = os.path.join(views_dir, os.path.basename(meta.get("__file__", "")))
+            catalog[entity] = doc
+        return catalog
+    if snap:
+        logger.info("snapshot de catálogo desatualizado; carregando YAMLs de %s", views_dir)
+    return load_views(views_dir)
+
+
+def vocab_state_for(catalog_hash: Optional[str], ontology_hash: str) -> Optional[Dict[str, Any]]:
+    """Estado pré-compilado do AskVocabulary, se casar com catálogo e ontologia."""
+    if not catalog_hash:
+        return None
+    snap = read_snapshot()
+    if (
+        snap
+        and snap.get("catalog_hash") == catalog_hash
+        and snap.get("ontology_hash") == ontology_hash
+    ):
+        return snap.get("vocab")
+    return None
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Snapshot pré-compilado do catálogo")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    build = sub.add_parser("build", help="compila data/views + vocabulário")
+    build.add_argument("--views-dir", default=default_views_dir())
+    build.add_argument("--out", default=snapshot_path() or "data/catalog.snapshot")
+    args = parser.parse_args(argv)
+
+    payload = build_snapshot(args.views_dir, args.out)
+    invalid = [e for e, m in payload["catalog"].items() if m.get("__validation_errors__")]
+    print(
+        f"snapshot: {args.out} ({len(payload['catalog'])} views, "
+        f"{len(invalid)} com erros de validação, source_hash={payload['source_hash'][:12]})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# app/registry/watcher.py
+"""
+Hot reload incremental dos YAMLs de views.
+
+`ViewsWatcher.poll()` (chamado periodicamente pelo lifespan, fora do event
+loop) compara mtime/tamanho dos arquivos de VIEWS_DIR com a última varredura
+e re-processa só os que mudaram: parse + validação, e troca atômica apenas
+dessas entidades no RegistryService (que incrementa a geração do catálogo;
+o AskVocabulary recompila ao ver a geração nova).
+
+Versões inválidas (erro de parse ou de validação) são ignoradas e a versão
+anterior continua ativa. Com backend redis, o catálogo é republicado no cache
+e a mudança é anunciada no canal `<cache_namespace>:views:changed`; as outras
+instâncias aplicam as entidades alteradas a partir do blob publicado.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from app.core.settings import settings
+from app.infrastructure.cache import PubSubListener, get_cache_backend, get_redis_client
+from app.observability.metrics import VIEWS_RELOADS
+from app.registry.loader import default_views_dir, load_view_file
+from app.registry.preloader import publish_catalog, read_catalog
+from app.registry.service import RegistryService, registry_service
+
+logger = logging.getLogger("registry.watcher")
+
+# identifica esta instância nas mensagens de pub/sub (ignora o próprio eco)
+INSTANCE_ID = uuid.uuid4().hex
+
+
+def changes_channel() -> str:
+    return f"{settings.cache_namespace}:views:changed"
+
+
+class ViewsWatcher:
+    def __init__(self, views_dir: str, registry: RegistryService) -> None:
+        self.views_dir = views_dir
+        self._registry = registry
+        self._stamps: Optional[Dict[str, Tuple[int, int]]] = None
+        self._file_entity: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._listener = PubSubListener(
+            changes_channel(), self.handle_message, name="views-pubsub"
+        )
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        stamps: Dict[str, Tuple[int, int]] = {}
+        try:
+            entries = os.scandir(self.views_dir)
+        except OSError:
+            return stamps
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(".yaml") and entry.is_file():
+                    st = entry.stat()
+                    stamps[entry.name] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def prime(self) -> None:
+        """Marca o estado atual do diretório como base (sem re-parse)."""
+        with self._lock:
+            self._prime()
+
+    def _prime(self) -> None:
+        self._stamps = self._scan()
+        self._file_entity = {
+            os.path.basename(meta.get("__file__") or ""): entity
+            for entity, meta in self._registry.catalog().items()
+        }
+
+    def poll(self) -> Tuple[List[str], List[str]]:
+        """Aplica as mudanças desde a última varredura -> (atualizadas, removidas)."""
+        with self._lock:
+            if self._stamps is None:
+                self._prime()
+                return [], []
+            current = self._scan()
+            changed = [n for n, st in current.items() if self._stamps.get(n) != st]
+            deleted = [n for n in self._stamps if n not in current]
+            # avança a base mesmo para versões rejeitadas: só re-tenta na próxima edição
+            self._stamps = current
+            if not changed and not deleted:
+                return [], []
+
+            updated: Dict[str, Dict] = {}
+            removed: List[str] = []
+            for name in changed:
+                try:
+                    entity, doc = load_view_file(os.path.join(self.views_dir, name))
+                except Exception as ex:
+                    VIEWS_RELOADS.labels(source="watcher", outcome="error").inc()
+                    logger.warning("hot reload ignorado (%s): %s", name, ex)
+                    continue
+                if doc.get("__validation_errors__"):
+                    VIEWS_RELOADS.labels(source="watcher", outcome="invalid").inc()
+                    logger.warning(
+                        "hot reload ignorado (%s): %s", name, doc["__validation_errors__"]
+                    )
+                    continue
+                previous = self._file_entity.get(name)
+                if previous and previous != entity:
+                    removed.append(previous)
+                self._file_entity[name] = entity
+                updated[entity] = doc
+            for name in deleted:
+                entity = self._file_entity.pop(name, None)
+                if entity:
+                    removed.append(entity)
+
+            if not self._registry.apply_changes(updated, removed):
+                return [], []
+            VIEWS_RELOADS.labels(source="watcher", outcome="applied").inc()
+            logger.info("catálogo recarregado: atualizadas=%s removidas=%s", sorted(updated), removed)
+            self._broadcast(sorted(updated), sorted(set(removed)))
+            return sorted(updated), sorted(set(removed))
+
+    # ----------------------------- pub/sub -----------------------------
+    def _broadcast(self, updated: List[str], removed: List[str]) -> None:
+        blob = publish_catalog(get_cache_backend(name="views"), self._registry.catalog())
+        client = get_redis_client()
+        if client is None:
+            return
+        message = {
+            "origin": INSTANCE_ID,
+            "hash": self._registry.catalog_hash,
+            "blob": blob,
+            "updated": updated,
+            "removed": removed,
+        }
+        try:
+            client.publish(changes_channel(), json.dumps(message))
+        except Exception as ex:
+            logger.warning("falha ao anunciar mudança de catálogo: %s", ex)
+
+    def handle_message(self, data: Optional[str]) -> bool:
+        """Aplica uma mudança anunciada por outra instância (via blob no cache)."""
+        try:
+            message = json.loads(data or "")
+        except ValueError:
+            return False
+        if not isinstance(message, dict) or message.get("origin") == INSTANCE_ID:
+            return False
+        if message.get("hash") == self._registry.catalog_hash:
+            return False
+        # blob endereçado pelo hash publicado: o ponteiro `views:hash` pode estar
+        # antigo no L1 do tiered quando a mensagem chega
+        catalog = read_catalog(get_cache_backend(name="views"), message.get("blob"))
+        if not catalog:
+            VIEWS_RELOADS.labels(source="pubsub", outcome="error").inc()
+            return False
+        updated = {e: catalog[e] for e in message.get("updated") or [] if e in catalog}
+        applied = self._registry.apply_changes(updated, message.get("removed") or [])
+        if applied:
+            VIEWS_RELOADS.labels(source="pubsub", outcome="applied").inc()
+        return applied
+
+    def start_listener(self) -> None:
+        self._listener.start()
+
+    def stop_listener(self) -> None:
+        self._listener.stop()
+
+
+VIEWS_WATCHER = ViewsWatcher(default_views_dir(), registry_service)
@@ -0,0 +1,94 @@
+"""
+Benchmark dos codecs de valores do cache.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_codecs [--repeat 20]
+
+Payloads reais: catálogo de data/views (blob do preloader), lista de tickers
+e um result set (linhas de data/samples/view_fiis_history_dividends.csv).
+Compara o formato anterior (texto JSON; para o catálogo, JSON+zlib+base64)
+com cada combinação serializador x compressão disponível no ambiente
+(msgpack/lz4 só entram se os pacotes estiverem instalados).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+os.environ.setdefault("DATABASE_URL", "postgresql://bench@localhost/bench")
+os.environ.setdefault("CACHE_BACKEND", "local")
+
+from app.infrastructure.codecs import ValueCodec  # noqa: E402
+from app.registry.loader import default_views_dir, load_views  # noqa: E402
+from app.registry.preloader import decode_catalog, encode_catalog  # noqa: E402
+
+SAMPLES = Path("data/samples")
+
+
+def _rows(name: str) -> List[Dict[str, Any]]:
+    with (SAMPLES / name).open(encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _best_us(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e6
+
+
+def _codecs() -> List[Tuple[str, str]]:
+    serializers = ["json", "pickle"]
+    compressions = ["none", "zlib"]
+    if importlib.util.find_spec("msgpack"):
+        serializers.append("msgpack")
+    if importlib.util.find_spec("lz4"):
+        compressions.append("lz4")
+    return [(s, c) for s in serializers for c in compressions]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    catalog = load_views(default_views_dir())
+    payloads = {
+        "catalog": {"v": 2, "hash": "x", "catalog": catalog},
+        "tickers": sorted({r["ticker"] for r in _rows("view_fiis_info.csv")}),
+        "rows": _rows("view_fiis_history_dividends.csv"),
+    }
+
+    for name, obj in payloads.items():
+        print(f"\n== {name}")
+        print(f"{'codec':<16}{'bytes':>10}{'encode µs':>12}{'decode µs':>12}")
+        if name == "catalog":
+            legacy = encode_catalog(catalog, "x")
+            enc = _best_us(lambda: encode_catalog(catalog, "x"), args.repeat)
+            dec = _best_us(lambda: decode_catalog(legacy), args.repeat)
+            print(f"{'anterior(z1)':<16}{len(legacy):>10}{enc:>12.0f}{dec:>12.0f}")
+        else:
+            legacy = json.dumps(obj)
+            enc = _best_us(lambda: json.dumps(obj), args.repeat)
+            dec = _best_us(lambda: json.loads(legacy), args.repeat)
+            print(f"{'anterior(json)':<16}{len(legacy.encode()):>10}{enc:>12.0f}{dec:>12.0f}")
+        for serializer, compression in _codecs():
+            codec = ValueCodec(serializer, compression, threshold=1024)
+            data = codec.encode(obj)
+            enc = _best_us(lambda: codec.encode(obj), args.repeat)
+            dec = _best_us(lambda: codec.decode(data), args.repeat)
+            label = f"{serializer}+{compression}"
+            print(f"{label:<16}{len(data):>10}{enc:>12.0f}{dec:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark de normalização de texto (unaccent_lower/tokenize).
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_normalization [--repeat 5]
+
+Compara a implementação de referência (NFD + unicodedata.category por
+caractere) com o caminho atual (fast path ASCII + tabela de tradução) e com
+a versão memoizada usada no reload do vocabulário. Não depende de DB/Redis.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Iterator, List
+
+import yaml
+
+from app.orchestrator.utils import normalize_term, unaccent_lower
+
+QUESTIONS = [
+    "qual foi o último dividendo pago pelo HGLG11?",
+    "quanto o VISC11 distribuiu mês a mês?",
+    "qual o preço atual do HGLG11?",
+    "me mostra o cadastro do VINO11",
+    "quanto foi o IGPM de janeiro de 2024?",
+    "o XPLG11 tem galpões logísticos?",
+    "quanto o GGRC11 valeu em 1º de setembro de 2025?",
+    "qual o CNPJ do HGLG11",
+]
+
+
+def _reference(value: str) -> str:
+    return "".join(
+        c
+        for c in unicodedata.normalize("NFD", value)
+        if unicodedata.category(c) != "Mn"
+    ).lower()
+
+
+def _walk_strings(node: Any) -> Iterator[str]:
+    if isinstance(node, str):
+        yield node
+    elif isinstance(node, dict):
+        for k, v in node.items():
+            yield from _walk_strings(k)
+            yield from _walk_strings(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _walk_strings(v)
+
+
+def _vocabulary() -> List[str]:
+    paths = sorted(Path("data/views").glob("*.yaml")) + [Path("data/ask/ontology.yaml")]
+    out: List[str] = []
+    for path in paths:
+        out.extend(_walk_strings(yaml.safe_load(path.read_text(encoding="utf-8"))))
+    return out
+
+
+def _bench(label: str, fn: Callable[[str], str], corpus: List[str], repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for s in corpus:
+            fn(s)
+        best = min(best, time.perf_counter() - t0)
+    print(f"{label:<34} {best * 1e9 / len(corpus):>8.0f} ns/chamada")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    vocab = _vocabulary()
+    questions = QUESTIONS * 2000
+    print(f"vocabulário: {len(vocab)} termos | perguntas: {len(questions)}")
+
+    _bench("perguntas / referência NFD", _reference, questions, args.repeat)
+    _bench("perguntas / unaccent_lower", unaccent_lower, questions, args.repeat)
+    _bench("vocabulário / referência NFD", _reference, vocab * 20, args.repeat)
+    _bench("vocabulário / unaccent_lower", unaccent_lower, vocab * 20, args.repeat)
+    _bench("vocabulário / normalize_term (lru)", normalize_term, vocab * 20, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark do overhead de registry por request (/ask).
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_registry [--requests 20000] [--repeat 5]
+
+Reproduz as consultas ao registry feitas em um /ask típico (scoring de todas
+as entidades + planner/normalize/builder da entidade escolhida), comparando a
+API de dicionário (cópia a cada chamada) com os descritores compilados.
+Usa o catálogo de data/views via cache local; não acessa o Postgres.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Callable
+
+os.environ.setdefault("DATABASE_URL", "postgresql://bench@localhost/bench")
+os.environ.setdefault("CACHE_BACKEND", "local")
+
+from app.registry.service import registry_service  # noqa: E402
+
+ENTITY = "view_fiis_history_dividends"
+
+
+def _dict_api() -> None:
+    # caminho anterior: list_all + get() por entidade no scoring,
+    # get/get_columns no planner, get no normalize, get + order_by_whitelist no builder
+    for item in registry_service.list_all():
+        (registry_service.get(item["entity"]) or {}).get("description")
+    meta = registry_service.get(ENTITY) or {}
+    cols = registry_service.get_columns(ENTITY)
+    meta.get("default_date_field") in cols
+    "ticker" in registry_service.get_columns(ENTITY)
+    registry_service.get(ENTITY)
+    meta = registry_service.get(ENTITY) or {}
+    wl = registry_service.order_by_whitelist(ENTITY)
+    "payment_date" in meta.get("columns", []) and "payment_date" in wl
+
+
+def _descriptors() -> None:
+    for entity in registry_service.entities():
+        registry_service.descriptor(entity).description
+    desc = registry_service.descriptor(ENTITY)
+    desc.date_field
+    "ticker" in desc.column_set
+    registry_service.descriptor(ENTITY)
+    desc = registry_service.descriptor(ENTITY)
+    "payment_date" in desc.column_set and "payment_date" in desc.order_whitelist_set
+
+
+def _bench(label: str, fn: Callable[[], None], n: int, repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = min(best, time.perf_counter() - t0)
+    print(f"{label:<24} {best * 1e6 / n:>8.2f} µs/request")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"entidades no catálogo: {len(registry_service.entities())}")
+    _bench("API dict (cópias)", _dict_api, args.requests, args.repeat)
+    _bench("descritores", _descriptors, args.requests, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark do cold start do catálogo (registry + vocabulário do /ask).
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_startup [--repeat 5]
+
+Compara o caminho YAML (parse + validação + compilação do AskVocabulary) com
+o snapshot pré-compilado (`python -m app.registry.snapshot build`), incluindo
+o hash das fontes feito a cada boot. Também mede o parse com yaml.SafeLoader
+puro vs CSafeLoader (libyaml). Não acessa Postgres nem Redis.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+os.environ.setdefault("DATABASE_URL", "postgresql://bench@localhost/bench")
+os.environ.setdefault("CACHE_BACKEND", "local")
+
+import yaml  # noqa: E402
+
+from app.core.settings import settings  # noqa: E402
+from app.orchestrator.vocab import AskVocabulary, _load_ontology  # noqa: E402
+from app.registry import loader, snapshot  # noqa: E402
+from app.registry.loader import default_views_dir, load_views  # noqa: E402
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    views_dir = default_views_dir()
+    ontology = _load_ontology()
+
+    def from_yaml() -> None:
+        catalog = load_views(views_dir)
+        AskVocabulary().build_state(ontology, sorted(catalog.items()))
+
+    def from_snapshot() -> None:
+        snapshot._cached = (None, None)  # força leitura do arquivo a cada rodada
+        catalog = snapshot.load_catalog(views_dir)
+        assert snapshot.read_snapshot() is not None
+        snapshot.vocab_state_for(loader.hash_catalog(catalog), snapshot.read_snapshot()["ontology_hash"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.catalog_snapshot_path = os.path.join(tmp, "catalog.snapshot")
+        snapshot.build_snapshot(views_dir, settings.catalog_snapshot_path)
+
+        pure = yaml.SafeLoader
+        original = loader._Loader
+        loader._Loader = pure
+        t_pure = _best(from_yaml, args.repeat)
+        loader._Loader = original
+        t_yaml = _best(from_yaml, args.repeat)
+        t_snap = _best(from_snapshot, args.repeat)
+
+    print(f"yaml (SafeLoader)  : {t_pure:8.2f} ms")
+    print(f"yaml ({original.__name__:<11}): {t_yaml:8.2f} ms")
+    print(f"snapshot           : {t_snap:8.2f} ms  ({t_yaml / t_snap:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
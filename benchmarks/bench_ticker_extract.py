@@ -0,0 +1,107 @@
+"""
+Benchmark de extração de tickers (legado vs. TickerExtractor compilado).
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_ticker_extract [--questions 50000] [--repeat 5]
+
+Não depende de DB/Redis: os tickers válidos vêm de data/samples/view_fiis_info.csv.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import re
+import time
+from pathlib import Path
+from typing import Callable, List, Set
+
+from app.orchestrator.tickers import TickerExtractor
+
+SAMPLE = Path("data/samples/view_fiis_info.csv")
+TEMPLATES = [
+    "qual foi o último dividendo pago pelo {t}?",
+    "me mostra o cadastro do {t}",
+    "compare {t} com {u} no último ano",
+    "quanto o {r} pagou em março de 2024?",
+    "qual o preço atual do {typo}?",
+    "quanto está a taxa Selic hoje?",
+    "mostra o histórico de dividendos do {t} mês a mês",
+]
+
+
+def _legacy_extract(valid: Set[str], text: str) -> List[str]:
+    # cópia fiel do algoritmo anterior de TickerCache.extract
+    tokens = re.findall(r"[A-Za-z0-9]{2,}", (text or ""))
+    found: List[str] = []
+    seen: Set[str] = set()
+    has_valid = bool(valid)
+    pattern = re.compile(r"^[A-Za-z]{4}\d{2}$")
+    for token in tokens:
+        candidate = token.upper()
+        if has_valid:
+            if candidate in valid and candidate not in seen:
+                found.append(candidate); seen.add(candidate)
+        elif pattern.fullmatch(candidate) and candidate not in seen:
+            found.append(candidate); seen.add(candidate)
+    for token in tokens:
+        if len(token) == 4 and token.isalpha():
+            candidate = token.upper() + "11"
+            if has_valid:
+                if candidate in valid and candidate not in seen:
+                    found.append(candidate); seen.add(candidate)
+            elif candidate not in seen:
+                found.append(candidate); seen.add(candidate)
+    return found
+
+
+def _load_tickers() -> List[str]:
+    with SAMPLE.open(encoding="utf-8") as f:
+        return sorted({row["ticker"].upper() for row in csv.DictReader(f) if row.get("ticker")})
+
+
+def _corpus(tickers: List[str], size: int, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    out: List[str] = []
+    for _ in range(size):
+        t, u = rnd.choice(tickers), rnd.choice(tickers)
+        typo = t[:3] + t[4:] if rnd.random() < 0.5 else t[:-1]
+        out.append(rnd.choice(TEMPLATES).format(t=t, u=u, r=t[:4].lower(), typo=typo))
+    return out
+
+
+def _run(label: str, fn: Callable[[str], List[str]], corpus: List[str], repeat: int) -> float:
+    best = float("inf")
+    hits = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        hits = 0
+        for q in corpus:
+            hits += len(fn(q))
+        best = min(best, time.perf_counter() - t0)
+    print(f"{label:<28} {len(corpus) / best:>12,.0f} perguntas/s  hits={hits}")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5, help="melhor de N execuções")
+    args = parser.parse_args()
+
+    tickers = _load_tickers()
+    corpus = _corpus(tickers, args.questions)
+    valid = set(tickers)
+
+    t0 = time.perf_counter()
+    extractor = TickerExtractor(tickers, generation=1)
+    print(f"build TickerExtractor ({len(tickers)} tickers): {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    _run("legado", lambda q: _legacy_extract(valid, q), corpus, args.repeat)
+    _run("compilado (sem typos)", lambda q: extractor.extract(q), corpus, args.repeat)
+    _run("compilado (typos >= 0.7)", lambda q: extractor.extract(q, 0.7), corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.gateway.admission import AdaptiveLimiter, Rejected
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _limiter(latency=lambda: 0.0, **kwargs):
+    defaults = dict(limit=1, min_limit=1, max_limit=4, queue_size=1, queue_timeout=0.2)
+    defaults.update(kwargs)
+    return AdaptiveLimiter("/test", latency=latency, **defaults)
+
+
+def test_queue_full_is_rejected_with_429_and_queued_request_gets_the_slot():
+    async def scenario():
+        limiter = _limiter()
+        await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+
+        with pytest.raises(Rejected) as exc:
+            await limiter.acquire()
+        assert exc.value.status_code == 429 and exc.value.retry_after == 1
+
+        limiter.release()
+        await queued
+        assert limiter.in_flight == 1 and limiter.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_timeout_is_rejected_with_503():
+    async def scenario():
+        limiter = _limiter(queue_timeout=0.05)
+        await limiter.acquire()
+        with pytest.raises(Rejected) as exc:
+            await limiter.acquire()
+        assert exc.value.status_code == 503
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_limit_decreases_on_slow_db_and_grows_back_when_saturated():
+    latency = {"ms": 1000.0}
+    clock = Clock()
+    limiter = _limiter(
+        latency=lambda: latency["ms"], limit=4, min_limit=1, clock=clock, latency_target_ms=100
+    )
+
+    async def cycle(n):
+        for _ in range(n):
+            await limiter.acquire()
+        for _ in range(n):
+            limiter.release()
+
+    asyncio.run(cycle(4))
+    assert limiter.limit == 3  # 4 * 0.9, uma queda por segundo (cooldown)
+
+    clock.now = 5.0
+    latency["ms"] = 10.0
+    for _ in range(10):
+        asyncio.run(cycle(limiter.limit))
+    assert limiter.limit == 4
+
+
+def test_failed_queries_push_latency_ewma_up(monkeypatch):
+    from app.core.deadline import deadline_scope
+    from app.core.settings import settings
+    from app.executor.service import ExecutorService, PoolExhaustedError
+
+    executor = ExecutorService()
+
+    def exhausted(sql, params):
+        raise PoolExhaustedError("couldn't get a connection")
+
+    monkeypatch.setattr(executor, "_run", exhausted)
+    with pytest.raises(PoolExhaustedError):
+        executor.run("SELECT 1")
+
+    penalty = 0.2 * settings.db_pool_acquire_timeout * 1000
+    assert executor.latency_ewma_ms == pytest.approx(penalty, rel=0.05)
+
+    # com prazo ativo a amostra continua sendo a espera do pool, não o prazo
+    executor.latency_ewma_ms = 0.0
+    with deadline_scope(60.0), pytest.raises(PoolExhaustedError):
+        executor.run("SELECT 1")
+    assert executor.latency_ewma_ms == pytest.approx(penalty, rel=0.05)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.core.settings import settings
+from app.orchestrator.vocab import AskVocabulary, ontology_hash
+from app.registry import snapshot
+from app.registry.loader import hash_catalog, load_views
+from app.registry.service import registry_service
+
+VIEWS_DIR = Path(__file__).resolve().parents[1] / "data" / "views"
+
+
+@pytest.fixture
+def views_dir(tmp_path: Path) -> Path:
+    target = tmp_path / "views"
+    shutil.copytree(VIEWS_DIR, target)
+    return target
+
+
+@pytest.fixture
+def snap_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "catalog.snapshot"
+    monkeypatch.setattr(settings, "catalog_snapshot_path", str(path))
+    return path
+
+
+def test_snapshot_roundtrip_matches_yaml_catalog(views_dir: Path, snap_path: Path):
+    snapshot.build_snapshot(str(views_dir), str(snap_path))
+
+    from_snapshot = snapshot.load_catalog(str(views_dir))
+    from_yaml = load_views(str(views_dir))
+
+    assert from_snapshot == from_yaml
+    assert hash_catalog(from_snapshot) == snapshot.read_snapshot()["catalog_hash"]
+
+
+def test_stale_snapshot_falls_back_to_yaml(views_dir: Path, snap_path: Path):
+    snapshot.build_snapshot(str(views_dir), str(snap_path))
+    target = next(views_dir.glob("*.yaml"))
+    target.write_text(target.read_text(encoding="utf-8") + "\n# editado\n", encoding="utf-8")
+
+    assert snapshot.source_hash(str(views_dir)) != snapshot.read_snapshot()["source_hash"]
+    assert snapshot.load_catalog(str(views_dir)) == load_views(str(views_dir))
+
+
+def test_corrupted_snapshot_is_ignored(views_dir: Path, snap_path: Path):
+    snap_path.write_bytes(b"not a snapshot")
+
+    assert snapshot.read_snapshot() is None
+    assert snapshot.load_catalog(str(views_dir)) == load_views(str(views_dir))
+
+
+def test_vocab_state_requires_matching_catalog_and_ontology(snap_path: Path):
+    snapshot.build_snapshot(str(VIEWS_DIR), str(snap_path))
+    catalog_hash = registry_service.catalog_hash
+
+    state = snapshot.vocab_state_for(catalog_hash, ontology_hash())
+    assert state is not None
+    assert snapshot.vocab_state_for("outro", ontology_hash()) is None
+    assert snapshot.vocab_state_for(catalog_hash, "outra") is None
+
+    vocab = AskVocabulary()
+    vocab._reload()
+    fresh = AskVocabulary()
+    fresh._apply_state(fresh.build_state(*_sources()))
+    assert vocab.global_intent_tokens() == fresh.global_intent_tokens()
+    assert vocab.token_intents() == fresh.token_intents()
+    assert vocab.match_phrases("ultimo dividendo") == fresh.match_phrases("ultimo dividendo")
+
+
+def _sources():
+    from app.orchestrator.vocab import _load_ontology
+
+    return _load_ontology(), registry_service.iter_documents()
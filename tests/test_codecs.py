@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import importlib.util
+
+import pytest
+
+from app.infrastructure.cache import LocalCacheBackend, NamespacedCache
+from app.infrastructure.codecs import MAGIC, ValueCodec
+
+PAYLOAD = {"catalog": {"view_x": {"entity": "view_x", "columns": ["ticker"] * 200}}, "v": 2}
+
+
+@pytest.mark.parametrize("serializer", ["json", "pickle"])
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_roundtrip_with_header(serializer: str, compression: str):
+    codec = ValueCodec(serializer, compression, threshold=64)
+    data = codec.encode(PAYLOAD)
+
+    assert data.startswith(MAGIC)
+    assert codec.decode(data) == PAYLOAD
+
+
+def test_small_values_skip_compression_and_big_ones_shrink():
+    codec = ValueCodec("json", "zlib", threshold=1024)
+    small = codec.encode(["HGLG11"])
+    big = codec.encode(PAYLOAD)
+
+    assert small[len(MAGIC) + 2 : len(MAGIC) + 3] == b"-"
+    assert big[len(MAGIC) + 2 : len(MAGIC) + 3] == b"z"
+    assert len(big) < len(ValueCodec("json", "none").encode(PAYLOAD)) / 5
+
+
+def test_decoder_rejects_other_codecs_and_reads_legacy_json():
+    codec = ValueCodec("json", "zlib")
+    pickled = ValueCodec("pickle", "zlib", threshold=0).encode(PAYLOAD)
+
+    with pytest.raises(ValueError):
+        codec.decode(pickled)
+    assert codec.decode(ValueCodec("json", "none").encode(PAYLOAD)) == PAYLOAD
+    assert codec.decode(b'["HGLG11", "KNRI11"]') == ["HGLG11", "KNRI11"]
+    assert codec.decode('["HGLG11"]') == ["HGLG11"]
+    with pytest.raises(ValueError):
+        codec.decode(MAGIC + b"\x09j-{}")
+
+
+@pytest.mark.skipif(importlib.util.find_spec("msgpack") is not None, reason="msgpack instalado")
+def test_missing_optional_codec_falls_back_to_json():
+    assert ValueCodec("msgpack").serializer == "json"
+
+
+def test_backend_objects_through_namespace():
+    inner = LocalCacheBackend(name="test")
+    cache = NamespacedCache(inner, "mosaic")
+    cache.set_obj("tickers", ["HGLG11", "KNRI11"], ttl_seconds=60)
+
+    assert isinstance(inner.get("mosaic:tickers"), bytes)
+    assert cache.get_obj("tickers") == ["HGLG11", "KNRI11"]
+    assert cache.get_obj("missing") is None
+
+    inner.set("mosaic:broken", MAGIC + b"\x01jz not zlib")
+    assert cache.get_obj("broken") is None
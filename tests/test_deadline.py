@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import deadline
+from app.core.deadline import DeadlineExceeded, deadline_scope
+from app.executor.service import executor_service
+
+
+def test_check_is_noop_without_deadline_and_raises_once_expired():
+    deadline.check("context")
+    assert deadline.budget_ms() is None
+
+    with deadline_scope(0.05, endpoint="/test"):
+        assert 1 <= deadline.budget_ms() <= 50
+        time.sleep(0.06)
+        with pytest.raises(DeadlineExceeded) as exc:
+            deadline.check("plan")
+    assert exc.value.stage == "plan" and exc.value.reason == "timeout"
+
+
+def test_remaining_budget_becomes_statement_timeout():
+    with deadline_scope(0.3, endpoint="/test"):
+        t0 = time.perf_counter()
+        with pytest.raises(DeadlineExceeded) as exc:
+            executor_service.run("SELECT pg_sleep(5)", {})
+    assert time.perf_counter() - t0 < 1.5
+    assert exc.value.stage == "db"
+    # a conexão volta ao pool utilizável (SET LOCAL não vaza para a sessão)
+    assert executor_service.run("SHOW statement_timeout", {})[0]["statement_timeout"] == "0"
+
+
+def test_client_disconnect_cancels_running_query():
+    with deadline_scope(30, endpoint="/test") as current:
+        threading.Timer(0.2, current.cancel).start()
+        t0 = time.perf_counter()
+        with pytest.raises(DeadlineExceeded) as exc:
+            executor_service.run("SELECT pg_sleep(5)", {})
+    assert time.perf_counter() - t0 < 2.0
+    assert exc.value.reason == "disconnect"
+
+
+def test_request_timeout_header_returns_504():
+    from app.main import app
+
+    response = TestClient(app).post(
+        "/ask",
+        json={"question": "qual o cnpj do HGLG11?"},
+        headers={"X-Request-Timeout": "0.000001"},
+    )
+    assert response.status_code == 504
+    assert response.json()["reason"] == "timeout"
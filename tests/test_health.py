@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.observability.health import HealthMonitor
+
+
+def test_probes_run_concurrently_and_snapshot_is_cached():
+    calls = []
+
+    async def slow_ok():
+        calls.append("ok")
+        await asyncio.sleep(0.2)
+        return True
+
+    async def broken():
+        raise RuntimeError("conexão recusada")
+
+    async def hangs():
+        await asyncio.sleep(10)
+        return True
+
+    monitor = HealthMonitor({"db": slow_ok, "grafana": broken, "prometheus": hangs}, timeout=0.3)
+    assert monitor.snapshot()["db"]["error"] == "not checked yet"
+
+    t0 = time.perf_counter()
+    snapshot = asyncio.run(monitor.probe_all())
+    assert time.perf_counter() - t0 < 0.6  # em paralelo, limitado pelo timeout
+
+    assert snapshot["db"]["ok"] is True
+    assert snapshot["grafana"] == {**snapshot["grafana"], "ok": False, "error": "conexão recusada"}
+    assert snapshot["prometheus"]["error"].startswith("timeout")
+    assert snapshot["checked_at"] is not None
+
+    # leitura do snapshot não re-proba
+    assert monitor.snapshot()["db"]["checked_at"] == snapshot["db"]["checked_at"]
+    assert calls == ["ok"]
+
+
+def test_db_ping_uses_pool_without_touching_query_metrics():
+    from prometheus_client import REGISTRY
+
+    from app.executor.service import executor_service
+
+    before = REGISTRY.get_sample_value("mosaic_db_queries_total", {"entity": "view_fiis_info"})
+    stats = executor_service.ping(timeout=1.0)
+
+    assert stats["latency_ms"] >= 0
+    assert stats["max"] >= 1 and stats["saturated"] is False
+    assert REGISTRY.get_sample_value("mosaic_db_queries_total", {"entity": "view_fiis_info"}) == before
+
+
+def test_saturated_pool_takes_instance_out_of_readiness(monkeypatch):
+    from app.core.readiness import READINESS
+    from app.observability import health
+
+    stats = {"latency_ms": 0.5, "size": 10, "max": 10, "idle": 0, "in_use": 10, "waiting": 4, "saturated": True}
+    monkeypatch.setattr(health.executor_service, "ping", lambda timeout: stats)
+    monitor = HealthMonitor({"db": health.probe_db}, timeout=1.0)
+
+    snapshot = asyncio.run(monitor.probe_all())
+
+    assert snapshot["db"]["ok"] is True and snapshot["db"]["waiting"] == 4
+    component = READINESS.snapshot()["components"]["db_pool"]
+    assert component["ok"] is False and component["error"] == "pool saturado"
+    READINESS.reset()
+
+
+def test_saturation_is_reported_when_ping_times_out(monkeypatch):
+    from app.core.readiness import READINESS
+    from app.observability import health
+
+    stats = {"size": 10, "max": 10, "idle": 0, "in_use": 10, "waiting": 7, "saturated": True}
+
+    def ping(timeout):
+        raise TimeoutError("couldn't get a connection after 1.00 sec")
+
+    monkeypatch.setattr(health.executor_service, "pool_stats", lambda: stats)
+    monkeypatch.setattr(health.executor_service, "ping", ping)
+    monitor = HealthMonitor({"db": health.probe_db}, timeout=1.0)
+
+    snapshot = asyncio.run(monitor.probe_all())
+
+    assert snapshot["db"]["ok"] is False and snapshot["db"]["waiting"] == 7
+    assert snapshot["db"]["error"].startswith("pool saturado")
+    component = READINESS.snapshot()["components"]["db_pool"]
+    assert component["ok"] is False and component["error"] == "pool saturado"
+    READINESS.reset()
+
+
+def test_exhausted_pool_fails_fast_with_503(monkeypatch):
+    from fastapi.testclient import TestClient
+    from prometheus_client import REGISTRY
+
+    from app.core.settings import settings
+    from app.executor.service import ExecutorService
+    from app.main import app
+
+    monkeypatch.setattr(settings, "db_pool_max", 1)
+    monkeypatch.setattr(settings, "db_pool_min", 1)
+    monkeypatch.setattr(settings, "db_pool_acquire_timeout", 0.2)
+    executor = ExecutorService()
+    monkeypatch.setattr("app.gateway.router.executor_service", executor)
+
+    errors = lambda: REGISTRY.get_sample_value("mosaic_db_pool_errors_total", {"type": "timeout"}) or 0
+    before = errors()
+    try:
+        with executor._connect():  # segura a única conexão
+            t0 = time.perf_counter()
+            response = TestClient(app).post("/views/run", json={"entity": "view_fiis_info", "limit": 1})
+            assert time.perf_counter() - t0 < 2.0
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert errors() == before + 1
+
+        stats = executor.pool_stats()
+        assert stats["max"] == 1 and stats["in_use"] == 0
+    finally:
+        executor.close()
+
+
+def test_failed_warm_up_rebuilds_the_pool_on_retry(monkeypatch):
+    import pytest
+
+    from app.executor.service import ExecutorService
+
+    executor = ExecutorService()
+    dsn = executor.dsn
+    executor.dsn = "postgresql://postgres@127.0.0.1:1/postgres?connect_timeout=1"
+    with pytest.raises(Exception):
+        executor.warm_up(timeout=0.5)
+    assert executor._pool is None  # o pool fechado pelo wait() foi descartado
+
+    executor.dsn = dsn  # DB voltou: a nova tentativa cria outro pool
+    try:
+        executor.warm_up(timeout=5.0)
+        assert executor.run("SELECT 1 AS ok") == [{"ok": 1}]
+    finally:
+        executor.close()
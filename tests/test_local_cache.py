@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.infrastructure import cache as cache_mod
+from app.infrastructure.cache import LocalCacheBackend
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = LocalCacheBackend(max_entries=2, max_bytes=1024, name="test")
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # "a" passa a ser o mais recente
+
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert len(cache) == 2
+
+
+def test_byte_limit_evicts_and_tracks_size():
+    cache = LocalCacheBackend(max_entries=100, max_bytes=20, name="test")
+    cache.set("k1", "x" * 8)  # 10 bytes
+    cache.set("k2", "y" * 8)  # 10 bytes
+    assert cache.bytes == 20
+
+    cache.set("k3", "z" * 8)
+
+    assert cache.get("k1") is None
+    assert cache.bytes == 20
+    cache.delete("k2")
+    assert cache.bytes == 10
+
+
+def test_value_larger_than_cache_is_not_stored():
+    cache = LocalCacheBackend(max_entries=10, max_bytes=16, name="test")
+    cache.set("small", "v")
+
+    cache.set("big", "x" * 64)
+
+    assert cache.get("big") is None
+    assert cache.get("small") == "v"
+
+
+def test_sweep_removes_expired_entries(monkeypatch: pytest.MonkeyPatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+    cache = LocalCacheBackend(name="test")
+    cache.set("short", "1", ttl_seconds=5)
+    cache.set("long", "2", ttl_seconds=60)
+    cache.set("forever", "3")
+
+    now[0] += 10
+
+    assert cache.sweep() == 1
+    assert len(cache) == 2
+    assert cache.get("long") == "2"
+    assert cache.get("forever") == "3"
+
+
+def test_concurrent_writers_respect_limits():
+    cache = LocalCacheBackend(max_entries=50, max_bytes=10_000, name="test")
+
+    def writer(n: int) -> None:
+        for i in range(500):
+            cache.set(f"{n}:{i}", "v" * (i % 7))
+            cache.get(f"{n}:{i // 2}")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(cache) == 50
+    assert cache.bytes == sum(len(k) + len(v) for k, (v, _, _) in cache._store.items())
+
+
+def test_batch_operations_match_single_key_semantics():
+    cache = LocalCacheBackend(name="test")
+    cache.set_many({"a": "1", "b": "2"}, ttl_seconds=60)
+
+    assert cache.get_many(["a", "x", "b"]) == ["1", None, "2"]
+
+    cache.delete_many(["a", "x"])
+    assert cache.get_many(["a", "b"]) == [None, "2"]
+    assert cache.incr("n") == 1
+    assert cache.incr("n") == 2
+
+
+def test_namespaced_batch_and_versioned_invalidation():
+    inner = LocalCacheBackend(name="test")
+    ns = cache_mod.NamespacedCache(inner, "mosaic:results", versioned=True, version_ttl=60)
+    ns.set_many({"q1": "r1", "q2": "r2"})
+
+    assert ns.get_many(["q1", "q2"]) == ["r1", "r2"]
+    assert inner.get("mosaic:results:v0:q1") == "r1"
+
+    assert ns.invalidate_all() == 1
+    assert ns.get_many(["q1", "q2"]) == [None, None]
+    # outra instância enxerga a nova versão ao reler o contador
+    other = cache_mod.NamespacedCache(inner, "mosaic:results", versioned=True)
+    other.set("q1", "novo")
+    assert ns.get("q1") == "novo"
+
+    with pytest.raises(RuntimeError):
+        cache_mod.NamespacedCache(inner, "mosaic").invalidate_all()
+
+
+def test_namespaced_cache_records_hits_misses_and_bytes_per_logical_cache():
+    from prometheus_client import REGISTRY
+
+    def sample(metric, **labels):
+        return REGISTRY.get_sample_value(metric, {"cache": "test-metrics", "backend": "local", **labels}) or 0
+
+    ns = cache_mod.NamespacedCache(LocalCacheBackend(name="test"), "mosaic", name="test-metrics")
+    ns.set("a", "12345")
+    ns.get("a")
+    ns.get_many(["a", "b", "c"])
+
+    assert sample("mosaic_cache_operations_total", op="get", outcome="hit") == 1
+    assert sample("mosaic_cache_operations_total", op="get_many", outcome="miss") == 2
+    assert sample("mosaic_cache_operations_total", op="set", outcome="ok") == 1
+    assert sample("mosaic_cache_value_bytes_sum", op="set") == 5
+    assert sample("mosaic_cache_latency_ms_count", op="get_many") == 1
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from app.orchestrator.models import PhraseTag, QuestionContext
+from app.orchestrator.phrases import PhraseMatcher
+
+
+def _matcher() -> PhraseMatcher:
+    return PhraseMatcher(
+        {
+            "mes a mes": [PhraseTag("synonym", intent="historico")],
+            "mes": [PhraseTag("timeword")],
+            "atual": [PhraseTag("latest")],
+            "mais recente": [PhraseTag("latest")],
+            "linha do tempo": [PhraseTag("synonym", intent="historico")],
+        }
+    )
+
+
+def test_scan_reports_overlapping_phrases_in_one_pass():
+    hits = _matcher().scan("quanto pagou mes a mes?")
+
+    assert [(h.phrase, h.start, h.end) for h in hits] == [
+        ("mes", 13, 16),
+        ("mes a mes", 13, 22),
+        ("mes", 19, 22),
+    ]
+
+
+def test_scan_requires_word_boundaries():
+    matcher = _matcher()
+
+    assert matcher.scan("dividendo atualizado") == ()
+    assert [h.phrase for h in matcher.scan("preco atual")] == ["atual"]
+
+
+def test_scan_collapses_repeated_whitespace():
+    hits = _matcher().scan("a  linha   do tempo")
+
+    assert [h.phrase for h in hits] == ["linha do tempo"]
+    assert (hits[0].start, hits[0].end) == (3, 19)
+
+
+def test_question_context_exposes_vocabulary_phrases():
+    ctx = QuestionContext.build("quanto o VISC11 distribuiu mês a mês?")
+
+    assert "mes a mes" in ctx.phrases
+    tags = [t for h in ctx.phrase_hits if h.phrase == "mes a mes" for t in h.tags]
+    assert any(t.kind == "synonym" and t.intent == "historico" for t in tags)
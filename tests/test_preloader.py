@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.infrastructure.cache import LocalCacheBackend
+from app.registry import preloader
+
+
+class CountingBackend(LocalCacheBackend):
+    def __init__(self):
+        super().__init__()
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return super().get(key)
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> CountingBackend:
+    backend = CountingBackend()
+    monkeypatch.setattr(preloader, "get_cache_backend", lambda **_: backend)
+    return backend
+
+
+def test_catalog_loads_through_the_hash_pointer(cache: CountingBackend):
+    from_disk = preloader.preload_views()
+    cache.gets = 0
+
+    from_cache = preloader.preload_views()
+
+    assert cache.gets == 2  # ponteiro + blob, independente do número de entidades
+    assert from_cache == from_disk
+    digest = preloader._hash_views(from_disk)
+    assert cache.get("views:hash") == digest
+    assert cache.get_obj(f"views:catalog:{digest}")["hash"] == digest
+    assert cache.get("views:list") is None  # chaves legadas desligadas por padrão
+
+
+def test_pointer_to_a_missing_blob_is_not_a_catalog(cache: CountingBackend):
+    cache.set("views:hash", "deadbeef")
+
+    assert preloader.read_catalog(cache) is None
+
+
+def test_falls_back_to_legacy_per_entity_keys(cache: CountingBackend):
+    doc = {"entity": "view_x", "columns": ["ticker"], "identifiers": ["ticker"]}
+    cache.set("views:loaded", "1")
+    cache.set("views:list", json.dumps(["view_x"]))
+    cache.set("views:view_x", json.dumps(doc))
+
+    assert preloader.preload_views() == {"view_x": doc}
+
+
+def test_blob_roundtrip_rejects_corrupted_payloads():
+    catalog = {"view_x": {"entity": "view_x", "description": "ação"}}
+    blob = preloader.encode_catalog(catalog, "abc")
+
+    assert preloader.decode_catalog(blob) == catalog
+    assert preloader.decode_catalog(blob[:-8]) is None
+    assert preloader.decode_catalog('{"views": 1}') is None
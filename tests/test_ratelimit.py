@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.gateway import ratelimit
+from app.gateway.ratelimit import LocalTokenBuckets, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills_at_rate():
+    clock = Clock()
+    buckets = LocalTokenBuckets(clock=clock)
+
+    assert [buckets.take("c", rate=2.0, burst=3)[0] for _ in range(4)] == [True, True, True, False]
+    allowed, retry_after = buckets.take("c", rate=2.0, burst=3)
+    assert not allowed and retry_after == 0.5
+
+    clock.now = 0.5
+    assert buckets.take("c", rate=2.0, burst=3)[0] is True
+    assert buckets.take("other", rate=2.0, burst=3)[0] is True  # buckets independentes
+
+
+def test_client_key_trusts_only_registered_api_keys(monkeypatch):
+    digest = hashlib.sha256(b"secret").hexdigest()
+    monkeypatch.setattr(settings, "rate_limit_api_keys", {digest: "acme"})
+
+    assert RateLimiter.client_key("secret", "1.2.3.4") == ("client:acme", "acme")
+    # chave desconhecida (ex.: uma nova a cada request) não ganha bucket próprio
+    assert RateLimiter.client_key("forged", "1.2.3.4") == ("ip:1.2.3.4", "")
+    assert RateLimiter.client_key(None, "1.2.3.4") == ("ip:1.2.3.4", "")
+
+
+def test_exhausted_quota_returns_429_with_retry_after(monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(
+        settings,
+        "rate_limit_tiers",
+        {"default": {"rate": 0.1, "burst": 1}, "partner": {"rate": 100, "burst": 100}},
+    )
+    digest = hashlib.sha256(b"secret").hexdigest()
+    monkeypatch.setattr(settings, "rate_limit_api_keys", {digest: "acme"})
+    monkeypatch.setattr(settings, "rate_limit_clients", {"acme": "partner"})
+    monkeypatch.setattr(ratelimit.RATE_LIMITER, "buckets", LocalTokenBuckets())
+
+    client = TestClient(app)
+    body = {"question": "qual o cnpj do HGLG11?"}
+    assert client.post("/ask", json=body).status_code == 200
+    throttled = client.post("/ask", json=body)
+    assert throttled.status_code == 429
+    assert throttled.headers["Retry-After"] == "10"
+
+    # client_id no corpo não é verificado: continua no bucket do IP
+    spoofed = {**body, "client": {"client_id": "acme"}}
+    assert client.post("/ask", json=spoofed).status_code == 429
+
+    # cliente verificado pela API key (tier partner) não é afetado
+    headers = {settings.rate_limit_api_key_header: "secret"}
+    assert all(client.post("/ask", json=body, headers=headers).status_code == 200 for _ in range(3))
+
+
+def test_throttled_request_never_reaches_admission(monkeypatch):
+    import asyncio
+
+    from app.gateway.admission import AdmissionMiddleware
+    from app.gateway.ratelimit import RateLimitMiddleware
+    from app.main import app
+
+    order = [m.cls for m in app.user_middleware]  # de fora para dentro
+    assert order.index(RateLimitMiddleware) < order.index(AdmissionMiddleware)
+
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_tiers", {"default": {"rate": 0.1, "burst": 1}})
+    admitted, sent = [], []
+
+    async def inner(scope, receive, send):
+        admitted.append(scope["path"])
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = RateLimitMiddleware(inner, RateLimiter(LocalTokenBuckets()))
+    scope = {"type": "http", "path": "/ask", "headers": [], "client": ("1.2.3.4", 1234)}
+    for _ in range(2):
+        asyncio.run(middleware(scope, None, send))
+
+    assert admitted == ["/ask"]
+    assert sent[0]["status"] == 429
+
+
+def test_redis_buckets_share_the_cache_backend_pool_and_breaker(monkeypatch):
+    import pytest
+
+    pytest.importorskip("redis")
+    from app.infrastructure.cache import NamespacedCache, RedisCacheBackend, TieredCacheBackend
+
+    backend = RedisCacheBackend("redis://127.0.0.1:1/0")
+    tiered = TieredCacheBackend(backend)
+    monkeypatch.setattr(ratelimit, "get_redis_backend", lambda: backend)
+    monkeypatch.setattr(
+        "app.infrastructure.cache.get_cache_backend", lambda **_: NamespacedCache(tiered, "t")
+    )
+
+    from app.infrastructure.cache import get_redis_backend
+
+    assert get_redis_backend() is backend
+    buckets = ratelimit._create_buckets()
+    assert buckets.breaker is backend.breaker
+    assert buckets._script.registered_client is backend.client
+
+    # Redis fora: cai nos buckets locais
+    assert buckets.take("c", rate=1.0, burst=1)[0] is True
+    assert "c" in buckets.fallback._buckets
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.readiness import Readiness
+from app.main import app
+
+
+def test_readiness_requires_every_required_component():
+    readiness = Readiness(required=("db_pool", "catalog"))
+    assert readiness.ready is False
+
+    readiness.mark("catalog", True, elapsed_ms=1.23)
+    readiness.mark("tickers", False, error="timeout")
+    assert readiness.ready is False
+
+    readiness.mark("db_pool", True)
+    snapshot = readiness.snapshot()
+    assert snapshot["ready"] is True
+    assert snapshot["components"]["catalog"]["elapsed_ms"] == 1.2
+    assert snapshot["components"]["tickers"]["error"] == "timeout"
+
+
+def test_readyz_flips_after_warm_up():
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 15.0
+        response = client.get("/readyz")
+        while response.status_code != 200 and time.monotonic() < deadline:
+            assert response.status_code == 503
+            time.sleep(0.05)
+            response = client.get("/readyz")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["ready"] is True
+        assert {"db_pool", "catalog", "vocab"} <= set(body["components"])
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.infrastructure.cache import LocalCacheBackend, RedisCacheBackend
+from app.infrastructure.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+pytest.importorskip("redis")
+
+# porta sem Redis: conexão recusada na hora
+UNREACHABLE = "redis://127.0.0.1:1/0"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_once():
+    clock = Clock()
+    changes = []
+    breaker = CircuitBreaker(
+        failure_threshold=3,
+        reset_seconds=10,
+        on_change=lambda prev, new, elapsed: changes.append((prev, new, elapsed)),
+        clock=clock,
+    )
+    breaker.record_failure()
+    breaker.record_success()  # sucesso zera a sequência
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+
+    clock.now = 10.0
+    assert breaker.allow() is True  # chamada de prova
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is False  # só uma prova por vez
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert changes == [(CLOSED, OPEN, 0.0), (OPEN, HALF_OPEN, 10.0), (HALF_OPEN, CLOSED, 0.0)]
+
+
+def test_failed_probe_reopens_circuit():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=5, clock=clock)
+    breaker.record_failure()
+    clock.now = 5.0
+    assert breaker.allow() is True
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+
+
+def test_unreachable_redis_short_circuits_to_local_fallback():
+    fallback = LocalCacheBackend(name="test-fallback")
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    backend = RedisCacheBackend(UNREACHABLE, fallback=fallback, breaker=breaker)
+
+    assert backend.get("k") is None
+    backend.set("k", "v", 30)
+    assert breaker.state == OPEN
+
+    t0 = time.perf_counter()
+    backend.set("k", "v2", 30)
+    assert backend.get("k") == "v2"
+    assert backend.get_many(["k", "x"]) == ["v2", None]
+    assert (time.perf_counter() - t0) < 0.05  # sem tocar a rede
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from app.registry.descriptor import compile_descriptor
+from app.registry.service import registry_service
+
+
+def test_compile_descriptor_precomputes_request_structures():
+    desc = compile_descriptor(
+        "view_x",
+        {
+            "columns": [{"name": "ticker"}, "payment_date", {"name": "dividend_amt"}],
+            "identifiers": ["ticker"],
+            "description": "Dividendos",
+        },
+    )
+
+    assert desc.columns == ("ticker", "payment_date", "dividend_amt")
+    assert "payment_date" in desc.column_set
+    assert desc.order_whitelist == desc.columns
+    assert desc.date_field == "payment_date"
+    assert desc.default_date_field is None
+    assert desc.formatters["dividend_amt"] == "money"
+    assert desc.formatters["ticker"] is None
+
+
+def test_descriptor_is_immutable_and_slotted():
+    desc = compile_descriptor("view_x", {"columns": ["ticker"]})
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        desc.columns = ()  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        desc.formatters["ticker"] = "money"  # type: ignore[index]
+    assert not hasattr(desc, "__dict__")
+
+
+def test_registry_descriptor_matches_dict_api():
+    for entity in registry_service.entities():
+        desc = registry_service.descriptor(entity)
+        meta = registry_service.get(entity)
+
+        assert desc is registry_service.descriptor(entity)
+        assert list(desc.columns) == meta["columns"]
+        assert list(desc.order_whitelist) == registry_service.order_by_whitelist(entity)
+        assert desc.default_date_field == meta.get("default_date_field")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.main import app
+
+
+def _count(route: str, status: str) -> float:
+    labels = {"method": "GET", "route": route, "status": status}
+    return REGISTRY.get_sample_value("mosaic_http_request_ms_count", labels) or 0
+
+
+def test_request_id_is_propagated_and_latency_recorded_per_route_template():
+    client = TestClient(app)
+    before = _count("/views/{entity}", "404")
+
+    response = client.get("/views/nao_existe", headers={"X-Request-ID": "abc-123"})
+
+    assert response.status_code == 404
+    assert response.headers["X-Request-ID"] == "abc-123"
+    assert _count("/views/{entity}", "404") == before + 1
+
+
+def test_request_id_is_generated_when_missing():
+    response = TestClient(app).get("/healthz")
+    assert len(response.headers["X-Request-ID"]) == 36
+
+
+def test_ask_latency_is_observed_once_with_request_id_exemplar():
+    from app.observability.metrics import API_LATENCY_MS
+
+    def ask_count() -> float:
+        return REGISTRY.get_sample_value("mosaic_api_latency_ms_count", {"endpoint": "/ask"}) or 0
+
+    before = ask_count()
+    response = TestClient(app).post(
+        "/ask", json={"question": "qual o cnpj do HGLG11?"}, headers={"X-Request-ID": "rid-exemplar"}
+    )
+
+    assert response.status_code == 200
+    assert ask_count() == before + 1
+    exemplars = [
+        s.exemplar.labels
+        for m in API_LATENCY_MS.collect()
+        for s in m.samples
+        if s.exemplar is not None and s.labels.get("endpoint") == "/ask"
+    ]
+    assert {"request_id": "rid-exemplar"} in exemplars
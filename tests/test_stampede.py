@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from app.infrastructure.cache import LocalCacheBackend
+from app.infrastructure.stampede import KeyLock, get_or_compute
+
+
+def test_concurrent_misses_compute_once():
+    cache = LocalCacheBackend(name="test-stampede")
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return ["HGLG11"]
+
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(get_or_compute(cache, "k", compute, ttl=60, name="test"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [["HGLG11"]] * 8
+
+
+def test_stale_value_is_served_while_refreshing_in_background():
+    cache = LocalCacheBackend(name="test-stampede")
+    get_or_compute(cache, "k", lambda: "v1", ttl=0.05, stale_ttl=60, name="test")
+    time.sleep(0.1)
+
+    refreshed = threading.Event()
+
+    def compute():
+        refreshed.set()
+        return "v2"
+
+    assert get_or_compute(cache, "k", compute, ttl=60, name="test") == "v1"
+    assert refreshed.wait(2)
+    time.sleep(0.05)
+    assert get_or_compute(cache, "k", lambda: "v3", ttl=60, name="test") == "v2"
+
+
+def test_legacy_value_without_envelope_is_fresh():
+    cache = LocalCacheBackend(name="test-stampede")
+    cache.set_obj("k", ["HGLG11"], 60)
+
+    assert get_or_compute(cache, "k", lambda: ["X"], ttl=60, name="test") == ["HGLG11"]
+
+
+def test_key_lock_excludes_second_holder_until_release():
+    cache = LocalCacheBackend(name="test-stampede")
+    first = KeyLock(cache, "k")
+    assert first.acquire(0.0)
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(KeyLock(cache, "k").acquire(0.0)))
+    t.start()
+    t.join()
+    assert other == [False]
+
+    first.release()
+    second = KeyLock(cache, "k")
+    assert second.acquire(0.0)
+    second.release()
+
+
+def test_expired_lock_release_keeps_new_owner():
+    cache = LocalCacheBackend(name="test-stampede")
+    stale = KeyLock(cache, "k", ttl_seconds=0.01)
+    assert stale.acquire(0.0)
+    time.sleep(0.02)
+    assert cache.add("k:lock", "new-owner", 30)
+
+    stale.release()
+    assert cache.get("k:lock") == "new-owner"
+    assert not cache.delete_if_equals("k:lock", "other")
+    assert cache.delete_if_equals("k:lock", "new-owner")
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+
+from app.infrastructure.cache import LocalCacheBackend
+from app.orchestrator.cache import TickerCache
+
+
+class CountingBackend(LocalCacheBackend):
+    def __init__(self):
+        super().__init__()
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return super().get(key)
+
+
+def test_local_tier_serves_without_backend_round_trip():
+    backend = CountingBackend()
+    backend.set("tickers", json.dumps(["HGLG11", "KNRI11"]))
+    cache = TickerCache(backend, "tickers", ttl_seconds=300, local_ttl_seconds=60)
+
+    assert cache.extract("HGLG11 ou KNRI11?") == ["HGLG11", "KNRI11"]
+    assert cache.extract("e o HGLG?") == ["HGLG11"]
+    assert backend.gets == 1
+    assert cache.generation == 1
+
+
+def test_generation_changes_only_when_tickers_change():
+    backend = CountingBackend()
+    backend.set("tickers", json.dumps(["HGLG11"]))
+    cache = TickerCache(backend, "tickers", ttl_seconds=300, local_ttl_seconds=60)
+
+    cache.load()
+    cache.refresh_ahead()
+    assert cache.generation == 1
+
+    backend.set("tickers", json.dumps(["HGLG11", "MXRF11"]))
+    assert "MXRF11" in cache.refresh_ahead()
+    assert cache.generation == 2
+
+
+def test_stale_local_tier_is_served_while_revalidating():
+    backend = CountingBackend()
+    backend.set("tickers", json.dumps(["HGLG11"]))
+    cache = TickerCache(backend, "tickers", ttl_seconds=300, local_ttl_seconds=0)
+
+    first = cache.load()
+    backend.delete("tickers")
+
+    assert cache.snapshot() == first
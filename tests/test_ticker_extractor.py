@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from app.orchestrator.tickers import TickerExtractor
+
+VALID = {"HGLG11", "KNRI11", "MXRF11", "HGRU11", "HGLG12"}
+
+
+def test_exact_and_root_matches_keep_question_order():
+    extractor = TickerExtractor(VALID)
+
+    assert extractor.extract("compare KNRI11 com hglg e MXRF11") == [
+        "KNRI11",
+        "MXRF11",
+        "HGLG11",
+    ]
+
+
+def test_typos_resolve_with_confidence():
+    extractor = TickerExtractor(VALID)
+
+    for typo in ("HGL11", "HGLGG11", "KNIR11", "MXRF1"):
+        matches = extractor.matches(f"dividendo do {typo}")
+        assert [m.kind for m in matches] == ["fuzzy"], typo
+        assert matches[0].confidence < 1.0
+
+    assert extractor.extract("dividendo do KNRl11", min_fuzzy_confidence=0.7) == [
+        "KNRI11"
+    ]
+
+
+def test_ambiguous_typo_is_below_threshold():
+    extractor = TickerExtractor(VALID)
+
+    matches = extractor.matches("preço do HGLG1")
+    assert {m.ticker for m in matches} == {"HGLG11", "HGLG12"}
+    assert extractor.extract("preço do HGLG1", min_fuzzy_confidence=0.7) == []
+
+
+def test_plain_words_and_years_are_not_tickers():
+    extractor = TickerExtractor(VALID)
+
+    assert extractor.extract("qual o IPCA de 2024?", min_fuzzy_confidence=0.0) == []
+
+
+def test_without_catalog_falls_back_to_ticker_shape():
+    extractor = TickerExtractor(())
+
+    assert extractor.extract("HGLG11 e knri") == ["HGLG11", "KNRI11"]
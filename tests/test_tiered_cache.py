@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import List
+
+from app.infrastructure.cache import LocalCacheBackend, TieredCacheBackend
+
+
+class Bus:
+    """Canal em memória: entrega cada publish a todos os assinantes."""
+
+    def __init__(self):
+        self.subscribers: List[TieredCacheBackend] = []
+
+    def publish(self, channel, data):
+        for sub in self.subscribers:
+            sub.handle_message(data)
+
+
+class CountingBackend(LocalCacheBackend):
+    def __init__(self):
+        super().__init__(name="test-l2")
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return super().get(key)
+
+    def get_many(self, keys):
+        self.gets += 1
+        return super().get_many(keys)
+
+
+def _replicas(n: int = 2):
+    l2, bus = CountingBackend(), Bus()
+    nodes = [
+        TieredCacheBackend(l2, LocalCacheBackend(name="test-l1"), l1_ttl=60, publisher=bus)
+        for _ in range(n)
+    ]
+    bus.subscribers.extend(nodes)
+    return l2, nodes
+
+
+def test_hot_reads_are_served_from_l1():
+    l2, (a, _) = _replicas()
+    l2.set("k", "v")
+
+    assert a.get("k") == "v"
+    assert a.get("k") == "v"
+    assert l2.gets == 1
+
+
+def test_write_invalidates_other_replicas_l1():
+    l2, (a, b) = _replicas()
+    a.set("k", "v1")
+    assert b.get("k") == "v1"  # b agora tem "k" no L1
+
+    a.set("k", "v2")
+
+    assert b.get("k") == "v2"
+    assert a.get("k") == "v2"
+
+
+def test_delete_propagates_to_all_replicas():
+    _, (a, b) = _replicas()
+    a.set("k", "v")
+    assert b.get("k") == "v"
+
+    b.delete("k")
+
+    assert a.get("k") is None
+    assert b.get("k") is None
+
+
+def test_own_messages_do_not_drop_fresh_l1_entry():
+    l2, (a, _) = _replicas()
+    a.set("k", "v")
+    l2.gets = 0
+
+    assert a.get("k") == "v"
+    assert l2.gets == 0
+
+
+def test_get_many_fills_l1_from_a_single_l2_batch():
+    l2, (a, b) = _replicas()
+    l2.set_many({"x": "1", "y": "2"})
+
+    assert a.get_many(["x", "y", "z"]) == ["1", "2", None]
+    l2.gets = 0
+    assert a.get_many(["x", "y"]) == ["1", "2"]
+    assert l2.gets == 0
+
+    b.delete_many(["x"])
+    assert a.get("x") is None
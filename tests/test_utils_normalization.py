@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any, Iterator
+
+import yaml
+
+from app.orchestrator.utils import normalize_term, tokenize, unaccent_lower
+
+
+def _reference_unaccent_lower(value: str) -> str:
+    return "".join(
+        c
+        for c in unicodedata.normalize("NFD", value)
+        if unicodedata.category(c) != "Mn"
+    ).lower()
+
+
+def _walk_strings(node: Any) -> Iterator[str]:
+    if isinstance(node, str):
+        yield node
+    elif isinstance(node, dict):
+        for k, v in node.items():
+            yield from _walk_strings(k)
+            yield from _walk_strings(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _walk_strings(v)
+
+
+def _vocabulary_strings() -> list[str]:
+    root = Path(__file__).resolve().parents[1] / "data"
+    paths = sorted((root / "views").glob("*.yaml")) + [root / "ask" / "ontology.yaml"]
+    out: list[str] = []
+    for path in paths:
+        out.extend(_walk_strings(yaml.safe_load(path.read_text(encoding="utf-8"))))
+    return out
+
+
+def test_unaccent_lower_matches_nfd_reference_across_vocabulary():
+    terms = _vocabulary_strings()
+    assert len(terms) > 500
+
+    for term in terms:
+        expected = _reference_unaccent_lower(term)
+        assert unaccent_lower(term) == expected, term
+        assert normalize_term(term) == expected, term
+
+
+def test_unaccent_lower_matches_reference_for_latin_and_edge_cases():
+    samples = [chr(cp) for cp in range(0x20, 0x0300)] + [
+        "1º de setembro",
+        "Ação e Ações",
+        "mêś decomposto",
+        "İstanbul",
+        "preço – variação",
+    ]
+    for sample in samples:
+        assert unaccent_lower(sample) == _reference_unaccent_lower(sample), repr(sample)
+
+
+def test_tokenize_matches_reference_tokenizer():
+    for term in _vocabulary_strings():
+        expected = re.findall(r"[a-z0-9]{2,}", _reference_unaccent_lower(term))
+        assert tokenize(term) == expected, term
+
+
+def test_non_string_values_normalize_to_empty():
+    assert unaccent_lower(None) == ""  # type: ignore[arg-type]
+    assert normalize_term(42) == ""
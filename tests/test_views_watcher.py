@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.cache import LocalCacheBackend
+from app.registry import watcher as watcher_mod
+from app.registry.preloader import publish_catalog
+from app.registry.service import RegistryService
+from app.registry.watcher import ViewsWatcher
+
+VIEWS_DIR = Path(__file__).resolve().parents[1] / "data" / "views"
+ENTITY = "view_fiis_info"
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> LocalCacheBackend:
+    backend = LocalCacheBackend()
+    monkeypatch.setattr(watcher_mod, "get_cache_backend", lambda **_: backend)
+    return backend
+
+
+@pytest.fixture
+def env(tmp_path: Path, cache: LocalCacheBackend):
+    views = tmp_path / "views"
+    shutil.copytree(VIEWS_DIR, views)
+    registry = RegistryService()
+    watcher = ViewsWatcher(str(views), registry)
+    watcher.prime()
+    return views, registry, watcher
+
+
+def _touch(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_poll_swaps_only_changed_entity(env):
+    views, registry, watcher = env
+    before = {e: registry.descriptor(e) for e in registry.entities()}
+    generation = registry.generation
+    target = views / f"{ENTITY}.yaml"
+    _touch(target, target.read_text(encoding="utf-8").replace(
+        "description: Snapshot gerado do DB para view_fiis_info",
+        "description: Cadastro dos FIIs (editado)",
+    ))
+
+    updated, removed = watcher.poll()
+
+    assert (updated, removed) == ([ENTITY], [])
+    assert registry.generation == generation + 1
+    assert registry.descriptor(ENTITY).description == "Cadastro dos FIIs (editado)"
+    for entity, desc in before.items():
+        if entity != ENTITY:
+            assert registry.descriptor(entity) is desc
+    assert watcher.poll() == ([], [])
+
+
+def test_invalid_yaml_keeps_previous_version(env):
+    views, registry, watcher = env
+    desc = registry.descriptor(ENTITY)
+    _touch(views / f"{ENTITY}.yaml", "entity: view_fiis_info\ncolumns: [\n")
+
+    assert watcher.poll() == ([], [])
+    assert registry.descriptor(ENTITY) is desc
+
+
+def test_deleted_file_removes_entity(env):
+    views, registry, watcher = env
+    (views / f"{ENTITY}.yaml").unlink()
+
+    assert watcher.poll() == ([], [ENTITY])
+    assert registry.descriptor(ENTITY) is None
+    assert ENTITY not in registry.entities()
+
+
+def test_pubsub_message_applies_changes_from_published_blob(env, cache):
+    _, registry, watcher = env
+    catalog = dict(registry.catalog())
+    doc = dict(catalog[ENTITY], description="Alterado em outra instância")
+    catalog[ENTITY] = doc
+    publish_catalog(cache, catalog)
+
+    message = '{"origin": "outra", "hash": "x", "updated": ["%s"], "removed": []}' % ENTITY
+    assert watcher.handle_message(message) is True
+    assert registry.descriptor(ENTITY).description == "Alterado em outra instância"
+
+    # ponteiro antigo (ex.: L1 do tiered): a mensagem aponta o blob novo pelo hash
+    pointer = cache.get("views:hash")
+    newer = dict(catalog, **{ENTITY: dict(doc, description="Versão 3")})
+    blob = publish_catalog(cache, newer)
+    cache.set("views:hash", pointer)
+    message = json.dumps({"origin": "outra", "hash": "z", "blob": blob, "updated": [ENTITY]})
+    assert watcher.handle_message(message) is True
+    assert registry.descriptor(ENTITY).description == "Versão 3"
+
+    own = '{"origin": "%s", "hash": "y", "updated": ["%s"]}' % (watcher_mod.INSTANCE_ID, ENTITY)
+    assert watcher.handle_message(own) is False
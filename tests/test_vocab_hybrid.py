@@ -33,3 +33,14 @@ def test_entity_meta_contains_column_level_intent_tokens():
 
     assert "historico" in meta.intent_tokens
     assert "historia" in meta.intent_tokens["historico"]
+
+
+def test_domain_and_token_intent_indexes_match_global_tokens():
+    ASK_VOCAB.invalidate()
+    tokens = ASK_VOCAB.global_intent_tokens()
+    index = ASK_VOCAB.token_intents()
+
+    assert ASK_VOCAB.domain_tokens() == frozenset().union(*tokens.values())
+    assert "dividends" in index["dividendo"]
+    for token, intents in index.items():
+        assert all(token in tokens[intent] for intent in intents)